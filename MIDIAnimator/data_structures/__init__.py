@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Tuple, List, Dict, Union, Optional
+from typing import Tuple, List, Dict, Union, Optional, Iterable, Iterator
+from bisect import bisect_right
 from mathutils import Vector, Euler
 from dataclasses import dataclass
 from numpy import add as npAdd
@@ -40,6 +41,102 @@ class KeyframeSeconds:
         return hash((self.seconds, self.value))
 
 
+class KeyframeAccumulator:
+    """keyframes of one F-Curve, kept sorted by frame while notes are added one by one.
+    notes come (almost always) in time order, so keyframes are appended to the end, and only out of order keyframes are inserted with `bisect`.
+    the overlap strategies in `algorithms.py` only look at and replace the end of the keyframes (`findOverlap()`, `replaceTail()`)
+    """
+    _keys: List[Keyframe]
+    _frames: List[float]
+
+    def __init__(self, keys: Iterable[Keyframe]=()):
+        """creates a keyframe accumulator
+
+        :param Iterable[Keyframe] keys: keyframes to add, defaults to ()
+        """
+        # frames are kept in a seperate list for `bisect` (no key= before Python 3.10)
+        self._keys = []
+        self._frames = []
+        self.extend(keys)
+
+    def append(self, key: Keyframe) -> None:
+        """adds a keyframe, after any keyframes on the same frame.
+        this is O(1) if it is not before the last keyframe
+
+        :param Keyframe key: the keyframe
+        """
+        if not self._frames or key.frame >= self._frames[-1]:
+            self._keys.append(key)
+            self._frames.append(key.frame)
+        else:
+            i = bisect_right(self._frames, key.frame)
+            self._keys.insert(i, key)
+            self._frames.insert(i, key.frame)
+
+    def extend(self, keys: Iterable[Keyframe]) -> None:
+        """adds keyframes, see `append()`
+
+        :param Iterable[Keyframe] keys: the keyframes
+        """
+        for key in keys:
+            self.append(key)
+    
+    def overlapStart(self, frame: float) -> int:
+        """finds where the keyframes overlap a note that starts at `frame` in O(log n): 
+        the keyframes after `frame`, and the keyframe before them. Used by `findOverlap()`
+
+        :param float frame: the first frame of the note
+        :return int: index of the first overlapping keyframe, or `len(self)` if nothing overlaps
+        """
+        i = bisect_right(self._frames, frame)
+        if i == len(self._frames):
+            return i
+
+        return max(i - 1, 0)
+
+    def indexAfter(self, frame: float) -> int:
+        """
+        :param float frame: the frame
+        :return int: index of the first keyframe after `frame`
+        """
+        return bisect_right(self._frames, frame)
+
+    def tail(self, start: int) -> List[Keyframe]:
+        """
+        :param int start: the index to start from
+        :return List[Keyframe]: the keyframes from `start` on
+        """
+        return self._keys[start:]
+
+    def replaceTail(self, start: int, keys: Iterable[Keyframe]=()) -> None:
+        """removes the keyframes from `start` on and adds `keys` in their place
+
+        :param int start: the index to start from
+        :param Iterable[Keyframe] keys: the keyframes to add, defaults to ()
+        """
+        del self._keys[start:]
+        del self._frames[start:]
+        self.extend(keys)
+    
+    def materialize(self) -> List[Keyframe]:
+        """
+        :return List[Keyframe]: all of the keyframes, sorted by frame
+        """
+        return list(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[Keyframe]:
+        return iter(self._keys)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Keyframe, List[Keyframe]]:
+        return self._keys[index]
+
+    def __repr__(self) -> str:
+        return f"KeyframeAccumulator({self._keys})"
+
+
 @dataclass
 class DummyFCurve:
     keyframe_points: Tuple[Keyframe]
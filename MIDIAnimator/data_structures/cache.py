@@ -0,0 +1,130 @@
+from __future__ import annotations
+from typing import Dict, Optional, Union
+from .. utils.logger import logger
+import numpy as np
+import hashlib
+import tempfile
+import os
+
+class MIDICache:
+    """An on-disk cache for parsed MIDI files (see `MIDIFile(cache=...)`).
+    
+    Entries are keyed by the hash of the MIDI file contents and the parser version, so editing the MIDI file (or updating MIDIAnimator) never returns stale data.
+    Each entry is a compact binary file of NumPy arrays. When the cache grows past `maxSize`, the least recently used entries are deleted.
+    """
+    directory: str
+    maxSize: int
+
+    def __init__(self, directory: str=None, maxSize: int=256 * 1024 * 1024):
+        """creates a cache in `directory`
+
+        :param str directory: the directory to store the cache entries in, defaults to None (a `MIDIAnimator` folder in the temporary directory)
+        :param int maxSize: maximum size of the cache in bytes, defaults to 256 MB
+        """
+        if directory is None:
+            directory = os.path.join(tempfile.gettempdir(), "MIDIAnimator")
+
+        self.directory = directory
+        self.maxSize = maxSize
+
+    @staticmethod
+    def key(data, version: Union[int, str]) -> str:
+        """gets the cache key for a MIDI file
+
+        :param data: the contents of the MIDI file (`bytes`, `memoryview` or `mmap`)
+        :param Union[int, str] version: the parser version
+        :return str: the cache key
+        """
+        return f"{hashlib.sha1(data).hexdigest()}-v{version}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """loads a cache entry, and marks it as recently used
+
+        :param str key: the cache key
+        :return Optional[Dict[str, np.ndarray]]: the arrays stored, or None if the entry does not exist
+        """
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return None
+        
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                arrays = {name: entry[name] for name in entry.files}
+        except Exception as e:
+            logger.warning(f"Removing unreadable MIDI cache entry '{path}': {e}")
+            self._remove(path)
+            return None
+        
+        # the modification time is used as the last used time for the LRU eviction
+        os.utime(path)
+
+        return arrays
+    
+    def store(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        """stores a cache entry, then evicts the least recently used entries if the cache is too big
+
+        :param str key: the cache key
+        :param Dict[str, np.ndarray] arrays: the arrays to store
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        path = self._path(key)
+        tempPath = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            with open(tempPath, "wb") as file:
+                np.savez(file, **arrays)
+            # replace at once, so other processes never read a partially written entry
+            os.replace(tempPath, path)
+        except OSError as e:
+            logger.warning(f"Could not write MIDI cache entry '{path}': {e}")
+            self._remove(tempPath)
+            return
+        
+        self._evict()
+
+    def clear(self) -> None:
+        """deletes every cache entry"""
+        for path, _, _ in self._entries():
+            self._remove(path)
+    
+    def _entries(self):
+        """
+        :return List[Tuple[str, float, int]]: `(path, last used time, size)` of every cache entry
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".npz"): continue
+
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        
+        return entries
+
+    def _evict(self) -> None:
+        """deletes the least recently used entries until the cache fits in `maxSize`"""
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        size = sum(entry[2] for entry in entries)
+
+        for path, _, entrySize in entries:
+            if size <= self.maxSize: break
+
+            self._remove(path)
+            size -= entrySize
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -1,10 +1,18 @@
 from __future__ import annotations
-from .. utils import removeDuplicates, gmProgramToName, _closestTempo
+from .. utils import gmProgramToName, decimateCurve
 from .. utils.logger import logger
-from typing import List, Tuple, Dict
-from dataclasses import dataclass
+from typing import List, Tuple, Dict, Iterable, Union
+from dataclasses import dataclass, field, fields
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from collections import deque
+import heapq
+import struct
 from .. libs import mido
+from . cache import MIDICache
 from sys import modules
+import numpy as np
 
 @dataclass
 class MIDINote:
@@ -15,6 +23,8 @@ class MIDINote:
     :param int velocity: MIDI velocity of the note, 0-127.
     :param float timeOn: Time the note was turned on, in seconds.
     :param float timeOff: Time the note was turned off, in seconds.
+    :param int tickOn: Absolute tick the note was turned on, defaults to -1 (unknown).
+    :param int tickOff: Absolute tick the note was turned off, defaults to -1 (unknown).
     :return: None
     """
     channel: int
@@ -22,6 +32,8 @@ class MIDINote:
     velocity: int
     timeOn: float
     timeOff: float
+    tickOn: int = field(default=-1, repr=False)
+    tickOff: int = field(default=-1, repr=False)
     
     def __lt__(self, other):
         return self.timeOn < other.timeOn
@@ -33,84 +45,899 @@ class MIDIEvent:
     :param int channel: MIDI channel of the note, 0-15.
     :param float velocity: MIDI value of the event, 0-127.
     :param float time: Time the event occurred, in seconds.
+    :param int tick: Absolute tick the event occurred, defaults to -1 (unknown).
     """
     channel: int
     value: float
     time: float
+    tick: int = field(default=-1, repr=False)
 
     def __lt__(self, other):
         return self.time < other.time
 
+@dataclass
+class MIDIStreamEvent:
+    """a single event read by `MIDIFile.stream()`
+
+    :param int track: index of the track chunk in the MIDI file the event was read from.
+    :param str type: type of the event, one of `note_on`, `note_off`, `control_change`, `pitchwheel` or `aftertouch`.
+    :param int channel: MIDI channel of the event, 0-15.
+    :param int number: note number for notes, controller number for `control_change` events, 0 otherwise.
+    :param int value: velocity for notes, value of the controller, pitch or pressure otherwise.
+    :param float time: Time the event occurred, in seconds.
+    :param int tick: Absolute tick the event occurred.
+    """
+    track: int
+    type: str
+    channel: int
+    number: int
+    value: int
+    time: float
+    tick: int
+
+    def __lt__(self, other):
+        return self.time < other.time
+
+def _slotted(cls: type, name: str) -> type:
+    """creates a copy of a dataclass that stores its fields in `__slots__` instead of a per-instance `__dict__`,
+    like `@dataclass(slots=True)` does in Python 3.10+ (Blender 3.0 ships Python 3.9).
+    the copy has the same fields, methods and ordering, but is not a subclass of `cls`
+
+    :param type cls: the dataclass
+    :param str name: name of the new class
+    :return type: the slotted class
+    """
+    fieldNames = tuple(f.name for f in fields(cls))
+    
+    # field defaults are class attributes, which would clash with the slots. the generated `__init__` keeps its own copy of them
+    namespace = {key: value for key, value in cls.__dict__.items() if key not in fieldNames + ("__dict__", "__weakref__")}
+    namespace.update(__slots__=fieldNames, __qualname__=name)
+
+    return type(name, cls.__bases__, namespace)
+
+# compact versions of `MIDINote` and `MIDIEvent` without a `__dict__`, built on access by the arrays of compact tracks (see `MIDITrack.toCompact()`)
+CompactMIDINote = _slotted(MIDINote, "CompactMIDINote")
+CompactMIDIEvent = _slotted(MIDIEvent, "CompactMIDIEvent")
+
+class MIDINoteArray:
+    """columnar storage for `MIDINote`s. Each note attribute is stored in its own typed NumPy array,
+    so a track costs a few bytes per note and whole tracks can be sorted, filtered and sliced with vectorized operations.
+
+    Indexing with an integer returns a `noteType` object built on access (changing it does not change the array),
+    indexing with a slice, a boolean mask or an index array returns a new `MIDINoteArray`.
+    """
+    # attribute name -> dtype, the attribute names match `MIDINote`
+    COLUMNS = {
+        "channel": np.uint8,
+        "noteNumber": np.uint8,
+        "velocity": np.uint8,
+        "timeOn": np.float64,
+        "timeOff": np.float64,
+        "tickOn": np.int64,
+        "tickOff": np.int64,
+    }
+
+    channel: np.ndarray
+    noteNumber: np.ndarray
+    velocity: np.ndarray
+    timeOn: np.ndarray
+    timeOff: np.ndarray
+    tickOn: np.ndarray
+    tickOff: np.ndarray
+
+    # the class of the notes built on access, `MIDINote` or `CompactMIDINote`
+    noteType: type
+
+    def __init__(self, noteType: type=MIDINote, **columns: Iterable):
+        """creates a `MIDINoteArray` from columns. Missing columns are filled with the `MIDINote` defaults (-1 for ticks).
+
+        :param type noteType: the class of the notes built on access, `MIDINote` or `CompactMIDINote`, defaults to MIDINote
+        :param Iterable columns: keyword arguments, one per column name (e.g. `noteNumber=[60, 62]`). All columns must have the same length.
+        """
+        self.noteType = noteType
+        length = len(next(iter(columns.values()))) if columns else 0
+
+        for name, dtype in MIDINoteArray.COLUMNS.items():
+            if name in columns:
+                column = np.asarray(columns.pop(name), dtype=dtype)
+            else:
+                column = np.full(length, -1, dtype=dtype)
+            
+            if len(column) != length:
+                raise ValueError(f"Column '{name}' has length {len(column)}, expected {length}!")
+            
+            setattr(self, name, column)
+        
+        if columns:
+            raise TypeError(f"Unknown MIDINoteArray columns: {', '.join(columns)}")
+
+    @classmethod
+    def fromNotes(cls, notes: Iterable[MIDINote], noteType: type=MIDINote) -> MIDINoteArray:
+        """creates a `MIDINoteArray` from `MIDINote` objects
+
+        :param Iterable[MIDINote] notes: the notes
+        :param type noteType: the class of the notes built on access, defaults to MIDINote
+        :return MIDINoteArray: the notes in columnar form
+        """
+        notes = list(notes)
+        return cls(noteType, **{name: [getattr(note, name) for note in notes] for name in MIDINoteArray.COLUMNS})
+
+    def toNotes(self, noteType: type=MIDINote) -> List[MIDINote]:
+        """converts the array back into a list of `MIDINote` objects
+
+        :param type noteType: the class of the notes, `MIDINote` or `CompactMIDINote`, defaults to MIDINote
+        :return List[MIDINote]: the notes
+        """
+        columns = [getattr(self, name).tolist() for name in MIDINoteArray.COLUMNS]
+        return [noteType(*values) for values in zip(*columns)]
+
+    def sort(self) -> None:
+        """sorts the notes by time on (stable), in place. Same ordering as sorting a list of `MIDINote`s"""
+        order = np.argsort(self.timeOn, kind="stable")
+        for name in MIDINoteArray.COLUMNS:
+            setattr(self, name, getattr(self, name)[order])
+
+    def withNoteNumbers(self, noteNumbers: Iterable[int]) -> MIDINoteArray:
+        """filters the notes by note number
+
+        :param Iterable[int] noteNumbers: the note numbers to keep
+        :return MIDINoteArray: the notes with one of those note numbers
+        """
+        return self[np.isin(self.noteNumber, list(noteNumbers))]
+
+    def inTimeRange(self, start: float, end: float, overlapping: bool=False) -> MIDINoteArray:
+        """selects the notes within a time window
+
+        :param float start: start of the window, in seconds
+        :param float end: end of the window, in seconds (exclusive)
+        :param bool overlapping: also select notes that started before the window and are still sounding in it, defaults to False
+        :return MIDINoteArray: the selected notes
+        """
+        if overlapping:
+            # hanging notes (time off of -1.0) are treated as never ending
+            mask = (self.timeOn < end) & ((self.timeOff > start) | (self.timeOff < 0))
+        else:
+            mask = (self.timeOn >= start) & (self.timeOn < end)
+        
+        return self[mask]
+
+    def uniqueNoteNumbers(self) -> np.ndarray:
+        """
+        :return np.ndarray: the sorted, unique note numbers used
+        """
+        return np.unique(self.noteNumber)
+
+    def applyTempoMap(self, tempoMap: TempoMap) -> None:
+        """(re)computes `timeOn` and `timeOff` from the absolute ticks. Notes without tick information are left untouched.
+
+        :param TempoMap tempoMap: the tempo map to convert the ticks with
+        """
+        hasTickOn = self.tickOn >= 0
+        hasTickOff = self.tickOff >= 0
+
+        self.timeOn = np.where(hasTickOn, tempoMap.ticksToSeconds(np.maximum(self.tickOn, 0)), self.timeOn)
+        self.timeOff = np.where(hasTickOff, tempoMap.ticksToSeconds(np.maximum(self.tickOff, 0)), self.timeOff)
+
+    def __len__(self) -> int:
+        return len(self.timeOn)
+
+    def __getitem__(self, index) -> Union[MIDINote, MIDINoteArray]:
+        if isinstance(index, (int, np.integer)):
+            return self.noteType(*(getattr(self, name)[index].item() for name in MIDINoteArray.COLUMNS))
+        
+        return MIDINoteArray(self.noteType, **{name: getattr(self, name)[index] for name in MIDINoteArray.COLUMNS})
+
+    def __iter__(self):
+        # converting the columns to lists first is much faster than indexing numpy arrays per note
+        columns = [getattr(self, name).tolist() for name in MIDINoteArray.COLUMNS]
+        noteType = self.noteType
+        for values in zip(*columns):
+            yield noteType(*values)
+
+    def __add__(self, other: Union[MIDINoteArray, List[MIDINote]]) -> MIDINoteArray:
+        if not isinstance(other, MIDINoteArray):
+            other = MIDINoteArray.fromNotes(other)
+        
+        return MIDINoteArray(self.noteType, **{name: np.concatenate((getattr(self, name), getattr(other, name))) for name in MIDINoteArray.COLUMNS})
+
+    def __radd__(self, other: List[MIDINote]) -> MIDINoteArray:
+        return MIDINoteArray.fromNotes(other, self.noteType) + self
+
+    def __repr__(self) -> str:
+        return f"MIDINoteArray({len(self)} notes)"
+
+class MIDIEventArray:
+    """columnar storage for `MIDIEvent`s, like `MIDINoteArray` for notes. Used by compact tracks (see `MIDITrack.toCompact()`).
+
+    Indexing with an integer returns an `eventType` object built on access (changing it does not change the array),
+    indexing with a slice, a boolean mask or an index array returns a new `MIDIEventArray`.
+    """
+    # attribute name -> dtype, the attribute names match `MIDIEvent`
+    # values are stored as integers, as they are read from the MIDI file
+    COLUMNS = {
+        "channel": np.uint8,
+        "value": np.int32,
+        "time": np.float64,
+        "tick": np.int64,
+    }
+
+    channel: np.ndarray
+    value: np.ndarray
+    time: np.ndarray
+    tick: np.ndarray
+
+    # the class of the events built on access, `MIDIEvent` or `CompactMIDIEvent`
+    eventType: type
+
+    def __init__(self, eventType: type=MIDIEvent, **columns: Iterable):
+        """creates a `MIDIEventArray` from columns. A missing `tick` column is filled with -1.
+
+        :param type eventType: the class of the events built on access, `MIDIEvent` or `CompactMIDIEvent`, defaults to MIDIEvent
+        :param Iterable columns: keyword arguments, one per column name (e.g. `value=[0, 127]`). All columns must have the same length.
+        """
+        self.eventType = eventType
+        length = len(next(iter(columns.values()))) if columns else 0
+
+        for name, dtype in MIDIEventArray.COLUMNS.items():
+            if name in columns:
+                column = np.asarray(columns.pop(name), dtype=dtype)
+            else:
+                column = np.full(length, -1, dtype=dtype)
+            
+            if len(column) != length:
+                raise ValueError(f"Column '{name}' has length {len(column)}, expected {length}!")
+            
+            setattr(self, name, column)
+        
+        if columns:
+            raise TypeError(f"Unknown MIDIEventArray columns: {', '.join(columns)}")
+
+    @classmethod
+    def fromEvents(cls, events: Iterable[MIDIEvent], eventType: type=MIDIEvent) -> MIDIEventArray:
+        """creates a `MIDIEventArray` from `MIDIEvent` objects
+
+        :param Iterable[MIDIEvent] events: the events
+        :param type eventType: the class of the events built on access, defaults to MIDIEvent
+        :return MIDIEventArray: the events in columnar form
+        """
+        return cls(eventType, **{name: _eventColumn(events, name, dtype) for name, dtype in MIDIEventArray.COLUMNS.items()})
+
+    def applyTempoMap(self, tempoMap: TempoMap) -> None:
+        """(re)computes `time` from the absolute ticks. Events without tick information are left untouched.
+
+        :param TempoMap tempoMap: the tempo map to convert the ticks with
+        """
+        self.time = np.where(self.tick >= 0, tempoMap.ticksToSeconds(np.maximum(self.tick, 0)), self.time)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __getitem__(self, index) -> Union[MIDIEvent, MIDIEventArray]:
+        if isinstance(index, (int, np.integer)):
+            return self.eventType(*(getattr(self, name)[index].item() for name in MIDIEventArray.COLUMNS))
+        
+        return MIDIEventArray(self.eventType, **{name: getattr(self, name)[index] for name in MIDIEventArray.COLUMNS})
+
+    def __iter__(self):
+        columns = [getattr(self, name).tolist() for name in MIDIEventArray.COLUMNS]
+        eventType = self.eventType
+        for values in zip(*columns):
+            yield eventType(*values)
+
+    def __add__(self, other: Union[MIDIEventArray, List[MIDIEvent]]) -> MIDIEventArray:
+        return MIDIEventArray(self.eventType, **{name: np.concatenate((getattr(self, name), _eventColumn(other, name, dtype))) 
+                                                 for name, dtype in MIDIEventArray.COLUMNS.items()})
+
+    def __radd__(self, other: List[MIDIEvent]) -> MIDIEventArray:
+        return MIDIEventArray.fromEvents(other, self.eventType) + self
+
+    def __repr__(self) -> str:
+        return f"MIDIEventArray({len(self)} events)"
+
+def _eventColumn(events: Union[List[MIDIEvent], MIDIEventArray], name: str, dtype: type) -> np.ndarray:
+    """gets one attribute of every event as an array, without building the events of a `MIDIEventArray`
+
+    :param Union[List[MIDIEvent], MIDIEventArray] events: the events
+    :param str name: the attribute, e.g. `time`
+    :param type dtype: dtype of the array
+    :return np.ndarray: the values
+    """
+    if isinstance(events, MIDIEventArray):
+        return getattr(events, name).astype(dtype, copy=False)
+    
+    return np.array([getattr(event, name) for event in events], dtype=dtype)
+
+class TempoMap:
+    # ticks per beat (quarter note) of the MIDI file
+    ticksPerBeat: int
+
+    # breakpoints, one per tempo change (the first breakpoint is always tick 0)
+    # _ticks[i] is the absolute tick of the tempo change, _seconds[i] is the time of that tick in seconds
+    # and _tempos[i] is the tempo (microseconds per beat) from that tick onwards
+    _ticks: List[int]
+    _seconds: List[float]
+    _tempos: List[int]
+
+    def __init__(self, ticksPerBeat: int, tempoChanges: Iterable[Tuple[int, int]]=()):
+        """builds a tempo map from a list of tempo changes.
+        the seconds for each tempo change are accumulated once here, so converting a tick to seconds later on is a binary search instead of a walk over every tempo change
+
+        :param int ticksPerBeat: ticks per beat (quarter note) of the MIDI file
+        :param Iterable[Tuple[int, int]] tempoChanges: `(absoluteTick, tempo)` pairs, sorted by tick. tempo is in microseconds per beat, defaults to ()
+        """
+        self.ticksPerBeat = ticksPerBeat
+
+        self._ticks = [0]
+        self._seconds = [0.0]
+        self._tempos = [500000]  # default tempo, 120 BPM
+
+        for tick, tempo in tempoChanges:
+            if tick == self._ticks[-1]:
+                # a tempo change on the same tick replaces the previous one
+                self._tempos[-1] = tempo
+                continue
+
+            self._seconds.append(self.tickToSecond(tick))
+            self._ticks.append(tick)
+            self._tempos.append(tempo)
+
+        # arrays for the vectorized path, seconds per tick for each segment
+        self._ticksArray = np.array(self._ticks, dtype=np.int64)
+        self._secondsArray = np.array(self._seconds, dtype=np.float64)
+        self._scaleArray = np.array(self._tempos, dtype=np.float64) / (1e6 * ticksPerBeat)
+
+    @classmethod
+    def fromTracks(cls, tracks: List[mido.MidiTrack], ticksPerBeat: int) -> TempoMap:
+        """builds a tempo map from the `set_tempo` messages of all tracks
+
+        :param List[mido.MidiTrack] tracks: the tracks of a `mido.MidiFile`
+        :param int ticksPerBeat: ticks per beat (quarter note) of the MIDI file
+        :return TempoMap: the tempo map
+        """
+        tempoChanges = []
+        for track in tracks:
+            tick = 0
+            for msg in track:
+                tick += msg.time
+                if msg.type == "set_tempo":
+                    tempoChanges.append((tick, msg.tempo))
+
+        # stable sort, so tempo changes on the same tick keep their track order
+        tempoChanges.sort(key=lambda change: change[0])
+
+        return cls(ticksPerBeat, tempoChanges)
+
+    @classmethod
+    def constant(cls, ticksPerBeat: int, tempo: int=500000) -> TempoMap:
+        """builds a tempo map with a single tempo, useful for overriding the tempo of a file
+
+        :param int ticksPerBeat: ticks per beat (quarter note) of the MIDI file
+        :param int tempo: the tempo in microseconds per beat, defaults to 500000 (120 BPM)
+        :return TempoMap: the tempo map
+        """
+        return cls(ticksPerBeat, [(0, tempo)])
+
+    def stretched(self, factor: float) -> TempoMap:
+        """returns a copy of this tempo map with every tempo scaled by `factor`.
+        a factor of 2 makes the file play twice as long, 0.5 makes it play twice as fast
+
+        :param float factor: the time stretch factor
+        :return TempoMap: the stretched tempo map
+        """
+        if factor <= 0:
+            raise ValueError("Time stretch factor must be bigger than 0!")
+
+        return TempoMap(self.ticksPerBeat, [(tick, tempo * factor) for tick, tempo in self.tempoChanges])
+
+    @property
+    def tempoChanges(self) -> List[Tuple[int, int]]:
+        """
+        :return List[Tuple[int, int]]: the `(absoluteTick, tempo)` pairs of this tempo map, including the starting tempo at tick 0
+        """
+        return list(zip(self._ticks, self._tempos))
+
+    @classmethod
+    def fromRawTracks(cls, tracks: Iterable[Iterable[Tuple[int, int, int, int]]], ticksPerBeat: int) -> TempoMap:
+        """builds a tempo map from the `set_tempo` meta events of all tracks, read with `mido.iter_raw_events()`
+
+        :param Iterable[Iterable[Tuple[int, int, int, int]]] tracks: the raw `(absoluteTick, status, data1, data2)` events of each track
+        :param int ticksPerBeat: ticks per beat (quarter note) of the MIDI file
+        :return TempoMap: the tempo map
+        """
+        tempoChanges = []
+        for track in tracks:
+            for tick, status, data1, data2 in track:
+                if status == 0xff and data1 == 0x51:
+                    tempoChanges.append((tick, (data2[0] << 16) | (data2[1] << 8) | data2[2]))
+
+        # stable sort, so tempo changes on the same tick keep their track order
+        tempoChanges.sort(key=lambda change: change[0])
+
+        return cls(ticksPerBeat, tempoChanges)
+
+    def tempoAt(self, tick: int) -> int:
+        """gets the tempo in effect at a tick
+
+        :param int tick: absolute tick
+        :return int: the tempo, in microseconds per beat
+        """
+        return self._tempos[bisect_right(self._ticks, tick) - 1]
+
+    def tickToSecond(self, tick: int) -> float:
+        """converts an absolute tick to seconds
+
+        :param int tick: absolute tick
+        :return float: the time of the tick, in seconds
+        """
+        i = bisect_right(self._ticks, tick) - 1
+        return self._seconds[i] + (tick - self._ticks[i]) * self._tempos[i] / (1e6 * self.ticksPerBeat)
+
+    def secondToTick(self, second: float) -> int:
+        """converts seconds to the nearest absolute tick
+
+        :param float second: time in seconds
+        :return int: the absolute tick
+        """
+        i = max(bisect_right(self._seconds, second) - 1, 0)
+        return round(self._ticks[i] + (second - self._seconds[i]) * 1e6 * self.ticksPerBeat / self._tempos[i])
+
+    def ticksToSeconds(self, ticks: Iterable[int]) -> np.ndarray:
+        """converts many absolute ticks to seconds at once (for example, a whole track)
+
+        :param Iterable[int] ticks: absolute ticks
+        :return np.ndarray: the time of each tick, in seconds
+        """
+        ticks = np.asarray(ticks, dtype=np.int64)
+        i = np.searchsorted(self._ticksArray, ticks, side="right") - 1
+        return self._secondsArray[i] + (ticks - self._ticksArray[i]) * self._scaleArray[i]
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    def __repr__(self) -> str:
+        return f"TempoMap(ticksPerBeat={self.ticksPerBeat}, tempoChanges={self.tempoChanges})"
+
+def _resampleToFrames(times: np.ndarray, values: np.ndarray, fps: float, policy: str) -> Tuple[np.ndarray, np.ndarray]:
+    """buckets values onto the frame grid, every value goes to its nearest frame
+
+    :param np.ndarray times: times of the values in seconds, sorted
+    :param np.ndarray values: the values
+    :param float fps: frames per second
+    :param str policy: how the values on the same frame are combined, see `MIDITrack.FRAME_POLICIES`
+    :raises ValueError: if the policy is unknown
+    :return Tuple[np.ndarray, np.ndarray]: the frames that have values (sorted, unique) and the combined value for each frame
+    """
+    if policy not in MIDITrack.FRAME_POLICIES:
+        raise ValueError(f"Unknown frame policy '{policy}'! Use one of {', '.join(MIDITrack.FRAME_POLICIES)}.")
+
+    frames = np.floor(np.asarray(times, dtype=np.float64) * fps + 0.5).astype(np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    if len(frames) == 0:
+        return frames, values
+
+    # index of the first value of each frame
+    starts = np.flatnonzero(np.concatenate(([True], frames[1:] != frames[:-1])))
+
+    if policy == "first":
+        values = values[starts]
+    elif policy == "last":
+        values = values[np.append(starts[1:], len(frames)) - 1]
+    elif policy == "max":
+        values = np.maximum.reduceat(values, starts)
+    elif policy == "min":
+        values = np.minimum.reduceat(values, starts)
+    else:
+        values = np.add.reduceat(values, starts) / np.diff(np.append(starts, len(frames)))
+
+    return frames[starts], values
+
+class MIDINoteIndex:
+    """a time index over the notes of a track, for range and active note queries in logarithmic time.
+    built once from a snapshot of the notes (see `MIDITrack.noteIndex`), changing the notes afterwards does not update the index.
+
+    notes are sorted by time on, and an interval tree over `(timeOn, timeOff)` answers which notes are sounding at a time.
+    a note is sounding from its time on (inclusive) to its time off (exclusive), hanging notes (time off of -1.0) never end
+    """
+    # nodes with this many notes or less are searched directly instead of being split further
+    LEAF_SIZE = 32
+
+    def __init__(self, notes: Union[List[MIDINote], MIDINoteArray]):
+        """builds the index
+
+        :param Union[List[MIDINote], MIDINoteArray] notes: the notes of a track
+        """
+        columnar = isinstance(notes, MIDINoteArray)
+        timeOn = notes.timeOn if columnar else np.array([note.timeOn for note in notes], dtype=np.float64)
+        timeOff = notes.timeOff if columnar else np.array([note.timeOff for note in notes], dtype=np.float64)
+        noteNumber = notes.noteNumber if columnar else np.array([note.noteNumber for note in notes], dtype=np.uint8)
+
+        # everything below works on ranks, the position of a note when sorted by time on
+        order = np.argsort(timeOn, kind="stable")
+        self._notes = notes[order] if columnar else [notes[i] for i in order.tolist()]
+        self._timeOn = timeOn[order]
+        self._timeOff = np.where(timeOff[order] < 0, np.inf, timeOff[order])
+
+        # note number -> (times on, ranks) of the notes with that note number
+        noteNumber = noteNumber[order]
+        byNoteNumber = np.argsort(noteNumber, kind="stable")
+        numbers, starts = np.unique(noteNumber[byNoteNumber], return_index=True)
+        self._noteNumbers = {number: (self._timeOn[ranks], ranks) for number, ranks in zip(numbers.tolist(), np.split(byNoteNumber, starts[1:]))}
+
+        # interval tree, stored as flat lists. for node i:
+        # _centers[i] is the center time (None for leaves), _left[i]/_right[i] the child nodes (-1 for none),
+        # _byStart[i] the ranks of the notes at the node sorted by time on (all ranks, in order, for leaves)
+        # and _byEnd[i] the ranks of the notes at the node sorted by time off
+        self._centers, self._left, self._right, self._byStart, self._byEnd = [], [], [], [], []
+        self._root = self._buildNode(np.arange(len(self._timeOn)))
+
+    def _buildNode(self, ranks: np.ndarray) -> int:
+        """builds an interval tree node (and its children) for the notes with `ranks`
+
+        :param np.ndarray ranks: ranks of the notes, sorted
+        :return int: the node, -1 if there are no notes
+        """
+        if len(ranks) == 0:
+            return -1
+
+        node = len(self._centers)
+        if len(ranks) <= MIDINoteIndex.LEAF_SIZE:
+            self._centers.append(None)
+            self._left.append(-1)
+            self._right.append(-1)
+            self._byStart.append(ranks)
+            self._byEnd.append(ranks)
+            return node
+
+        # the median time on as center, so each child gets at most half of the notes
+        center = self._timeOn[ranks[len(ranks) // 2]]
+        timeOn, timeOff = self._timeOn[ranks], self._timeOff[ranks]
+
+        here = ranks[(timeOn <= center) & (timeOff >= center)]
+        self._centers.append(center)
+        self._byStart.append(here)
+        self._byEnd.append(here[np.argsort(self._timeOff[here], kind="stable")])
+        self._left.append(-1)
+        self._right.append(-1)
+
+        self._left[node] = self._buildNode(ranks[timeOff < center])
+        self._right[node] = self._buildNode(ranks[timeOn > center])
+        return node
+
+    def _activeRanks(self, time: float) -> np.ndarray:
+        """gets the ranks of the notes sounding at `time`
+
+        :param float time: the time, in seconds
+        :return np.ndarray: the ranks, sorted
+        """
+        found = []
+        node = self._root
+
+        while node != -1:
+            center, ranks = self._centers[node], self._byStart[node]
+
+            if center is None:
+                # leaf
+                found.append(ranks[(self._timeOn[ranks] <= time) & (self._timeOff[ranks] > time)])
+                break
+            elif time < center:
+                # every note at this node ends after the center, so the ones that started are sounding
+                found.append(ranks[:np.searchsorted(self._timeOn[ranks], time, side="right")])
+                node = self._left[node]
+            else:
+                # every note at this node started before the center, so the ones that have not ended are sounding
+                ranks = self._byEnd[node]
+                found.append(ranks[np.searchsorted(self._timeOff[ranks], time, side="right"):])
+                node = self._right[node] if time > center else -1
+
+        return np.sort(np.concatenate(found)) if found else np.array([], dtype=np.int64)
+
+    def _select(self, ranks: np.ndarray) -> Union[List[MIDINote], MIDINoteArray]:
+        """gets the notes with `ranks`, in the same container type as the indexed notes"""
+        if isinstance(self._notes, MIDINoteArray):
+            return self._notes[ranks]
+
+        return [self._notes[rank] for rank in ranks.tolist()]
+
+    def notesInRange(self, start: float, end: float, overlapping: bool=False) -> Union[List[MIDINote], MIDINoteArray]:
+        """selects the notes within a time window, same selection as `MIDINoteArray.inTimeRange()`
+
+        :param float start: start of the window, in seconds
+        :param float end: end of the window, in seconds (exclusive)
+        :param bool overlapping: also select notes that started before the window and are still sounding in it, defaults to False
+        :return Union[List[MIDINote], MIDINoteArray]: the notes, sorted by time on
+        """
+        first, last = np.searchsorted(self._timeOn, (start, end), side="left").tolist()
+        ranks = np.arange(first, max(first, last))
+
+        if overlapping:
+            ranks = ranks[self._timeOff[ranks] > start]
+            # notes that started before the window and are still sounding at the start of it
+            before = self._activeRanks(start)
+            ranks = np.concatenate((before[self._timeOn[before] < min(start, end)], ranks))
+
+        return self._select(ranks)
+
+    def activeNotesAt(self, time: float) -> Union[List[MIDINote], MIDINoteArray]:
+        """gets the notes that are sounding at `time`
+
+        :param float time: the time, in seconds
+        :return Union[List[MIDINote], MIDINoteArray]: the notes, sorted by time on
+        """
+        return self._select(self._activeRanks(time))
+
+    def nextNoteAfter(self, time: float, noteNumber: int=None) -> MIDINote:
+        """gets the first note that starts after `time`
+
+        :param float time: the time, in seconds
+        :param int noteNumber: only look at notes with this note number, defaults to None (any note)
+        :return MIDINote: the note, or None if there is no note after `time`
+        """
+        if noteNumber is None:
+            timesOn, ranks = self._timeOn, None
+        elif noteNumber in self._noteNumbers:
+            timesOn, ranks = self._noteNumbers[noteNumber]
+        else:
+            return None
+
+        i = np.searchsorted(timesOn, time, side="right")
+        if i == len(timesOn):
+            return None
+
+        return self._notes[int(i if ranks is None else ranks[i])]
+
+    def __len__(self) -> int:
+        return len(self._timeOn)
+
+@dataclass
+class MIDITrackProfile:
+    """statistics of a `MIDITrack`, computed once (see `MIDITrack.profile`) so instruments and the UI don't have to scan the notes again.
+    note statistics are -1 and times are 0.0 if the track has no notes
+
+    :param int noteCount: number of notes.
+    :param np.ndarray noteHistogram: number of notes for each note number, 128 values.
+    :param List[int] usedNotes: sorted note numbers used by the notes.
+    :param int minNote: lowest note number.
+    :param int maxNote: highest note number.
+    :param int minVelocity: lowest note velocity.
+    :param int maxVelocity: highest note velocity.
+    :param List[int] channels: sorted MIDI channels used by the notes and events.
+    :param float startTime: time of the first note or event, in seconds.
+    :param float endTime: time of the last note (on or off) or event, in seconds.
+    :param np.ndarray polyphonyTimes: times the number of sounding notes changes, in seconds.
+    :param np.ndarray polyphony: number of sounding notes from each of `polyphonyTimes` onwards.
+    :param int maxPolyphony: most notes sounding at once.
+    """
+    noteCount: int
+    noteHistogram: np.ndarray = field(repr=False)
+    usedNotes: List[int]
+    minNote: int
+    maxNote: int
+    minVelocity: int
+    maxVelocity: int
+    channels: List[int]
+    startTime: float
+    endTime: float
+    polyphonyTimes: np.ndarray = field(repr=False)
+    polyphony: np.ndarray = field(repr=False)
+    maxPolyphony: int
+
+    @classmethod
+    def fromTrack(cls, track: MIDITrack) -> MIDITrackProfile:
+        """computes the profile of a track in one vectorized pass over its notes and events
+
+        :param MIDITrack track: the track
+        :return MIDITrackProfile: the profile
+        """
+        notes = track.notes if isinstance(track.notes, MIDINoteArray) else MIDINoteArray.fromNotes(track.notes)
+        eventLists = list(track.controlChange.values()) + [track.pitchwheel, track.aftertouch]
+        eventChannels = np.concatenate([_eventColumn(events, "channel", np.uint8) for events in eventLists])
+        eventTimes = np.concatenate([_eventColumn(events, "time", np.float64) for events in eventLists])
+
+        noteHistogram = np.bincount(notes.noteNumber, minlength=128)
+        channels = np.union1d(notes.channel, eventChannels)
+        times = np.concatenate((notes.timeOn, notes.timeOff[notes.timeOff >= 0], eventTimes))
+
+        # +1 for every note on, -1 for every note off. note offs come first on the same time, a note is not sounding on its time off
+        # hanging notes (time off of -1.0) never end
+        hasOff = notes.timeOff >= 0
+        changeTimes = np.concatenate((notes.timeOff[hasOff], notes.timeOn))
+        changes = np.concatenate((np.full(np.count_nonzero(hasOff), -1, dtype=np.int64), np.ones(len(notes), dtype=np.int64)))
+        order = np.lexsort((changes, changeTimes))
+        changeTimes, sounding = changeTimes[order], np.cumsum(changes[order])
+
+        # keep the count after the last change on each time
+        last = np.append(changeTimes[1:] != changeTimes[:-1], True) if len(changeTimes) else np.zeros(0, dtype=bool)
+        polyphonyTimes, polyphony = changeTimes[last], sounding[last]
+
+        hasNotes = len(notes) > 0
+
+        return cls(
+            noteCount=len(notes),
+            noteHistogram=noteHistogram,
+            usedNotes=np.flatnonzero(noteHistogram).tolist(),
+            minNote=int(notes.noteNumber.min()) if hasNotes else -1,
+            maxNote=int(notes.noteNumber.max()) if hasNotes else -1,
+            minVelocity=int(notes.velocity.min()) if hasNotes else -1,
+            maxVelocity=int(notes.velocity.max()) if hasNotes else -1,
+            channels=channels.tolist(),
+            startTime=float(times.min()) if len(times) else 0.0,
+            endTime=float(times.max()) if len(times) else 0.0,
+            polyphonyTimes=polyphonyTimes,
+            polyphony=polyphony,
+            maxPolyphony=int(polyphony.max()) if len(polyphony) else 0,
+        )
+
+    @property
+    def duration(self) -> float:
+        """
+        :return float: time from the first to the last note or event, in seconds
+        """
+        return self.endTime - self.startTime
+
+    def hasNote(self, noteNumber: int) -> bool:
+        """checks if any note of the track has `noteNumber`
+
+        :param int noteNumber: the note number, 0-127
+        :return bool: True if the note number is used
+        """
+        return 0 <= noteNumber < 128 and self.noteHistogram[noteNumber] > 0
+
+    def polyphonyAt(self, time: float) -> int:
+        """gets the number of notes sounding at `time`
+
+        :param float time: the time, in seconds
+        :return int: the number of sounding notes
+        """
+        i = np.searchsorted(self.polyphonyTimes, time, side="right")
+        return int(self.polyphony[i - 1]) if i > 0 else 0
+
+class MIDINotePairer:
+    """pairs note off events with the note on events they end.
+    open notes are kept in a `deque` per `(channel, noteNumber)`, so pairing is O(1) per event, even for many stacked notes (trills, tremolos)
+    """
+    # fifo: a note off ends the oldest open note with the same channel & note number, lifo: the newest one
+    POLICIES = ("fifo", "lifo")
+
+    # key= (channel, noteNumber), value=deque of open MIDINotes, oldest first
+    _openNotes: Dict[Tuple[int, int], deque]
+
+    def __init__(self, policy: str="fifo"):
+        """
+        :param str policy: `fifo` or `lifo`, see `MIDINotePairer.POLICIES`, defaults to "fifo"
+        :raises ValueError: if the policy is unknown
+        """
+        if policy not in MIDINotePairer.POLICIES:
+            raise ValueError(f"Unknown note pairing policy '{policy}'! Use one of {', '.join(MIDINotePairer.POLICIES)}.")
+
+        self.policy = policy
+        self._openNotes = dict()
+        self._take = deque.popleft if policy == "fifo" else deque.pop
+
+    def noteOn(self, note: MIDINote) -> None:
+        """opens a note
+
+        :param MIDINote note: the note
+        """
+        key = (note.channel, note.noteNumber)
+
+        if key in self._openNotes:
+            self._openNotes[key].append(note)
+        else:
+            self._openNotes[key] = deque((note,))
+
+    def noteOff(self, channel: int, noteNumber: int, timeOff: float, tickOff: int=-1) -> MIDINote:
+        """ends the matching open note
+
+        :param int channel: MIDI channel
+        :param int noteNumber: the note number
+        :param float timeOff: the note time off, in seconds
+        :param int tickOff: the note time off, in absolute ticks, defaults to -1
+        :return MIDINote: the note that was ended, or None if there is no open note (orphan note off)
+        """
+        notes = self._openNotes.get((channel, noteNumber))
+        if not notes:
+            return None
+
+        note = self._take(notes)
+        note.timeOff = timeOff
+        note.tickOff = tickOff
+        return note
+
+    def popOpenNotes(self) -> List[MIDINote]:
+        """removes all notes that are still open (hanging notes)
+
+        :return List[MIDINote]: the open notes, sorted by time on
+        """
+        notes = sorted(note for notes in self._openNotes.values() for note in notes)
+        self._openNotes.clear()
+        return notes
+
 class MIDITrack:
     # name of the MIDITrack
     name: str
     
-    # the list of MIDINotes in the MIDITrack
-    notes: List[MIDINote]
+    # the list of MIDINotes in the MIDITrack (a `MIDINoteArray` once `toColumnar()` or `toCompact()` is called)
+    notes: Union[List[MIDINote], MIDINoteArray]
+
+    # different paramters in the MIDITrack (`MIDIEventArray`s once `toCompact()` is called)
+    controlChange: Dict[int, Union[List[MIDIEvent], MIDIEventArray]]
+    pitchwheel: Union[List[MIDIEvent], MIDIEventArray]
+    aftertouch: Union[List[MIDIEvent], MIDIEventArray]
+
+    # note off events that had no open note to end (value is the note number)
+    # only kept for tracks decoded in this process, not for tracks from worker processes or the cache
+    orphanNoteOffs: List[MIDIEvent]
+
+    # pairs note offs with note ons while the track is built
+    _notePairer: MIDINotePairer
+
+    # time index of the notes, built on first use (see `noteIndex`)
+    _noteIndex: MIDINoteIndex
 
-    # different paramters in the MIDITrack
-    controlChange: Dict[int, List[MIDIEvent]]
-    pitchwheel: List[MIDIEvent]
-    aftertouch: List[MIDIEvent]
+    # statistics of the track, computed when the file is parsed or on first use (see `profile`)
+    _profile: MIDITrackProfile
 
-    # key= (channel, noteNumber), value=List[MIDINote]
-    _noteTable: Dict[Tuple[int, int], List[MIDINote]]
+    # how values on the same frame are combined by `resampleEvents()` and `resampleNotes()`
+    FRAME_POLICIES = ("last", "first", "max", "min", "mean")
 
-    def __init__(self, name: str):
+    # attribute name -> dtype of the event arrays made by `toArrays()`, the attribute names match `MIDIEvent`
+    EVENT_COLUMNS = MIDIEventArray.COLUMNS
+
+    def __init__(self, name: str, notePairing: str="fifo", compact: bool=False):
         """initialize a MIDITrack
 
         :param str name: name of track
+        :param str notePairing: which open note a note off ends, `fifo` (the oldest one) or `lifo` (the newest one), defaults to "fifo"
+        :param bool compact: use `CompactMIDINote` and `CompactMIDIEvent` objects (no `__dict__`) while the track is built, see `toCompact()`, defaults to False
         """
         self.name = name
+        self._noteType = CompactMIDINote if compact else MIDINote
+        self._eventType = CompactMIDIEvent if compact else MIDIEvent
 
         self.notes = []
         self.controlChange = dict()
         self.pitchwheel = []
         self.aftertouch = []
+        self.orphanNoteOffs = []
 
-        self._noteTable = dict()
+        self._notePairer = MIDINotePairer(notePairing)
+        self._noteIndex = None
+        self._profile = None
 
-    def addNoteOn(self, channel: int, noteNumber: int, velocity: int, timeOn: float) -> None:
+    def addNoteOn(self, channel: int, noteNumber: int, velocity: int, timeOn: float, tickOn: int=-1) -> None:
         """adds a Note Event
 
         :param int channel: the MIDI Channel the note is on
         :param int noteNumber: the note number, range from 0-127
         :param int velocity: the note velocity, range 0-127
         :param float timeOn: the note time on, in seconds
+        :param int tickOn: the note time on, in absolute ticks, defaults to -1
         """
-        key = (channel, noteNumber)
-        note = MIDINote(channel, noteNumber, velocity, timeOn, timeOff=-1.0)
+        note = self._noteType(channel, noteNumber, velocity, timeOn, timeOff=-1.0, tickOn=tickOn)
 
-        if key in self._noteTable:
-            self._noteTable[key].append(note)
-        else:
-            self._noteTable[key] = [note]
-        
+        self._notePairer.noteOn(note)
         self.notes.append(note)
+        self._noteIndex = None
+        self._profile = None
 
-    def addNoteOff(self, channel: int, noteNumber: int, velocity: int, timeOff: float) -> None:
-        """adds a Note Off event
+    def addNoteOff(self, channel: int, noteNumber: int, velocity: int, timeOff: float, tickOff: int=-1) -> None:
+        """adds a Note Off event, which ends an open note with the same channel & note number (see `MIDINotePairer`).
+        note offs without an open note are kept in `orphanNoteOffs`
 
         :param int channel: MIDI channel
-        :param int noteNumber: the note number, TODO range
-        :param int velocity: the note velocity, TODO range
+        :param int noteNumber: the note number, range from 0-127
+        :param int velocity: the note velocity, range 0-127
         :param float timeOff: the note time off, in seconds
+        :param int tickOff: the note time off, in absolute ticks, defaults to -1
         """
+        if self._notePairer.noteOff(channel, noteNumber, timeOff, tickOff) is None:
+            self.orphanNoteOffs.append(self._eventType(channel, noteNumber, timeOff, tickOff))
+            return
 
-        try:
-            # find matching note on message
-            key = (channel, noteNumber)
-            note = self._noteTable[key]
+        self._noteIndex = None
+        self._profile = None
 
-            # assume the first note on message for this note is the one that matches with this note off
-            note[0].timeOff = timeOff
-
-            # remove this note for this note number b/c we have the note off for this note
-            del note[0]
-        except IndexError:
-            raise RuntimeError("NoteOff message has no NoteOn message! Your MIDI File may be corrupt. Please open an issue on GitHub.")
-
-    def addControlChange(self, control_number: int, channel: int, value: int, time: float):
+    def addControlChange(self, control_number: int, channel: int, value: int, time: float, tick: int=-1):
         """add a control change value
         automatically checks if number has been added
 
@@ -118,9 +945,11 @@ class MIDITrack:
         :param int channel: MIDI channel number
         :param int value: value of the control change
         :param float time: time value (in seconds)
+        :param int tick: time value (in absolute ticks), defaults to -1
         """
 
-        event = MIDIEvent(channel, value, time)
+        event = self._eventType(channel, value, time, tick)
+        self._profile = None
 
         if control_number in self.controlChange:
             # in dict
@@ -129,23 +958,303 @@ class MIDITrack:
             # not in dict
             self.controlChange[control_number] = [event]
 
-    def addPitchwheel(self, channel: int, value: float, time: float) -> None:
+    def addPitchwheel(self, channel: int, value: float, time: float, tick: int=-1) -> None:
         """add a pitchwheel event
 
         :param int channel: the MIDI channel number
         :param float value: value of the pitch wheel TODO range
         :param float time: time value (in seconds)
+        :param int tick: time value (in absolute ticks), defaults to -1
         """
-        self.pitchwheel.append(MIDIEvent(channel, value, time))
+        self.pitchwheel.append(self._eventType(channel, value, time, tick))
+        self._profile = None
 
-    def addAftertouch(self, channel: int, value: float, time: float) -> None:
+    def addAftertouch(self, channel: int, value: float, time: float, tick: int=-1) -> None:
         """add a aftertouch event
 
         :param int channel: the MIDI channel number
         :param float value: value of the aftertouch, TODO range
         :param float time: time value (in seconds)
+        :param int tick: time value (in absolute ticks), defaults to -1
+        """
+        self.aftertouch.append(self._eventType(channel, value, time, tick))
+        self._profile = None
+
+    def applyTempoMap(self, tempoMap: TempoMap) -> None:
+        """(re)computes the time in seconds of every note and event from their absolute ticks, in one bulk conversion.
+        this can be used to re-time a track (tempo override, time stretch) without parsing the MIDI file again.
+        notes and events without tick information are left untouched.
+
+        :param TempoMap tempoMap: the tempo map to convert the ticks with
+        """
+        def convertEvents(events: Union[List[MIDIEvent], MIDIEventArray]):
+            if isinstance(events, MIDIEventArray):
+                events.applyTempoMap(tempoMap)
+                return
+
+            events = [event for event in events if event.tick >= 0]
+            if not events: return
+
+            for event, time in zip(events, tempoMap.ticksToSeconds([event.tick for event in events]).tolist()):
+                event.time = time
+
+        if isinstance(self.notes, MIDINoteArray):
+            self.notes.applyTempoMap(tempoMap)
+            notes = None
+        else:
+            notes = [note for note in self.notes if note.tickOn >= 0]
+
+        if notes:
+            timesOn = tempoMap.ticksToSeconds([note.tickOn for note in notes]).tolist()
+            # hanging notes (no note off) keep a time off of -1.0
+            ticksOff = np.array([note.tickOff for note in notes], dtype=np.int64)
+            timesOff = np.where(ticksOff >= 0, tempoMap.ticksToSeconds(np.maximum(ticksOff, 0)), -1.0).tolist()
+
+            for note, timeOn, timeOff in zip(notes, timesOn, timesOff):
+                note.timeOn = timeOn
+                note.timeOff = timeOff
+
+        for events in self.controlChange.values():
+            convertEvents(events)
+        
+        convertEvents(self.pitchwheel)
+        convertEvents(self.aftertouch)
+
+        self._noteIndex = None
+        self._profile = None
+
+    def toArrays(self) -> Dict[str, np.ndarray]:
+        """converts the notes and events of the track into compact NumPy arrays (used for caching parsed files).
+        notes are stored as `notes.<column>` (see `MIDINoteArray.COLUMNS`), events as `cc.<column>`, `pitchwheel.<column>` and `aftertouch.<column>` (see `MIDITrack.EVENT_COLUMNS`).
+        the control change number of each `cc` event is stored in `cc.number`
+
+        :return Dict[str, np.ndarray]: the arrays of the track, see `MIDITrack.fromArrays()`
+        """
+        notes = self.notes if isinstance(self.notes, MIDINoteArray) else MIDINoteArray.fromNotes(self.notes)
+        arrays = {f"notes.{column}": getattr(notes, column) for column in MIDINoteArray.COLUMNS}
+
+        ccNumbers = [number for number, events in self.controlChange.items() for _ in range(len(events))]
+        arrays["cc.number"] = np.array(ccNumbers, dtype=np.uint8)
+
+        for column, dtype in MIDITrack.EVENT_COLUMNS.items():
+            ccColumns = [_eventColumn(events, column, dtype) for events in self.controlChange.values()]
+            arrays[f"cc.{column}"] = np.concatenate(ccColumns) if ccColumns else np.zeros(0, dtype=dtype)
+            arrays[f"pitchwheel.{column}"] = _eventColumn(self.pitchwheel, column, dtype)
+            arrays[f"aftertouch.{column}"] = _eventColumn(self.aftertouch, column, dtype)
+        
+        return arrays
+
+    @classmethod
+    def fromArrays(cls, name: str, arrays: Dict[str, np.ndarray], columnar: bool=False, compact: bool=False) -> MIDITrack:
+        """creates a track from the arrays made by `MIDITrack.toArrays()`
+
+        :param str name: name of the track
+        :param Dict[str, np.ndarray] arrays: the arrays of the track
+        :param bool columnar: keep the notes as a `MIDINoteArray`, defaults to False
+        :param bool compact: keep the notes and events in arrays, like `toCompact()`, defaults to False
+        :return MIDITrack: the track
+        """
+        track = cls(name, compact=compact)
+
+        def toEvents(prefix: str) -> List[MIDIEvent]:
+            columns = [arrays[f"{prefix}.{column}"].tolist() for column in MIDITrack.EVENT_COLUMNS]
+            return [track._eventType(*values) for values in zip(*columns)]
+
+        def toEventArray(prefix: str) -> MIDIEventArray:
+            return MIDIEventArray(CompactMIDIEvent, **{column: arrays[f"{prefix}.{column}"] for column in MIDITrack.EVENT_COLUMNS})
+
+        notes = MIDINoteArray(CompactMIDINote if compact else MIDINote, **{column: arrays[f"notes.{column}"] for column in MIDINoteArray.COLUMNS})
+        track.notes = notes if columnar or compact else notes.toNotes(track._noteType)
+
+        if compact:
+            ccNumbers, ccEvents = arrays["cc.number"], toEventArray("cc")
+            # dict.fromkeys keeps the order the control numbers were stored in
+            for number in dict.fromkeys(ccNumbers.tolist()):
+                track.controlChange[number] = ccEvents[ccNumbers == number]
+
+            track.pitchwheel = toEventArray("pitchwheel")
+            track.aftertouch = toEventArray("aftertouch")
+        else:
+            for number, event in zip(arrays["cc.number"].tolist(), toEvents("cc")):
+                if number in track.controlChange:
+                    track.controlChange[number].append(event)
+                else:
+                    track.controlChange[number] = [event]
+            
+            track.pitchwheel = toEvents("pitchwheel")
+            track.aftertouch = toEvents("aftertouch")
+
+        # all the notes are complete, the note pairer is not needed
+        del track._notePairer
+
+        track.computeProfile()
+
+        return track
+
+    def toColumnar(self) -> None:
+        """converts the notes of this track to a `MIDINoteArray` (columnar storage), in place.
+        the notes can still be iterated and indexed like a list of `MIDINote`s
+        """
+        if not isinstance(self.notes, MIDINoteArray):
+            self.notes = MIDINoteArray.fromNotes(self.notes)
+            self._noteIndex = None
+
+    def toCompact(self) -> None:
+        """moves the notes and events of this track into a `MIDINoteArray` and `MIDIEventArray`s (columnar storage), in place.
+        a note then takes 35 bytes and an event 21 bytes, instead of a Python object with a Python object for each value.
+        indexing and iterating them builds `CompactMIDINote`s and `CompactMIDIEvent`s on access. like with `toColumnar()`,
+        changing those does not change the track, and no notes or events can be added to it anymore
+        """
+        if not isinstance(self.notes, MIDINoteArray):
+            self.notes = MIDINoteArray.fromNotes(self.notes)
+        
+        self.notes.noteType = CompactMIDINote
+        self._noteIndex = None
+
+        for number, events in self.controlChange.items():
+            self.controlChange[number] = MIDIEventArray.fromEvents(events, CompactMIDIEvent)
+
+        self.pitchwheel = MIDIEventArray.fromEvents(self.pitchwheel, CompactMIDIEvent)
+        self.aftertouch = MIDIEventArray.fromEvents(self.aftertouch, CompactMIDIEvent)
+
+    @staticmethod
+    def resampleEvents(events: Union[List[MIDIEvent], MIDIEventArray], fps: float=None, policy: str="last") -> Tuple[np.ndarray, np.ndarray]:
+        """buckets events (e.g. `track.controlChange[1]` or `track.pitchwheel`) onto the frame grid, so there is at most one value per frame.
+        every event goes to its nearest frame
+
+        :param Union[List[MIDIEvent], MIDIEventArray] events: the events, sorted by time
+        :param float fps: frames per second, defaults to None (the FPS of the Blender scene, see `getExactFps()`)
+        :param str policy: how the values on the same frame are combined, `last`, `first`, `max`, `min` or `mean`, defaults to "last"
+        :return Tuple[np.ndarray, np.ndarray]: the frames that have events (sorted, unique) and the value for each frame
+        """
+        if fps is None:
+            from .. utils.blender import getExactFps
+            fps = getExactFps()
+        
+        times = _eventColumn(events, "time", np.float64)
+        values = _eventColumn(events, "value", np.float64)
+
+        return _resampleToFrames(times, values, fps, policy)
+
+    def resampleNotes(self, fps: float=None, policy: str="first", value: str="velocity") -> Tuple[np.ndarray, np.ndarray]:
+        """buckets the note ons of the track onto the frame grid, so there is at most one value per frame.
+        every note goes to its nearest frame
+
+        :param float fps: frames per second, defaults to None (the FPS of the Blender scene, see `getExactFps()`)
+        :param str policy: how the notes on the same frame are combined, `first` (first note wins), `last`, `max`, `min` or `mean`, defaults to "first"
+        :param str value: the note attribute to use, `velocity` or `noteNumber`, defaults to "velocity"
+        :return Tuple[np.ndarray, np.ndarray]: the frames that have notes (sorted, unique) and the value for each frame
+        """
+        if fps is None:
+            from .. utils.blender import getExactFps
+            fps = getExactFps()
+        
+        notes = self.notes if isinstance(self.notes, MIDINoteArray) else MIDINoteArray.fromNotes(self.notes)
+        
+        # stable, so notes on the same time keep their order for `first` and `last`
+        order = np.argsort(notes.timeOn, kind="stable")
+
+        return _resampleToFrames(notes.timeOn[order], getattr(notes, value)[order], fps, policy)
+
+    def decimateEvents(self, tolerance: float=1.0) -> None:
+        """removes control change, pitchwheel and aftertouch events that can be left out without changing the curve they make by more than `tolerance`
+        (Ramer-Douglas-Peucker), in place. each control number and channel is decimated on its own. The first and last event are always kept
+
+        :param float tolerance: the largest error allowed, in 7-bit values (0-127). For the pitchwheel (14-bit) it is multiplied by 128, defaults to 1.0
         """
-        self.aftertouch.append(MIDIEvent(channel, value, time))
+        def decimate(events: Union[List[MIDIEvent], MIDIEventArray], tolerance: float) -> Union[List[MIDIEvent], MIDIEventArray]:
+            if len(events) < 3:
+                return events
+
+            channels = _eventColumn(events, "channel", np.uint8)
+            times = _eventColumn(events, "time", np.float64)
+            values = _eventColumn(events, "value", np.float64)
+
+            keep = np.zeros(len(events), dtype=bool)
+            for channel in np.unique(channels).tolist():
+                indices = np.flatnonzero(channels == channel)
+                keep[indices[decimateCurve(times[indices], values[indices], tolerance)]] = True
+
+            if isinstance(events, MIDIEventArray):
+                return events[keep]
+
+            return [event for event, kept in zip(events, keep.tolist()) if kept]
+
+        for number, events in self.controlChange.items():
+            self.controlChange[number] = decimate(events, tolerance)
+
+        self.pitchwheel = decimate(self.pitchwheel, tolerance * 128)
+        self.aftertouch = decimate(self.aftertouch, tolerance)
+
+        self._profile = None
+
+    @property
+    def profile(self) -> MIDITrackProfile:
+        """the statistics of the track (used notes, note & velocity range, channels, polyphony, ...).
+        `MIDIFile` computes it while parsing, otherwise it is computed the first time it is used.
+        it is recomputed when notes or events are added or re-timed, call `computeProfile()` after changing the notes or events directly
+
+        :return MIDITrackProfile: the profile
+        """
+        if self._profile is None:
+            self._profile = MIDITrackProfile.fromTrack(self)
+
+        return self._profile
+
+    def computeProfile(self) -> MIDITrackProfile:
+        """(re)computes the statistics of the track
+
+        :return MIDITrackProfile: the profile
+        """
+        self._profile = MIDITrackProfile.fromTrack(self)
+        return self._profile
+
+    @property
+    def noteIndex(self) -> MIDINoteIndex:
+        """the time index of the notes, built the first time it is used.
+        it is rebuilt when notes are added or re-timed, call `buildNoteIndex()` after changing `notes` directly
+
+        :return MIDINoteIndex: the index
+        """
+        if self._noteIndex is None:
+            self._noteIndex = MIDINoteIndex(self.notes)
+
+        return self._noteIndex
+
+    def buildNoteIndex(self) -> MIDINoteIndex:
+        """(re)builds the time index of the notes
+
+        :return MIDINoteIndex: the index
+        """
+        self._noteIndex = MIDINoteIndex(self.notes)
+        return self._noteIndex
+
+    def notesInRange(self, start: float, end: float, overlapping: bool=False) -> Union[List[MIDINote], MIDINoteArray]:
+        """selects the notes within a time window in logarithmic time, see `MIDINoteIndex.notesInRange()`
+
+        :param float start: start of the window, in seconds
+        :param float end: end of the window, in seconds (exclusive)
+        :param bool overlapping: also select notes that started before the window and are still sounding in it, defaults to False
+        :return Union[List[MIDINote], MIDINoteArray]: the notes, sorted by time on
+        """
+        return self.noteIndex.notesInRange(start, end, overlapping)
+
+    def activeNotesAt(self, time: float) -> Union[List[MIDINote], MIDINoteArray]:
+        """gets the notes that are sounding at `time` in logarithmic time, see `MIDINoteIndex.activeNotesAt()`
+
+        :param float time: the time, in seconds
+        :return Union[List[MIDINote], MIDINoteArray]: the notes, sorted by time on
+        """
+        return self.noteIndex.activeNotesAt(time)
+
+    def nextNoteAfter(self, time: float, noteNumber: int=None) -> MIDINote:
+        """gets the first note that starts after `time` in logarithmic time, see `MIDINoteIndex.nextNoteAfter()`
+
+        :param float time: the time, in seconds
+        :param int noteNumber: only look at notes with this note number, defaults to None (any note)
+        :return MIDINote: the note, or None if there is no note after `time`
+        """
+        return self.noteIndex.nextNoteAfter(time, noteNumber)
 
     def _isEmpty(self) -> bool:
         """checks if MIDITrack is empty
@@ -159,10 +1268,9 @@ class MIDITrack:
 
     def allUsedNotes(self) -> list:
         """
-        :return list: a list of all used notes in the MIDITrack
+        :return list: a sorted list of all used notes in the MIDITrack
         """
-
-        return removeDuplicates([note.noteNumber for note in self.notes])
+        return list(self.profile.usedNotes)
 
     def __str__(self) -> str:
         # TODO: Refactor & optimize
@@ -206,21 +1314,45 @@ class MIDITrack:
         
         return "".join(out)
 
+    @classmethod
+    def merge(cls, tracks: Iterable[MIDITrack], name: str=None) -> MIDITrack:
+        """merges tracks into a new track in one linear pass (k-way merge), keeping everything sorted by time.
+        the notes and events of the tracks must already be sorted by time, like the tracks of a `MIDIFile`.
+        things on the same time keep the order of the tracks. control changes are merged per control number, so nothing is lost
+
+        :param Iterable[MIDITrack] tracks: the tracks to merge
+        :param str name: name of the new track, defaults to None (the names of the tracks joined with " & ")
+        :return MIDITrack: the merged track
+        """
+        tracks = list(tracks)
+        merged = cls(name if name is not None else " & ".join(track.name for track in tracks))
+
+        if tracks and all(isinstance(track.notes, MIDINoteArray) for track in tracks):
+            # stable sort (timsort) of the concatenated runs, which are already sorted
+            merged.notes = MIDINoteArray(tracks[0].notes.noteType, **{name: np.concatenate([getattr(track.notes, name) for track in tracks]) for name in MIDINoteArray.COLUMNS})
+            merged.notes.sort()
+        else:
+            merged.notes = list(heapq.merge(*(track.notes for track in tracks), key=lambda note: note.timeOn))
+        
+        def mergeEvents(eventLists: Iterable[List[MIDIEvent]]) -> List[MIDIEvent]:
+            return list(heapq.merge(*eventLists, key=lambda event: event.time))
+
+        for number in sorted(set().union(*(track.controlChange for track in tracks))):
+            merged.controlChange[number] = mergeEvents(track.controlChange[number] for track in tracks if number in track.controlChange)
+
+        merged.pitchwheel = mergeEvents(track.pitchwheel for track in tracks)
+        merged.aftertouch = mergeEvents(track.aftertouch for track in tracks)
+        merged.orphanNoteOffs = mergeEvents(track.orphanNoteOffs for track in tracks)
+
+        # all the notes are complete, the note pairer is not needed
+        del merged._notePairer
+
+        return merged
+
     def __add__(self, other) -> MIDITrack:
         logger.info(f"Attempting to merge tracks '{self.name}' & '{other.name}' ...")
         try:
-            addedTrack = MIDITrack(f"{self.name} & {other.name}")
-
-            addedTrack.notes = sorted(self.notes + other.notes)
-            
-            controlChangeCloned = self.controlChange.copy()
-            controlChangeCloned.update(other.controlChange)
-
-            addedTrack.controlChange = controlChangeCloned
-            
-            addedTrack.pitchweel = sorted(self.pitchwheel + other.pitchwheel)
-            addedTrack.aftertouch = sorted(self.aftertouch + other.aftertouch)
-            return addedTrack
+            return MIDITrack.merge((self, other))
         except Exception as e:
             raise RuntimeError(f"Failed to merge tracks '{self.name}' & '{other.name}'! \nException: {e}")
 
@@ -231,30 +1363,445 @@ class MIDITrack:
 
         return f"<{module}.{qualname} object \"{self.name}\", at {hex(id(self))}>"
 
+@dataclass
+class _TrackChunk:
+    """a type 1 track chunk that has been indexed but not decoded yet (see `MIDIFile(lazy=True)`)"""
+    name: str
+    data: bytes = field(repr=False)
+
+def _indexTrack(events: Iterable[Tuple[int, int, int, int]]) -> Tuple[List[Tuple[int, int]], str, bool]:
+    """scans the raw events of a type 1 track chunk without decoding any notes.
+    resolves the track name the same way `_decodeTrack()` does
+
+    :param Iterable[Tuple[int, int, int, int]] events: the raw `(absoluteTick, status, data1, data2)` events of the track chunk
+    :return Tuple[List[Tuple[int, int]], str, bool]: the `(absoluteTick, tempo)` tempo changes, the track name, and if the decoded track would have any notes or events
+    """
+    tempoChanges = []
+    trackName = None
+    gmName = ""
+    hasContent = False
+
+    for tick, status, data1, data2 in events:
+        if status < 0xf0:
+            msgType = status & 0xf0
+
+            if msgType == 0xc0:
+                if not gmName:
+                    gmName = gmProgramToName(data1) if status & 0x0f != 9 else "Drumset"
+            elif (msgType == 0x90 and data2 > 0) or msgType in (0xb0, 0xd0, 0xe0):
+                hasContent = True
+
+        elif status == 0xff:
+            if data1 == 0x51:
+                tempoChanges.append((tick, (data2[0] << 16) | (data2[1] << 8) | data2[2]))
+            elif data1 == 0x03 and trackName is None:
+                trackName = data2.decode("latin1")
+
+    return tempoChanges, trackName or gmName, hasContent
+
+def _tagEvents(events: Iterable[Tuple[int, int, int, int]], trackIndex: int) -> Iterable[Tuple[int, int, int, int, int]]:
+    """adds the track index to raw events, for merging the events of several track chunks
+
+    :param Iterable[Tuple[int, int, int, int]] events: the raw `(absoluteTick, status, data1, data2)` events of a track chunk
+    :param int trackIndex: index of the track chunk
+    :return Iterable[Tuple[int, int, int, int, int]]: generator of `(absoluteTick, trackIndex, status, data1, data2)`
+    """
+    for tick, status, data1, data2 in events:
+        yield tick, trackIndex, status, data1, data2
+
+def _sliceEvents(events: Iterable[Tuple[int, int, int, int]], startTick: int, endTick: int, notePairing: str="fifo") -> Iterable[Tuple[int, int, int, int]]:
+    """clips the raw events of one track chunk to the ticks `startTick` to `endTick`.
+    channel events before `startTick` are not passed on, only the state they leave behind is, at `startTick`:
+    the notes that are still held, and the last control change, pitchwheel and aftertouch value of every channel.
+    notes still held at `endTick` get a note off at `endTick`, and reading stops there.
+    program changes and meta events are always passed on, as they name the track
+
+    :param Iterable[Tuple[int, int, int, int]] events: the raw `(absoluteTick, status, data1, data2)` events of the track chunk
+    :param int startTick: first tick of the slice, or None for the start of the track
+    :param int endTick: last tick of the slice, or None for the end of the track
+    :param str notePairing: note pairing policy, which held note a note off before `startTick` ends (see `MIDINotePairer`), defaults to "fifo"
+    :return Iterable[Tuple[int, int, int, int]]: generator of the clipped raw events
+    """
+    # (status, note number) -> velocities of the held notes, in the order they started
+    heldNotes = {}
+    # (status, control number) -> value and status -> value, for the last state before the slice
+    lastControls = {}
+    lastValues = {}
+    inSlice = startTick is None
+    lifo = notePairing == "lifo"
+
+    def enterSlice():
+        for (status, data1), value in lastControls.items():
+            yield startTick, status, data1, value
+        
+        for status, (data1, data2) in lastValues.items():
+            yield startTick, status, data1, data2
+
+        for (status, noteNumber), velocities in heldNotes.items():
+            for velocity in velocities:
+                yield startTick, status, noteNumber, velocity
+
+    for event in events:
+        tick, status, data1, data2 = event
+        msgType = status & 0xf0
+
+        if endTick is not None and tick > endTick:
+            break
+
+        if not inSlice and tick >= startTick:
+            inSlice = True
+            yield from enterSlice()
+
+        if status >= 0xf0 or msgType == 0xc0:
+            yield event
+            continue
+
+        if msgType == 0x90 and data2 > 0:
+            heldNotes.setdefault((status, data1), []).append(data2)
+        elif msgType == 0x80 or msgType == 0x90:
+            velocities = heldNotes.get(((status & 0x0f) | 0x90, data1))
+            if velocities and lifo:
+                velocities.pop()
+            elif velocities:
+                velocities.pop(0)
+        elif not inSlice:
+            if msgType == 0xb0:
+                lastControls[(status, data1)] = data2
+            else:
+                lastValues[status] = (data1, data2)
+        
+        if inSlice:
+            yield event
+    
+    # there may be no events in the slice at all (e.g. a note held over the whole slice)
+    if not inSlice:
+        yield from enterSlice()
+
+    if endTick is None:
+        return
+    
+    # end the notes that are still held (also if the track ended before the end of the slice)
+    for (status, noteNumber), velocities in heldNotes.items():
+        for _ in velocities:
+            yield endTick, (status & 0x0f) | 0x80, noteNumber, 0
+
+def _decodeTrack(events: Iterable[Tuple[int, int, int, int]], tempoMap: TempoMap, midiType: int, absoluteTicks: bool=False, 
+                 notePairing: str="fifo", closeHangingNotes: bool=False, maxNoteLength: float=None, compact: bool=False,
+                 start: float=None, end: float=None) -> List[MIDITrack]:
+    """decodes the raw events of one track chunk (see `mido.iter_raw_events()`) into `MIDITrack`s, without creating any `mido.Message` objects
+
+    :param Iterable[Tuple[int, int, int, int]] events: the raw `(absoluteTick, status, data1, data2)` events of the track chunk
+    :param TempoMap tempoMap: the tempo map of the file
+    :param int midiType: the MIDI file type, 0 or 1
+    :param bool absoluteTicks: only record absolute ticks and leave the times at 0 (see `MIDITrack.applyTempoMap()`), defaults to False
+    :param str notePairing: note pairing policy, see `MIDINotePairer`, defaults to "fifo"
+    :param bool closeHangingNotes: end notes without a note off at the end of the track chunk, defaults to False
+    :param float maxNoteLength: end notes without a note off after this many seconds (or at the end of the track chunk, if that is earlier), defaults to None
+    :param bool compact: use `CompactMIDINote` and `CompactMIDIEvent`, defaults to False
+    :param float start: only decode from this time on (in seconds), see `_sliceEvents()`, defaults to None
+    :param float end: only decode up to this time (in seconds), see `_sliceEvents()`, defaults to None
+    :return List[MIDITrack]: 16 tracks (one per channel) for type 0 files, 1 track for type 1 files. Tracks may be empty
+    """
+    if start is not None or end is not None:
+        events = _sliceEvents(events, None if start is None else tempoMap.secondToTick(start), 
+                              None if end is None else tempoMap.secondToTick(end), notePairing)
+
+    if midiType == 0:
+        # Type 0
+        # Tracks depend on MIDI Channels for the different tracks
+        # Instance in 16 MIDI tracks
+        midiTracks = [MIDITrack("", notePairing, compact) for _ in range(16)]
+    else:
+        # Type 1
+        midiTracks = [MIDITrack("", notePairing, compact)]
+
+    curChannel = 0
+    curTrack = midiTracks[curChannel]
+    hasTrackName = False
+    tickToSecond = tempoMap.tickToSecond
+    tick = 0
+
+    for tick, status, data1, data2 in events:
+        # in absolute ticks mode, seconds are computed for the whole track after parsing
+        time = 0.0 if absoluteTicks else tickToSecond(tick)
+
+        # channel messages
+        if status < 0xf0:
+            msgType = status & 0xf0
+            channel = status & 0x0f
+
+            if midiType == 0:
+                # update tracks as they are read in
+                curChannel = channel
+                curTrack = midiTracks[curChannel]
+
+            # velocity 0 note_on messages need to be note_off
+            if msgType == 0x90 and data2 > 0:
+                curTrack.addNoteOn(channel, data1, data2, time, tick)
+
+            elif msgType == 0x80 or msgType == 0x90:
+                curTrack.addNoteOff(channel, data1, data2, time, tick)
+
+            elif msgType == 0xc0:
+                # program change, General MIDI name
+                gmName = gmProgramToName(data1) if channel != 9 else "Drumset"
+
+                if len(curTrack.name) == 0 or (midiType == 0 and curTrack.name == f"Track {curChannel + 1}"):
+                    curTrack.name = gmName
+
+            elif msgType == 0xb0:
+                curTrack.addControlChange(data1, channel, data2, time, tick)
+
+            elif msgType == 0xe0:
+                curTrack.addPitchwheel(channel, data1 | ((data2 << 7) + mido.MIN_PITCHWHEEL), time, tick)
+
+            elif msgType == 0xd0:
+                curTrack.addAftertouch(channel, data1, time, tick)
+        
+        elif status == 0xff and data1 == 0x03 and not hasTrackName:
+            # the first track name message names the track (for type 0, the first channel)
+            # this takes priority over the General MIDI name
+            hasTrackName = True
+            if data2:
+                midiTracks[0].name = data2.decode("latin1")
+
+        if midiType == 0 and len(curTrack.name) == 0:
+            curTrack.name = f"Track {curChannel + 1}"
+
+    # tick is now the end of the track chunk
+    for track in midiTracks:
+        if closeHangingNotes or maxNoteLength is not None:
+            _closeHangingNotes(track, tick, tempoMap, absoluteTicks, maxNoteLength)
+
+        if track.orphanNoteOffs:
+            logger.warning(f"MIDI track '{track.name}' has {len(track.orphanNoteOffs)} note off message(s) without a note on message, they were ignored. Your MIDI File may be corrupt.")
+
+    return midiTracks
+
+def _closeHangingNotes(track: MIDITrack, endTick: int, tempoMap: TempoMap, absoluteTicks: bool, maxNoteLength: float=None) -> None:
+    """ends the notes of a track that never got a note off
+
+    :param MIDITrack track: the track, still being built
+    :param int endTick: absolute tick of the end of the track chunk
+    :param TempoMap tempoMap: the tempo map of the file
+    :param bool absoluteTicks: only set the ticks and leave the times at 0 (see `MIDITrack.applyTempoMap()`)
+    :param float maxNoteLength: end the notes after this many seconds if that is before `endTick`, defaults to None
+    """
+    for note in track._notePairer.popOpenNotes():
+        tickOff = endTick
+        if maxNoteLength is not None:
+            tickOff = min(tickOff, tempoMap.secondToTick(tempoMap.tickToSecond(note.tickOn) + maxNoteLength))
+
+        note.tickOff = tickOff
+        note.timeOff = 0.0 if absoluteTicks else tempoMap.tickToSecond(tickOff)
+
+def _decodeTrackToArrays(data: bytes, tempoMap: TempoMap, absoluteTicks: bool, options: Dict) -> Tuple[str, Dict[str, np.ndarray]]:
+    """decodes a type 1 track chunk into compact arrays. This runs in the worker processes of `MIDIFile(workers=...)`
+
+    :param bytes data: the data of the track chunk
+    :param TempoMap tempoMap: the tempo map of the file
+    :param bool absoluteTicks: only record absolute ticks while decoding, and convert to seconds at the end
+    :param Dict options: the note pairing options of `_decodeTrack()`
+    :return Tuple[str, Dict[str, np.ndarray]]: the track name and the arrays of the track (see `MIDITrack.toArrays()`), or None if the track is empty
+    """
+    track = _decodeTrack(mido.iter_raw_events(data, 0, len(data)), tempoMap, 1, absoluteTicks, **options)[0]
+    if track._isEmpty():
+        return None
+
+    if absoluteTicks:
+        track.applyTempoMap(tempoMap)
+    
+    track.notes.sort()
+
+    return track.name, track.toArrays()
+
+# bump this when the output of the parser changes, so cached files (see `MIDICache`) are parsed again
+_PARSER_VERSION = 1
+
+# default note pairing options of `_decodeTrack()`
+_DEFAULT_DECODE_OPTIONS = {"notePairing": "fifo", "closeHangingNotes": False, "maxNoteLength": None, "start": None, "end": None}
+
+# columnar binary format, see `MIDIFile.toColumnarBytes()`
+_COLUMNAR_MAGIC = b"MIDIANIM"
+_COLUMNAR_VERSION = 1
+_COLUMNAR_HEADER = struct.Struct("<8sH2xIII8x")
+_COLUMNAR_ENTRY = struct.Struct("<I4sQQ")
+_COLUMNAR_STRING = struct.Struct("<I")
+
 class MIDIFile:
     # lists of tracks
     _tracks = List[MIDITrack]
 
-    def __init__(self, midiFile: str):
+    # tempo map of the file, built once while parsing
+    tempoMap: TempoMap
+
+    def __init__(self, midiFile: str, absoluteTicks: bool=False, columnar: bool=False, lazy: bool=False, cache: Union[bool, MIDICache]=False, workers: int=1,
+                 notePairing: str="fifo", closeHangingNotes: bool=False, maxNoteLength: float=None, compact: bool=False, decimate: float=None,
+                 start: float=None, end: float=None):
         """
         open file and store it as data in lists
         tracks with channels and track names, timesOn and off information
         for each track, velocity and MIDI CC info for each track, etc
 
         :param str midiFile: MIDI file path
+        :param bool absoluteTicks: only record absolute ticks while reading the file, and convert every track to seconds in one bulk conversion at the end, defaults to False
+        :param bool columnar: store the notes of each track in a `MIDINoteArray` (see `MIDITrack.toColumnar()`), defaults to False
+        :param bool lazy: only index the track names and the tempo map when opening the file. Each track is decoded the first time it is accessed 
+        (`findTrack()`, `getMIDITracks()` or iterating), which makes picking one track out of a large file much faster. Type 0 files are always decoded fully, defaults to False
+        :param Union[bool, MIDICache] cache: store the parsed tracks in a `MIDICache` (`True` for the default cache), so opening the same file again skips decoding it.
+        when the file is not in the cache yet, it is decoded fully (even with `lazy`) so it can be stored, defaults to False
+        :param int workers: number of processes used to decode the tracks of type 1 files. 1 decodes them in this process, 0 uses one process per CPU.
+        if the worker processes can not be started, the tracks are decoded in this process instead. Ignored with `lazy`, defaults to 1
+        :param str notePairing: which open note a note off ends when the same note is played again before it ended, `fifo` (the oldest one) or `lifo` (the newest one), defaults to "fifo"
+        :param bool closeHangingNotes: end notes that never get a note off at the end of their track, otherwise their `timeOff` stays -1.0, defaults to False
+        :param float maxNoteLength: end notes that never get a note off after this many seconds (or at the end of their track, if that is earlier), defaults to None
+        :param bool compact: store the notes and events of each track in arrays (see `MIDITrack.toCompact()`). Indexing and iterating them builds `CompactMIDINote`s and `CompactMIDIEvent`s on access,
+        which have the same attributes and ordering as `MIDINote` and `MIDIEvent`. A track takes less than a fifth of the memory.
+        like with `columnar`, changing a note or event does not change the track, defaults to False
+        :param float decimate: decimate the control change, pitchwheel and aftertouch events of each track with this tolerance while parsing (see `MIDITrack.decimateEvents()`), defaults to None
+        :param float start: only load the file from this time on (in seconds), for previewing part of a song. notes held at `start` begin at `start`,
+        and the last control change, pitchwheel and aftertouch values before `start` are set at `start`, defaults to None
+        :param float end: only load the file up to this time (in seconds), the rest of the file is not read. notes held at `end` end at `end`, defaults to None
+        :raises ValueError: if the note pairing policy is unknown, or `end` is not after `start`
         """
+        self.absoluteTicks = absoluteTicks
+        self.columnar = columnar
+        self.lazy = lazy
+        self.cache = MIDICache() if cache is True else (cache or None)
+        self.workers = workers
+        self.compact = compact
+        self.decimate = decimate
+
+        if notePairing not in MIDINotePairer.POLICIES:
+            raise ValueError(f"Unknown note pairing policy '{notePairing}'! Use one of {', '.join(MIDINotePairer.POLICIES)}.")
+
+        if start is not None and end is not None and end <= start:
+            raise ValueError(f"The end of the slice ({end}) must be after its start ({start})!")
+
+        # options for `_decodeTrack()`
+        self._decodeOptions = {"notePairing": notePairing, "closeHangingNotes": closeHangingNotes, "maxNoteLength": maxNoteLength, "start": start, "end": end}
 
         # store lists of info
         self._tracks = self._parseMIDI(midiFile)
         
+    def retime(self, tempoMap: TempoMap=None, stretch: float=1.0) -> None:
+        """re-times all of the tracks from their absolute ticks, without parsing the MIDI file again.
+
+        :param TempoMap tempoMap: the tempo map to use instead of the current one (e.g., `TempoMap.constant()` to override the tempo), defaults to None
+        :param float stretch: time stretch factor applied on top of the tempo map, 2 is twice as long, defaults to 1.0
+        """
+        if tempoMap is None:
+            tempoMap = self.tempoMap
+        
+        if stretch != 1.0:
+            tempoMap = tempoMap.stretched(stretch)
+
+        for track in self._tracks:
+            # tracks that are not decoded yet will use the new tempo map when they are
+            if isinstance(track, _TrackChunk): continue
+
+            track.applyTempoMap(tempoMap)
+            track.notes.sort()
+
+        self.tempoMap = tempoMap
+
+
+    @staticmethod
+    def stream(midiFile: str) -> Iterable[MIDIStreamEvent]:
+        """reads the note, CC, pitchwheel and aftertouch events of a MIDI file (type 0 or 1) one by one, in time order over all tracks.
+        the events are read straight from the file (memory mapped) and are not stored anywhere, so memory use does not grow with the length of the file.
+        notes are not paired, every note on and note off is its own event (note on events with a velocity of 0 are note off events)
+
+        :param str midiFile: MIDI file path
+        :return Iterable[MIDIStreamEvent]: generator of the events
+        """
+        # use abspath "//"
+        if "bpy" in modules:
+            from bpy.path import abspath
+            midiFile = abspath(midiFile)
+
+        with mido.open_buffer(midiFile) as data:
+            midiType, numTracks, ticksPerBeat, pos = mido.read_buffer_header(data)
+
+            assert midiType in range(2), "Type 2 MIDI Files are not supported!"
+
+            # k-way merge of the tracks, events on the same tick keep their track order
+            tracks = [_tagEvents(mido.iter_raw_events(data, start, end), trackIndex)
+                      for trackIndex, (start, end) in enumerate(mido.iter_buffer_tracks(data, pos, numTracks))]
+            
+            # current tempo segment, same math as `TempoMap.tickToSecond()`
+            segmentTick, segmentSeconds, tempo = 0, 0.0, 500000
+
+            for tick, trackIndex, status, data1, data2 in heapq.merge(*tracks, key=lambda event: event[0]):
+                if status < 0xf0:
+                    msgType = status & 0xf0
+                    time = segmentSeconds + (tick - segmentTick) * tempo / (1e6 * ticksPerBeat)
+
+                    if msgType == 0x90 and data2 > 0:
+                        yield MIDIStreamEvent(trackIndex, "note_on", status & 0x0f, data1, data2, time, tick)
+                    elif msgType == 0x80 or msgType == 0x90:
+                        yield MIDIStreamEvent(trackIndex, "note_off", status & 0x0f, data1, data2, time, tick)
+                    elif msgType == 0xb0:
+                        yield MIDIStreamEvent(trackIndex, "control_change", status & 0x0f, data1, data2, time, tick)
+                    elif msgType == 0xe0:
+                        yield MIDIStreamEvent(trackIndex, "pitchwheel", status & 0x0f, 0, data1 | ((data2 << 7) + mido.MIN_PITCHWHEEL), time, tick)
+                    elif msgType == 0xd0:
+                        yield MIDIStreamEvent(trackIndex, "aftertouch", status & 0x0f, 0, data1, time, tick)
+
+                elif status == 0xff and data1 == 0x51:
+                    # tempo change, start a new segment
+                    segmentSeconds += (tick - segmentTick) * tempo / (1e6 * ticksPerBeat)
+                    segmentTick = tick
+                    tempo = (data2[0] << 16) | (data2[1] << 8) | data2[2]
 
     def getMIDITracks(self) -> List[MIDITrack]:
         """returns a list of all `MIDITrack` objects in the `MIDIFile`
 
         :return List[MIDITrack]: a list of all `MIDITrack` objects
         """
+        for i in range(len(self._tracks)):
+            self._getTrack(i)
+
         return self._tracks
 
+    def _getTrack(self, index: int) -> MIDITrack:
+        """gets the track at `index`, decoding it first if it has not been decoded yet (lazy mode)
+
+        :param int index: index of the track
+        :return MIDITrack: the decoded track
+        """
+        track = self._tracks[index]
+
+        if isinstance(track, _TrackChunk):
+            track = _decodeTrack(mido.iter_raw_events(track.data, 0, len(track.data)), self.tempoMap, 1, self.absoluteTicks, compact=self.compact, **self._decodeOptions)[0]
+            self._finalizeTrack(track)
+            self._tracks[index] = track
+        
+        return track
+
+    def _finalizeTrack(self, track: MIDITrack) -> None:
+        """post-processing for a freshly decoded track
+
+        :param MIDITrack track: the track
+        """
+        if self.absoluteTicks:
+            track.applyTempoMap(self.tempoMap)
+
+        if self.decimate is not None:
+            track.decimateEvents(self.decimate)
+
+        # make sure notes are sorted
+        # & delete the note pairer (not needed)
+        track.notes.sort()
+        del track._notePairer
+
+        if self.compact:
+            track.toCompact()
+        elif self.columnar:
+            track.toColumnar()
+
+        track.computeProfile()
+
     def _parseMIDI(self, file: str) -> List[MIDITrack]:
         """helper method that takes a MIDI file (instrumentType 0 and 1) and returns a list of `MIDITracks`
 
@@ -267,110 +1814,267 @@ class MIDIFile:
             from bpy.path import abspath
             file = abspath(file)
         
-        midiFile = mido.MidiFile(file)
+        with mido.open_buffer(file) as data:
+            midiType, numTracks, ticksPerBeat, pos = mido.read_buffer_header(data)
 
-        assert midiFile.type in range(2), "Type 2 MIDI Files are not supported!"
+            assert midiType in range(2), "Type 2 MIDI Files are not supported!"
 
-        if midiFile.type == 0:
-            # Type 0
-            # Tracks depend on MIDI Channels for the different tracks
-            # Instance in 16 MIDI tracks
-            midiTracks = [MIDITrack("") for _ in range(16)]
-        else:
-            # Type 1
-            tempoMap = []
-            midiTracks = []
+            if self.cache is not None:
+                cacheKey = self.cache.key(data, self._cacheVersion())
+                cached = self.cache.load(cacheKey)
+                if cached is not None:
+                    return self._tracksFromArrays(cached)
 
-            time = 0
-            tempo = 500000
+            chunks = list(mido.iter_buffer_tracks(data, pos, numTracks))
+
+            if self.lazy and midiType == 1 and self.cache is None:
+                return self._indexMIDI(data, chunks, ticksPerBeat)
 
             # get tempo map first
-            for msg in mido.merge_tracks(midiFile.tracks):
-                time += mido.tick2second(msg.time, midiFile.ticks_per_beat  , tempo)
-                if msg.type == "set_tempo":
-                    tempo = msg.tempo
-                    tempoMap.append((time, msg.tempo))
+            tempoMap = TempoMap.fromRawTracks([mido.iter_raw_events(data, start, end) for start, end in chunks], ticksPerBeat)
+            self.tempoMap = tempoMap
 
-        for track in midiFile.tracks:
-            time = 0
-            tempo = 500000
+            midiTracks = None
+            if self.workers != 1 and midiType == 1 and len(chunks) > 1:
+                midiTracks = self._decodeTracksParallel(data, chunks)
 
-            if midiFile.type == 0:
-                curChannel = 0
-                curTrack = midiTracks[curChannel]
-            else:
-                curTrack = MIDITrack("")
+            if midiTracks is None:
+                midiTracks = []
+                for start, end in chunks:
+                    midiTracks.extend(_decodeTrack(mido.iter_raw_events(data, start, end), tempoMap, midiType, self.absoluteTicks, compact=self.compact, **self._decodeOptions))
 
-            if track.name:
-                curTrack.name = track.name
+                # remove empty tracks
+                midiTracks = list(filter(lambda track: not track._isEmpty(), midiTracks))
 
+                for track in midiTracks:
+                    self._finalizeTrack(track)
 
-            for msg in mido.merge_tracks([track]):
-                time += mido.tick2second(msg.time, midiFile.ticks_per_beat, tempo)
-                curType = msg.type
+        if self.cache is not None:
+            self.cache.store(cacheKey, self._tracksToArrays(midiTracks))
 
-                # channel messages
-                if midiFile.type == 0 and not msg.is_meta and msg.type != "sysex":
-                    # update tracks as they are read in
-                    curChannel = msg.channel
-                    curTrack = midiTracks[curChannel]
+        return midiTracks
 
-                # velocity 0 note_on messages need to be note_off
-                if curType == "note_on" and msg.velocity <= 0:
-                    curType = "note_off"
+    def _cacheVersion(self) -> str:
+        """gets the version for the cache key, which includes the note pairing, decimation and slice options when they change the output of the parser
 
-                if curType == "note_on":
-                    curTrack.addNoteOn(msg.channel, msg.note, msg.velocity, time)
+        :return str: the version
+        """
+        version = str(_PARSER_VERSION)
+        
+        options = self._decodeOptions
+        if any(options[key] != _DEFAULT_DECODE_OPTIONS[key] for key in ("notePairing", "closeHangingNotes", "maxNoteLength")):
+            version += f"-{options['notePairing']}-{int(options['closeHangingNotes'])}-{options['maxNoteLength']}"
 
-                elif curType == "note_off":
-                    curTrack.addNoteOff(msg.channel, msg.note, msg.velocity, time)
+        if options["start"] is not None or options["end"] is not None:
+            version += f"-slice{options['start']}-{options['end']}"
 
-                elif curType == "program_change":
-                    # General MIDI name
-                    gmName = gmProgramToName(msg.program) if msg.channel != 9 else "Drumset"
+        if self.decimate is not None:
+            version += f"-rdp{self.decimate}"
 
-                    if len(curTrack.name) == 0 or (midiFile.type == 0 and curTrack.name == f"Track {curChannel + 1}"):
-                        curTrack.name = gmName
-                    
-                elif curType == "control_change":
-                    curTrack.addControlChange(msg.control, msg.channel, msg.value, time)
+        return version
 
-                elif curType == "pitchwheel":
-                    curTrack.addPitchwheel(msg.channel, msg.pitch, time)
+    def _decodeTracksParallel(self, data, chunks: List[Tuple[int, int]]) -> List[MIDITrack]:
+        """helper method that decodes the track chunks of a type 1 MIDI file in worker processes.
+        each worker gets the raw chunk bytes and the tempo map, and sends back compact arrays
 
-                elif curType == "aftertouch":
-                    curTrack.addAftertouch(msg.channel, msg.value, time)
-                
-                if midiFile.type == 0 and len(curTrack.name) == 0:
-                    curTrack.name = f"Track {curChannel + 1}"
+        :param data: the MIDI file buffer
+        :param List[Tuple[int, int]] chunks: the `(start, end)` positions of each track chunk
+        :return List[MIDITrack]: the decoded (non-empty) tracks, or None if the worker processes failed
+        """
+        chunkData = [bytes(data[start:end]) for start, end in chunks]
 
-                # tempo section (must be at end of chain)
-                if midiFile.type == 0 and msg.type == "set_tempo":
-                    tempo = msg.tempo
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers or None) as pool:
+                results = list(pool.map(_decodeTrackToArrays, chunkData, repeat(self.tempoMap), repeat(self.absoluteTicks), repeat(self._decodeOptions)))
+        except Exception as e:
+            # e.g. the worker processes can't import MIDIAnimator outside of Blender
+            logger.warning(f"Could not decode MIDI tracks in parallel, decoding them one by one instead. Exception: {e}")
+            return None
 
-                if midiFile.type == 1:
-                    tempo = _closestTempo(tempoMap, time)[1]
-                    if tempo == float('inf'):  # FIXME this should probably just be fixed within the _closestTempo function
-                        tempo = tempoMap[-1][1]
-                    
+        tracks = [MIDITrack.fromArrays(name, arrays, columnar=self.columnar, compact=self.compact) for name, arrays in filter(None, results)]
+        
+        if self.decimate is not None:
+            for track in tracks:
+                track.decimateEvents(self.decimate)
+                track.computeProfile()
 
-                
+        return tracks
 
-                # add track to tracks for instrumentType 1
-                if midiFile.type == 1 and msg.is_meta and curType == "end_of_track" and not curTrack._isEmpty():
-                    midiTracks.append(curTrack)
+    def _tracksToArrays(self, tracks: List[MIDITrack]) -> Dict[str, np.ndarray]:
+        """converts parsed tracks (and the tempo map) to arrays for the cache
 
-        # remove empty tracks
-        midiTracks = list(filter(lambda track: not track._isEmpty(), midiTracks))
+        :param List[MIDITrack] tracks: the parsed tracks
+        :return Dict[str, np.ndarray]: the arrays
+        """
+        tempoTicks, tempos = zip(*self.tempoMap.tempoChanges)
+        arrays = {
+            "names": np.array([track.name for track in tracks], dtype=str),
+            "tempo.ticksPerBeat": np.array(self.tempoMap.ticksPerBeat, dtype=np.int64),
+            "tempo.ticks": np.array(tempoTicks, dtype=np.int64),
+            # tempos are floats after `retime()` with a stretch factor
+            "tempo.tempos": np.array(tempos, dtype=np.float64),
+        }
+
+        for i, track in enumerate(tracks):
+            for key, array in track.toArrays().items():
+                arrays[f"{i}.{key}"] = array
+        
+        return arrays
 
-        # make sure notes are sorted
-        # & delete noteTable (not needed)
-        for track in midiTracks:
-            track.notes.sort()
-            del track._noteTable
+    def saveColumnar(self, path: str) -> None:
+        """saves the parsed tracks to a columnar binary file, see `toColumnarBytes()`. Load it with `MIDIFile.loadColumnar()`
 
+        :param str path: path of the file
+        """
+        # use abspath "//"
+        if "bpy" in modules:
+            from bpy.path import abspath
+            path = abspath(path)
 
-        return midiTracks
+        with open(path, "wb") as f:
+            f.write(self.toColumnarBytes())
+
+    def toColumnarBytes(self) -> bytes:
+        """converts the parsed tracks to the columnar binary format, which can be loaded without parsing (see `MIDIFile.loadColumnar()`).
+        all values are little-endian:
+
+        - header (32 bytes): magic `MIDIANIM`, format version (uint16), 2 padding bytes, ticks per beat, number of tracks & number of arrays (uint32), 8 padding bytes
+        - directory, 24 bytes per array: index of the array name in the string table (uint32), NumPy dtype string (4 bytes, e.g. `<f8`), offset in the file & number of values (uint64)
+        - string table: the track names, then the array names. each string is its length in bytes (uint32) followed by UTF-8 text
+        - the arrays, each one aligned to 8 bytes
+
+        the arrays are named like the keys of `MIDITrack.toArrays()`, prefixed with the track index (e.g. `0.notes.timeOn`).
+        the tempo map is stored in the `tempo.ticks` (int64) & `tempo.tempos` (float64, tempos can be fractional after `retime()`) arrays
+
+        :return bytes: the file contents
+        """
+        arrays = self._tracksToArrays(self.getMIDITracks())
+        names = arrays.pop("names").tolist()
+        ticksPerBeat = int(arrays.pop("tempo.ticksPerBeat"))
+
+        arrays = {key: np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<")) for key, array in arrays.items()}
+        strings = b"".join(_COLUMNAR_STRING.pack(len(text)) + text for text in (string.encode("utf-8") for string in names + list(arrays)))
+        
+        offset = _COLUMNAR_HEADER.size + _COLUMNAR_ENTRY.size * len(arrays) + len(strings)
+        directory, data = [], []
+        for i, (key, array) in enumerate(arrays.items()):
+            padding = -offset % 8
+            directory.append(_COLUMNAR_ENTRY.pack(len(names) + i, array.dtype.str.encode("ascii"), offset + padding, len(array)))
+            data.append(bytes(padding) + array.tobytes())
+            offset += padding + array.nbytes
+
+        header = _COLUMNAR_HEADER.pack(_COLUMNAR_MAGIC, _COLUMNAR_VERSION, ticksPerBeat, len(names), len(arrays))
+        return b"".join([header, *directory, strings, *data])
+
+    @classmethod
+    def loadColumnar(cls, source: Union[str, bytes, memoryview], columnar: bool=False, compact: bool=False) -> MIDIFile:
+        """loads the tracks saved with `saveColumnar()` / `toColumnarBytes()`. Files are memory mapped with `numpy.memmap`, and the arrays are used as they are, without parsing.
+        with `columnar`, the note arrays of the tracks are views into the file (changes are not written back)
+
+        :param Union[str, bytes, memoryview] source: path of the file, or its contents
+        :param bool columnar: store the notes of each track in a `MIDINoteArray`, defaults to False
+        :param bool compact: store the notes and events of each track in arrays, see `MIDITrack.toCompact()`, defaults to False
+        :raises ValueError: if the data is not in the columnar format, or was saved by a newer version of MIDIAnimator
+        :return MIDIFile: the MIDI file
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            buffer = source
+        else:
+            # use abspath "//"
+            if "bpy" in modules:
+                from bpy.path import abspath
+                source = abspath(source)
+
+            # copy on write, so the arrays can be changed without changing the file
+            buffer = np.memmap(source, dtype=np.uint8, mode="c")
+
+        if len(buffer) < _COLUMNAR_HEADER.size:
+            raise ValueError("Not a MIDIAnimator columnar file!")
+        
+        magic, version, ticksPerBeat, numTracks, numArrays = _COLUMNAR_HEADER.unpack_from(buffer, 0)
+        if magic != _COLUMNAR_MAGIC:
+            raise ValueError("Not a MIDIAnimator columnar file!")
+        if version > _COLUMNAR_VERSION:
+            raise ValueError(f"Columnar file version {version} is not supported, please update MIDIAnimator!")
+
+        pos = _COLUMNAR_HEADER.size + _COLUMNAR_ENTRY.size * numArrays
+        strings = []
+        for _ in range(numTracks + numArrays):
+            length, = _COLUMNAR_STRING.unpack_from(buffer, pos)
+            pos += _COLUMNAR_STRING.size
+            strings.append(bytes(buffer[pos:pos + length]).decode("utf-8"))
+            pos += length
+
+        arrays = {
+            "names": np.array(strings[:numTracks], dtype=str),
+            "tempo.ticksPerBeat": np.array(ticksPerBeat, dtype=np.int64),
+        }
+        for i in range(numArrays):
+            nameIndex, dtype, offset, length = _COLUMNAR_ENTRY.unpack_from(buffer, _COLUMNAR_HEADER.size + _COLUMNAR_ENTRY.size * i)
+            dtype = np.dtype(dtype.rstrip(b"\0").decode("ascii"))
+            arrays[strings[nameIndex]] = np.frombuffer(buffer, dtype=dtype, count=length, offset=offset) if length else np.empty(0, dtype=dtype)
+
+        midiFile = cls.__new__(cls)
+        midiFile.absoluteTicks = False
+        midiFile.columnar = columnar
+        midiFile.lazy = False
+        midiFile.cache = None
+        midiFile.workers = 1
+        midiFile.compact = compact
+        midiFile.decimate = None
+        midiFile._decodeOptions = dict(_DEFAULT_DECODE_OPTIONS)
+        midiFile._tracks = midiFile._tracksFromArrays(arrays)
+
+        return midiFile
+
+    def _tracksFromArrays(self, arrays: Dict[str, np.ndarray]) -> List[MIDITrack]:
+        """creates the tracks (and the tempo map) from arrays in the cache
+
+        :param Dict[str, np.ndarray] arrays: the arrays, see `_tracksToArrays()`
+        :return List[MIDITrack]: the tracks
+        """
+        self.tempoMap = TempoMap(int(arrays["tempo.ticksPerBeat"]), zip(arrays["tempo.ticks"].tolist(), arrays["tempo.tempos"].tolist()))
+
+        tracks = []
+        for i, name in enumerate(arrays["names"].tolist()):
+            prefix = f"{i}."
+            trackArrays = {key[len(prefix):]: array for key, array in arrays.items() if key.startswith(prefix)}
+            tracks.append(MIDITrack.fromArrays(name, trackArrays, columnar=self.columnar, compact=self.compact))
+
+        return tracks
+
+    def _indexMIDI(self, data, chunks: List[Tuple[int, int]], ticksPerBeat: int) -> List[_TrackChunk]:
+        """helper method for lazy mode that builds the tempo map and indexes the track chunks of a type 1 MIDI file, without decoding them
+
+        :param data: the MIDI file buffer
+        :param List[Tuple[int, int]] chunks: the `(start, end)` positions of each track chunk
+        :param int ticksPerBeat: ticks per beat (quarter note) of the MIDI file
+        :return List[_TrackChunk]: the non-empty track chunks
+        """
+        tempoChanges = []
+        trackChunks = []
+        for start, end in chunks:
+            trackTempoChanges, name, hasContent = _indexTrack(mido.iter_raw_events(data, start, end))
+            tempoChanges.extend(trackTempoChanges)
+
+            # skip tracks that would be empty
+            if hasContent:
+                # copy the chunk so the file can be closed
+                trackChunks.append(_TrackChunk(name, bytes(data[start:end])))
+        
+        # stable sort, so tempo changes on the same tick keep their track order
+        tempoChanges.sort(key=lambda change: change[0])
+        self.tempoMap = TempoMap(ticksPerBeat, tempoChanges)
+
+        # with a slice, a track is only kept if it has content in the slice, which needs the tempo map
+        start, end = self._decodeOptions["start"], self._decodeOptions["end"]
+        if start is not None or end is not None:
+            startTick = None if start is None else self.tempoMap.secondToTick(start)
+            endTick = None if end is None else self.tempoMap.secondToTick(end)
+            trackChunks = [chunk for chunk in trackChunks 
+                           if _indexTrack(_sliceEvents(mido.iter_raw_events(chunk.data, 0, len(chunk.data)), startTick, endTick, self._decodeOptions["notePairing"]))[2]]
+
+        return trackChunks
     
     def findTrack(self, name) -> MIDITrack:
         """Finds the track with a specified name
@@ -380,9 +2084,9 @@ class MIDIFile:
         :param str name: The name of the track to be returned
         :return list: The track with the specified name
         """
-        for track in self._tracks:
+        for i, track in enumerate(self._tracks):
             if track.name == name:
-                return track
+                return self._getTrack(i)
         
         raise ValueError(f"Track name '{name}' does not exist!")
     
@@ -393,25 +2097,34 @@ class MIDIFile:
         """
         return [str(track.name) for track in self._tracks]
     
-    def mergeTracks(self, track1: MIDITrack, track2: MIDITrack, name: str=None) -> MIDITrack:
-        """merges 2 tracks together. You can also use the `+` operator.
+    def mergeTracks(self, *tracks: MIDITrack, name: str=None) -> MIDITrack:
+        """merges any number of tracks together in one linear pass, see `MIDITrack.merge()`. You can also use the `+` operator for 2 tracks.
 
-        :param MIDITrack track1: the first `MIDITrack` to merge
-        :param MIDITrack track2: the second `MIDITrack` to merge
+        :param MIDITrack tracks: the `MIDITrack`s to merge (e.g., `*midiFile.getMIDITracks()` to merge all of them).
+        a string after the tracks is used as the name, like the old `mergeTracks(track1, track2, name)`
         :param str name: name of the new track, defaults to None
+        :raises TypeError: if something else than a `MIDITrack` is passed as a track
         :return MIDITrack: the merged `MIDITrack`s.
         """
-        merged = track1 + track2
-        if name: merged.name = name
-        return merged
+        if tracks and isinstance(tracks[-1], str):
+            if name is not None:
+                raise TypeError("mergeTracks() got the name both as a positional and a keyword argument!")
+            *tracks, name = tracks
+        
+        for track in tracks:
+            if not isinstance(track, MIDITrack):
+                raise TypeError(f"mergeTracks() can only merge MIDITracks, got {type(track).__name__}!")
+        
+        logger.info(f"Attempting to merge tracks {', '.join(repr(track.name) for track in tracks)} ...")
+        return MIDITrack.merge(tracks, name)
 
     def __str__(self):
         out = []
-        for track in self._tracks:
+        for track in self:
             out.append(str(track))
 
         return "\n".join(out)
 
     def __iter__(self):
-        for track in self._tracks:
-            yield track
\ No newline at end of file
+        for i in range(len(self._tracks)):
+            yield self._getTrack(i)
\ No newline at end of file
@@ -97,10 +97,11 @@ from .messages import (Message, parse_string, parse_string_stream,
                        format_as_string, MIN_PITCHWHEEL, MAX_PITCHWHEEL,
                        MIN_SONGPOS, MAX_SONGPOS)
 from .parser import Parser, parse, parse_all
-from .midifiles import (MidiFile, MidiTrack, merge_tracks,
+from .midifiles import (MidiFile, MidiTrack, merge_tracks, iter_merged_abstime,
                         MetaMessage, UnknownMetaMessage,
                         bpm2tempo, tempo2bpm, tick2second, second2tick,
-                        KeySignatureError)
+                        KeySignatureError, open_buffer, read_buffer_header,
+                        iter_buffer_tracks, iter_raw_events)
 from .syx import read_syx_file, write_syx_file
 from .version import version_info
 from .__about__ import (__version__, __author__, __author_email__,
@@ -1,4 +1,5 @@
 from .meta import MetaMessage, UnknownMetaMessage, KeySignatureError
 from .units import tick2second, second2tick, bpm2tempo, tempo2bpm
-from .tracks import MidiTrack, merge_tracks
-from .midifiles import MidiFile
+from .tracks import MidiTrack, merge_tracks, iter_merged_abstime
+from .midifiles import (MidiFile, open_buffer, read_buffer_header,
+                        iter_buffer_tracks, iter_raw_events)
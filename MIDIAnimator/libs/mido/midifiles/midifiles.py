@@ -17,6 +17,7 @@ http://www.sonicspot.com/guide/midifiles.html
 
 from __future__ import print_function, division
 import io
+import mmap
 import time
 import string
 import struct
@@ -26,7 +27,7 @@ from ..messages import Message, SPEC_BY_STATUS
 from .meta import (MetaMessage, build_meta_message, meta_charset,
                    encode_variable_int)
 
-from .tracks import MidiTrack, merge_tracks, fix_end_of_track
+from .tracks import MidiTrack, iter_merged_abstime, fix_end_of_track
 from .units import tick2second
 
 # The default tempo is 120 BPM.
@@ -37,6 +38,15 @@ DEFAULT_TICKS_PER_BEAT = 480
 # Maximum message length to attempt to read.
 MAX_MESSAGE_LENGTH = 1000000
 
+# Number of data bytes for each status byte (None if the status byte
+# is undefined or has a variable length). Used by iter_raw_events() so
+# it doesn't have to look up message specs.
+_DATA_LENGTHS = [None] * 256
+for _status_byte, _spec in SPEC_BY_STATUS.items():
+    if _spec['length'] != float('inf'):
+        _DATA_LENGTHS[_status_byte] = _spec['length'] - 1
+del _status_byte, _spec
+
 
 def print_byte(byte, pos=0):
     char = chr(byte)
@@ -231,6 +241,248 @@ def read_track(infile, debug=False, clip=False):
     return track
 
 
+def _read_buffer_variable_int(data, pos):
+    # Returns (value, new position).
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7f)
+        if byte < 0x80:
+            return value, pos
+
+
+def read_buffer_header(data):
+    """Read the MThd chunk from the start of a buffer.
+
+    Returns (type, num_tracks, ticks_per_beat, position of first track)."""
+    if len(data) < 14:
+        raise EOFError
+
+    name, size = struct.unpack_from('>4sL', data, 0)
+    if name != b'MThd':
+        raise IOError('MThd not found. Probably not a MIDI file')
+    if size < 6 or len(data) < 8 + size:
+        raise EOFError
+
+    return struct.unpack_from('>hhh', data, 8) + (8 + size,)
+
+
+def read_buffer_track(data, pos, clip=False):
+    """Read a track chunk from a buffer (bytes, bytearray, memoryview or mmap).
+
+    The chunk is walked with an integer cursor instead of reading the
+    file one byte at a time. Returns (track, position after the chunk)."""
+    track = MidiTrack()
+
+    if pos + 8 > len(data):
+        raise EOFError
+
+    name, size = struct.unpack_from('>4sL', data, pos)
+
+    if name != b'MTrk':
+        raise IOError('no MTrk header at start of track')
+
+    pos += 8
+    end = pos + size
+    if end > len(data):
+        raise EOFError
+
+    last_status = None
+    append = track.append
+
+    try:
+        while pos < end:
+            # Delta time (variable length int, inlined).
+            delta = 0
+            while True:
+                byte = data[pos]
+                pos += 1
+                delta = (delta << 7) | (byte & 0x7f)
+                if byte < 0x80:
+                    break
+
+            status_byte = data[pos]
+            pos += 1
+
+            if status_byte < 0x80:
+                if last_status is None:
+                    raise IOError('running status without last_status')
+                # Running status, the byte we read is the first data byte.
+                pos -= 1
+                status_byte = last_status
+            elif status_byte != 0xff:
+                # Meta messages don't set running status.
+                last_status = status_byte
+
+            if status_byte == 0xff:
+                meta_type = data[pos]
+                length, pos = _read_buffer_variable_int(data, pos + 1)
+                if length > MAX_MESSAGE_LENGTH:
+                    raise IOError('Message length {} exceeds maximum length {}'.format(
+                        length, MAX_MESSAGE_LENGTH))
+                if pos + length > end:
+                    raise EOFError
+                append(build_meta_message(meta_type, list(data[pos:pos + length]), delta))
+                pos += length
+
+            elif status_byte in (0xf0, 0xf7):
+                length, pos = _read_buffer_variable_int(data, pos)
+                if length > MAX_MESSAGE_LENGTH:
+                    raise IOError('Message length {} exceeds maximum length {}'.format(
+                        length, MAX_MESSAGE_LENGTH))
+                if pos + length > end:
+                    raise EOFError
+                sysex_data = list(data[pos:pos + length])
+                pos += length
+
+                # Strip start and end bytes.
+                if sysex_data and sysex_data[0] == 0xf0:
+                    sysex_data = sysex_data[1:]
+                if sysex_data and sysex_data[-1] == 0xf7:
+                    sysex_data = sysex_data[:-1]
+                if clip:
+                    sysex_data = [byte if byte < 127 else 127 for byte in sysex_data]
+
+                append(Message('sysex', data=sysex_data, time=delta))
+
+            else:
+                try:
+                    spec = SPEC_BY_STATUS[status_byte]
+                except LookupError:
+                    raise IOError('undefined status byte 0x{:02x}'.format(status_byte))
+
+                size = spec['length'] - 1
+                if pos + size > end:
+                    raise EOFError
+                data_bytes = list(data[pos:pos + size])
+                pos += size
+
+                if clip:
+                    data_bytes = [byte if byte < 127 else 127 for byte in data_bytes]
+                else:
+                    for byte in data_bytes:
+                        if byte > 127:
+                            raise IOError('data byte must be in range 0..127')
+
+                append(Message.from_bytes([status_byte] + data_bytes, time=delta))
+    except IndexError:
+        raise EOFError
+
+    return track, end
+
+
+def iter_buffer_tracks(data, pos, num_tracks):
+    """Yield (start, end) of the data of each MTrk chunk in a buffer.
+
+    pos is the position of the first track, as returned by
+    read_buffer_header()."""
+    for i in range(num_tracks):
+        if pos + 8 > len(data):
+            raise EOFError
+
+        name, size = struct.unpack_from('>4sL', data, pos)
+
+        if name != b'MTrk':
+            raise IOError('no MTrk header at start of track')
+
+        pos += 8
+        if pos + size > len(data):
+            raise EOFError
+
+        yield pos, pos + size
+        pos += size
+
+
+def iter_raw_events(data, start, end, tick=0):
+    """Yield the events of a track chunk as raw tuples.
+
+    This skips Message construction and validation entirely. Every
+    event is a tuple (abs_tick, status, data1, data2):
+
+    * channel and system common messages: the status byte (including
+      the channel) and the data bytes. data2 (and data1) is 0 if the
+      message has fewer data bytes.
+    * meta messages: (abs_tick, 0xff, meta_type, payload_bytes)
+    * sysex messages: (abs_tick, 0xf0, 0, payload_bytes)
+
+    start and end are the positions of the chunk data, as returned by
+    iter_buffer_tracks()."""
+    pos = start
+    last_status = None
+    data_lengths = _DATA_LENGTHS
+
+    try:
+        while pos < end:
+            byte = data[pos]
+            pos += 1
+            delta = byte & 0x7f
+            while byte >= 0x80:
+                byte = data[pos]
+                pos += 1
+                delta = (delta << 7) | (byte & 0x7f)
+            tick += delta
+
+            status_byte = data[pos]
+            if status_byte < 0x80:
+                if last_status is None:
+                    raise IOError('running status without last_status')
+                status_byte = last_status
+            else:
+                pos += 1
+                if status_byte != 0xff:
+                    # Meta messages don't set running status.
+                    last_status = status_byte
+
+            if status_byte < 0xf0:
+                # Channel messages (the most common case).
+                if data_lengths[status_byte] == 2:
+                    yield tick, status_byte, data[pos], data[pos + 1]
+                    pos += 2
+                else:
+                    yield tick, status_byte, data[pos], 0
+                    pos += 1
+
+            elif status_byte == 0xff or status_byte == 0xf0 or status_byte == 0xf7:
+                if status_byte == 0xff:
+                    meta_type = data[pos]
+                    pos += 1
+                else:
+                    meta_type = 0
+                    status_byte = 0xf0
+
+                length, pos = _read_buffer_variable_int(data, pos)
+                if pos + length > end:
+                    raise EOFError
+                yield tick, status_byte, meta_type, bytes(data[pos:pos + length])
+                pos += length
+
+            else:
+                size = data_lengths[status_byte]
+                if size is None:
+                    raise IOError('undefined status byte 0x{:02x}'.format(status_byte))
+                yield (tick, status_byte,
+                       data[pos] if size > 0 else 0,
+                       data[pos + 1] if size > 1 else 0)
+                pos += size
+    except IndexError:
+        raise EOFError
+
+
+def open_buffer(filename):
+    """Open a file as a read only buffer.
+
+    The file is memory mapped if possible, otherwise it is read into
+    memory. The caller must close the returned object (both an mmap
+    and a memoryview over bytes can be used as a context manager)."""
+    with io.open(filename, 'rb') as infile:
+        try:
+            return mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and some file systems can't be mapped.
+            return memoryview(infile.read())
+
+
 def write_chunk(outfile, name, data):
     """Write an IFF chunk to the file.
 
@@ -299,7 +551,8 @@ class MidiFile(object):
                  charset='latin1',
                  debug=False,
                  clip=False,
-                 tracks=None
+                 tracks=None,
+                 data=None
                  ):
 
         self.filename = filename
@@ -317,11 +570,17 @@ class MidiFile(object):
 
         if tracks is not None:
             self.tracks = tracks
+        elif data is not None:
+            self._load_buffer(data)
         elif file is not None:
             self._load(file)
         elif self.filename is not None:
-            with io.open(filename, 'rb') as file:
-                self._load(file)
+            if self.debug:
+                with io.open(filename, 'rb') as file:
+                    self._load(file)
+            else:
+                with open_buffer(filename) as buffer:
+                    self._load_buffer(buffer)
 
     def add_track(self, name=None):
         """Add a new track to the file.
@@ -361,6 +620,17 @@ class MidiFile(object):
                                               clip=self.clip))
                 # TODO: used to ignore EOFError. I hope things still work.
 
+    def _load_buffer(self, data):
+        with meta_charset(self.charset):
+            (self.type,
+             num_tracks,
+             self.ticks_per_beat,
+             pos) = read_buffer_header(data)
+
+            for i in range(num_tracks):
+                track, pos = read_buffer_track(data, pos, clip=self.clip)
+                self.tracks.append(track)
+
     @property
     def length(self):
         """Playback time in seconds.
@@ -381,13 +651,15 @@ class MidiFile(object):
             raise TypeError("can't merge tracks in type 2 (asynchronous) file")
 
         tempo = DEFAULT_TEMPO
-        for msg in merge_tracks(self.tracks):
+        last = 0
+        for now, msg in iter_merged_abstime(self.tracks):
             # Convert message time from absolute time
             # in ticks to relative time in seconds.
-            if msg.time > 0:
-                delta = tick2second(msg.time, self.ticks_per_beat, tempo)
+            if now > last:
+                delta = tick2second(now - last, self.ticks_per_beat, tempo)
             else:
                 delta = 0
+            last = now
 
             yield msg.copy(time=delta)
 
@@ -1,3 +1,4 @@
+import heapq
 from .meta import MetaMessage
 
 
@@ -99,6 +100,37 @@ def fix_end_of_track(messages):
     yield MetaMessage('end_of_track', time=accum)
 
 
+def _abstime_pairs(messages):
+    """Yield (abs_time, msg) pairs without copying the messages."""
+    now = 0
+    for msg in messages:
+        now += msg.time
+        yield now, msg
+
+
+def iter_merged_abstime(tracks):
+    """Yield (abs_time, msg) pairs for all messages in all tracks.
+
+    The messages are yielded in playback order. Messages at the same
+    time keep their track order, like merge_tracks(). This is a k-way
+    merge over the tracks, so nothing is sorted and memory use only
+    grows with the number of tracks.
+
+    The messages are not copied or changed, so msg.time is still the
+    delta time in the original track. All end_of_track messages are
+    dropped and a single new one is yielded at the end.
+    """
+    now = 0
+    merged = heapq.merge(*[_abstime_pairs(track) for track in tracks],
+                         key=lambda pair: pair[0])
+
+    for now, msg in merged:
+        if msg.type != 'end_of_track':
+            yield now, msg
+
+    yield now, MetaMessage('end_of_track')
+
+
 def merge_tracks(tracks):
     """Returns a MidiTrack object with all messages from all tracks.
 
@@ -106,9 +138,9 @@ def merge_tracks(tracks):
     as if they were all in one track.
     """
     messages = []
-    for track in tracks:
-        messages.extend(_to_abstime(track))
-
-    messages.sort(key=lambda msg: msg.time)
+    last = 0
+    for now, msg in iter_merged_abstime(tracks):
+        messages.append(msg.copy(time=now - last))
+        last = now
 
-    return MidiTrack(fix_end_of_track(_to_reltime(messages)))
+    return MidiTrack(messages)
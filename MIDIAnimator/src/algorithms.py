@@ -1,9 +1,10 @@
 from __future__ import annotations
 import bpy
-from typing import List, Tuple, TYPE_CHECKING
+from typing import List, Tuple, Union, TYPE_CHECKING
 from math import sin, cos, pi, e, atan
+import numpy as np
 from .. data_structures.midi import MIDITrack
-from .. data_structures import Keyframe
+from .. data_structures import Keyframe, KeyframeAccumulator
 
 if TYPE_CHECKING:
     from ..data_structures import FrameRange
@@ -141,36 +142,46 @@ def genDampedOscKeyframes(period: float, amplitude: float, damp: float, frame=0)
     return out
 
 # for handling adding keyframes together
-def findOverlap(keyList1: List[Keyframe], keyList2: List[Keyframe]) -> List[Keyframe]:
-    """finds the overlap between two sets of keylists 
-    for this to work, the second keylist must be bigger than the first keylist
+def findOverlap(keyList1: Union[List[Keyframe], KeyframeAccumulator], keyList2: List[Keyframe]) -> range:
+    """finds the overlap between two sets of keylists: the keyframes of the first keylist after the start of the second keylist,
+    and the keyframe before them. the overlap is found with a binary search, so the first keylist must be sorted by frame
+    (checked cheaply around the overlap, not for every keyframe)
 
-    :param List[Keyframe] keyList1: first keylist
+    :param Union[List[Keyframe], KeyframeAccumulator] keyList1: first keylist
     :param List[Keyframe] keyList2: second keylist
-    :raises ValueError: if the first keylist's first frame is bigger than the second keylist's first frame
-    :return List[Keyframe]: the list of keyframes that are overlapping
+    :raises ValueError: if the first keylist's first frame is bigger than the second keylist's first frame, or the first keylist is not sorted
+    :return range: the indices of the overlapping keyframes in `keyList1` (always up to the end of `keyList1`), empty if nothing overlaps
     """
     if len(keyList1) == 0 or len(keyList2) == 0:
-        return []
+        return range(len(keyList1), len(keyList1))
     
-    if keyList1[0].frame > keyList2[0].frame:
+    frame = keyList2[0].frame
+    if keyList1[0].frame > frame:
         # this means a note is somehow going back in time? is this even possible?
         # notes should always be sequential, and not in reverse time
         raise ValueError("first keyframe in keyList1 is bigger than first keyframe in keyList2! Please open a issue on GitHub along with the MIDI file.")
-    
-    overlappingKeyList = []
-    overlapping = False
-    for key1 in reversed(keyList1):
-        if key1.frame > keyList2[0].frame:
-            overlapping = True
-            overlappingKeyList.append(key1)
+
+    if isinstance(keyList1, KeyframeAccumulator):
+        # always sorted
+        return range(keyList1.overlapStart(frame), len(keyList1))
+
+    # index of the first keyframe after `frame`
+    lo, hi = 0, len(keyList1)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if keyList1[mid].frame > frame:
+            hi = mid
         else:
-            # not overlapping
-            if overlapping:
-                overlappingKeyList.append(key1)
-            break
+            lo = mid + 1
+
+    if lo < len(keyList1) and keyList1[-1].frame < keyList1[lo].frame:
+        raise ValueError("keyList1 is not sorted by frame!")
 
-    return list(reversed(overlappingKeyList))
+    if lo == len(keyList1):
+        # not overlapping
+        return range(lo, lo)
+
+    return range(max(lo - 1, 0), len(keyList1))
 
 # for handling adding keyframes together
 def getValue(key1: Keyframe, key2: Keyframe, frame: float) -> float:
@@ -222,210 +233,319 @@ def interval(keyList, frame) -> Tuple[Keyframe]:
         if keyList[i].frame <= frame <= keyList[i+1].frame:
             return (keyList[i], keyList[i+1])
 
-def addKeyframes(insertedKeys: List[Keyframe], nextKeys: List[Keyframe]) -> None:
+def interpolateKeyframes(keyList: List[Keyframe], frames: List[float]) -> List[float]:
+    """evaluates a keylist at many frames in one sweep, instead of calling `interval()` and `getValue()` for every frame.
+    gives the same values: keys are interpolated linearly, and frames outside of the keylist get the value of the first/last key
+
+    :param List[Keyframe] keyList: the keyframes to evaluate, sorted by frame
+    :param List[float] frames: the frames to evaluate at, sorted
+    :return List[float]: the value at each frame, or an empty list if the keylist is empty
+    """
+    if len(keyList) == 0:
+        return []
+
+    first, last = keyList[0], keyList[-1]
+    values = []
+    i = 0
+
+    for frame in frames:
+        if first.frame > frame or len(keyList) == 1:
+            values.append(getValue(first, first, frame))
+        elif last.frame < frame:
+            values.append(getValue(last, last, frame))
+        else:
+            # frames are sorted, so the interval only moves forward
+            while keyList[i + 1].frame < frame:
+                i += 1
+            values.append(getValue(keyList[i], keyList[i + 1], frame))
+
+    return values
+
+def addKeyframes(insertedKeys: KeyframeAccumulator, nextKeys: List[Keyframe]) -> None:
     """adds the two lists of keyframes together.
     check out the desmos graph to learn a bit more on how this works
     https://www.desmos.com/calculator/t7ullcvosp
+    this is `combineKeyframes()` with the `add` mode.
     this is a mutating function
     
-    :param List[Keyframe] insertedKeys: the keyframes that are already inserted on the object
+    :param KeyframeAccumulator insertedKeys: the keyframes that are already inserted on the object
     :param List[Keyframe] nextKeys: the keyframes that will be inserted next (the upcoming note)
     :raises ValueError: if the `insertedKeys'` first frame is bigger than `nextKeys'` first frame
-    :return None: this function mutates the insertedKeys list
+    :return None: this function mutates insertedKeys
     """
+    combineKeyframes(insertedKeys, nextKeys, "add")
 
-    keysOverlapping = findOverlap(insertedKeys, nextKeys)
-
-    insertedKeysInterValues = []
-    nextKeysInterValues = []
-
-    # interpolate the keyframes for each set of keyframes
-    for key in nextKeys:
-        inv1, inv2 = interval(keysOverlapping, key.frame)
-        if inv1 is None and inv2 is None: continue
-        nextKeysInterValues.append(Keyframe(key.frame, getValue(inv1, inv2, key.frame)))
 
-    for key in keysOverlapping:
-        inv1, inv2 = interval(nextKeys, key.frame)
-        if inv1 is None and inv2 is None: continue
-        insertedKeysInterValues.append(Keyframe(key.frame, getValue(inv1, inv2, key.frame)))
-
-    # now add the keyframe values together (the most important part)
-    for key, interp in zip(keysOverlapping, insertedKeysInterValues):
-        key.value += interp.value
-
-    for key, interp in zip(nextKeys, nextKeysInterValues):
-        key.value += interp.value
-
-    # extend the lists 
-    # TODO (need a better method to ensure the keyframes before get cut off and then start )
-    keysOverlapping.extend(nextKeys)
-    keysOverlapping.sort(key=lambda keyframe: keyframe.frame)
-
-    insertedKeys.extend(keysOverlapping)
-
-
-def minKeyframes(insertedKeys: List[Keyframe], nextKeys: List[Keyframe]) -> None:
-    keysOverlapping = findOverlap(insertedKeys, nextKeys)
-
-    insertedKeysInterValues = []
-    nextKeysInterValues = []
+def minKeyframes(insertedKeys: KeyframeAccumulator, nextKeys: List[Keyframe]) -> None:
+    """keeps the minimum of the two lists of keyframes where they overlap, values at rest (0) are ignored.
+    this is `combineKeyframes()` with the `min` mode.
+    this is a mutating function
 
-    # interpolate the keyframes for each set of keyframes
-    for key in nextKeys:
-        inv1, inv2 = interval(keysOverlapping, key.frame)
-        if inv1 is None and inv2 is None: continue
-        nextKeysInterValues.append(Keyframe(key.frame, getValue(inv1, inv2, key.frame)))
+    :param KeyframeAccumulator insertedKeys: the keyframes that are already inserted on the object
+    :param List[Keyframe] nextKeys: the keyframes that will be inserted next (the upcoming note)
+    :return None: this function mutates insertedKeys
+    """
+    combineKeyframes(insertedKeys, nextKeys, "min")
 
-    for key in keysOverlapping:
-        inv1, inv2 = interval(nextKeys, key.frame)
-        if inv1 is None and inv2 is None: continue
-        insertedKeysInterValues.append(Keyframe(key.frame, getValue(inv1, inv2, key.frame)))
 
-    # now compare the keyframe values and keep the maximum value
-    for key, interp in zip(keysOverlapping, insertedKeysInterValues):
-        # if they're resting, who cares
-        if interp.value != 0 and key.value != 0:
-            print(key.value, interp.value)
-            key.value = min(key.value, interp.value)
+def maxKeyframes(insertedKeys: KeyframeAccumulator, nextKeys: List[Keyframe]) -> None:
+    """keeps the maximum of the two lists of keyframes where they overlap.
+    this is `combineKeyframes()` with the `max` mode.
+    this is a mutating function
 
-    for key, interp in zip(nextKeys, nextKeysInterValues):
-        if interp.value != 0 and key.value != 0:
-            key.value = min(key.value, interp.value)
+    :param KeyframeAccumulator insertedKeys: the keyframes that are already inserted on the object
+    :param List[Keyframe] nextKeys: the keyframes that will be inserted next (the upcoming note)
+    :return None: this function mutates insertedKeys
+    """
+    combineKeyframes(insertedKeys, nextKeys, "max")
 
-    # extend the lists (insert nextKeys only if they don't already exist in insertedKeys)
-    non_overlapping_keys = [key for key in nextKeys if key.frame not in [k.frame for k in keysOverlapping]]
-    insertedKeys.extend(non_overlapping_keys)
-    insertedKeys.sort(key=lambda keyframe: keyframe.frame)
+# overlap modes that have a vectorized kernel, see `combineKeyframeArrays()`
+OVERLAP_KERNELS = ("add", "min", "max")
 
+def _interpolateArrays(frames: np.ndarray, keyFrames: np.ndarray, keyValues: np.ndarray) -> np.ndarray:
+    """`np.interp`, except frames on a key get the value of the first key on that frame (like `interval()` does when keys share a frame)
 
-def maxKeyframes(insertedKeys: List[Keyframe], nextKeys: List[Keyframe]) -> None:
-    keysOverlapping = findOverlap(insertedKeys, nextKeys)
+    :param np.ndarray frames: the frames to evaluate at
+    :param np.ndarray keyFrames: frames of the keys, sorted
+    :param np.ndarray keyValues: values of the keys
+    :return np.ndarray: the value at each frame
+    """
+    values = np.interp(frames, keyFrames, keyValues)
+
+    i = np.minimum(np.searchsorted(keyFrames, frames, side="left"), len(keyFrames) - 1)
+    onKey = keyFrames[i] == frames
+    values[onKey] = keyValues[i[onKey]]
+
+    return values
+
+def combineKeyframeArrays(insertedFrames: np.ndarray, insertedValues: np.ndarray, nextFrames: np.ndarray, nextValues: np.ndarray, mode: str) -> Tuple[np.ndarray, np.ndarray]:
+    """combines overlapping keyframes stored as arrays, this defines the `add`, `min` and `max` overlap modes (`addKeyframes()`, `minKeyframes()`, `maxKeyframes()`).
+    both curves are evaluated at the keys of the other one with `np.interp` (frames outside of a curve get the value of its first/last key),
+    and combined with `np.add`, `np.minimum` or `np.maximum`
+
+    :param np.ndarray insertedFrames: frames of the overlapping keyframes that are already inserted, sorted
+    :param np.ndarray insertedValues: values of the overlapping keyframes that are already inserted
+    :param np.ndarray nextFrames: frames of the keyframes that will be inserted next, sorted
+    :param np.ndarray nextValues: values of the keyframes that will be inserted next
+    :param str mode: `add`, `min` (values at rest (0) are ignored) or `max`. for `min` and `max`, next keys on the frame of an inserted key are left out
+    :raises ValueError: if the mode is unknown
+    :return Tuple[np.ndarray, np.ndarray]: the frames (sorted, on the same frame the inserted key comes first) and values of the combined keyframes
+    """
+    if mode not in OVERLAP_KERNELS:
+        raise ValueError(f"Unknown overlap mode '{mode}'! Use one of {', '.join(OVERLAP_KERNELS)}.")
+
+    if len(insertedFrames) != 0 and len(nextFrames) != 0:
+        # value of each curve at the keys of the other curve
+        nextAtInserted = _interpolateArrays(insertedFrames, nextFrames, nextValues)
+        insertedAtNext = _interpolateArrays(nextFrames, insertedFrames, insertedValues)
+
+        if mode == "add":
+            insertedValues = insertedValues + nextAtInserted
+            nextValues = nextValues + insertedAtNext
+        elif mode == "max":
+            insertedValues = np.maximum(insertedValues, nextAtInserted)
+            nextValues = np.maximum(nextValues, insertedAtNext)
+        else:
+            # if they're resting, who cares
+            insertedValues = np.where((insertedValues != 0) & (nextAtInserted != 0), np.minimum(insertedValues, nextAtInserted), insertedValues)
+            nextValues = np.where((nextValues != 0) & (insertedAtNext != 0), np.minimum(nextValues, insertedAtNext), nextValues)
 
-    insertedKeysInterValues = []
-    nextKeysInterValues = []
+        if mode != "add":
+            keep = ~np.isin(nextFrames, insertedFrames)
+            nextFrames, nextValues = nextFrames[keep], nextValues[keep]
 
-    # interpolate the keyframes for each set of keyframes
-    for key in nextKeys:
-        inv1, inv2 = interval(keysOverlapping, key.frame)
-        if inv1 is None and inv2 is None: continue
-        nextKeysInterValues.append(Keyframe(key.frame, getValue(inv1, inv2, key.frame)))
+    frames = np.concatenate((insertedFrames, nextFrames))
+    order = np.argsort(frames, kind="stable")
+    
+    return frames[order], np.concatenate((insertedValues, nextValues))[order]
 
-    for key in keysOverlapping:
-        inv1, inv2 = interval(nextKeys, key.frame)
-        if inv1 is None and inv2 is None: continue
-        insertedKeysInterValues.append(Keyframe(key.frame, getValue(inv1, inv2, key.frame)))
+def combineKeyframes(insertedKeys: KeyframeAccumulator, nextKeys: List[Keyframe], mode: str) -> None:
+    """combines the two lists of keyframes with `combineKeyframeArrays()`. `addKeyframes()`, `minKeyframes()` and `maxKeyframes()` call this.
+    this is a mutating function
 
-    # now compare the keyframe values and keep the maximum value
-    for key, interp in zip(keysOverlapping, insertedKeysInterValues):
-        key.value = max(key.value, interp.value)
+    :param KeyframeAccumulator insertedKeys: the keyframes that are already inserted on the object
+    :param List[Keyframe] nextKeys: the keyframes that will be inserted next (the upcoming note)
+    :param str mode: `add`, `min` or `max`
+    :raises ValueError: if the `insertedKeys'` first frame is bigger than `nextKeys'` first frame
+    :return None: this function mutates insertedKeys
+    """
+    nextKeys = sorted(nextKeys, key=lambda keyframe: keyframe.frame)
+    start = findOverlap(insertedKeys, nextKeys).start
+    keysOverlapping = insertedKeys.tail(start)
+
+    frames, values = combineKeyframeArrays(
+        np.array([key.frame for key in keysOverlapping], dtype=np.float64), np.array([key.value for key in keysOverlapping], dtype=np.float64),
+        np.array([key.frame for key in nextKeys], dtype=np.float64), np.array([key.value for key in nextKeys], dtype=np.float64), mode)
+
+    insertedKeys.replaceTail(start, [Keyframe(frame, value) for frame, value in zip(frames.tolist(), values.tolist())])
+
+# overlap modes that can be resolved for all notes at once, see `resolveOverlapBatch()`
+# min & max depend on the order the notes are merged in, so they are merged note by note (see `combineKeyframes()`)
+BATCH_OVERLAP_MODES = ("add", "next", "prev")
+
+def sumCurveArrays(keyFrames: np.ndarray, keyValues: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """adds many piecewise-linear curves (one per note) together at once, on the union of their keyframe frames.
+    a curve only counts between its first and last keyframe, so this is only the sum of the curves if they rest at 0 outside of it (see `_restsAtEnds()`).
+    every curve is evaluated on the part of the grid it covers in one go (no loop over the curves),
+    and the values on each frame are summed with `np.bincount`
+
+    :param np.ndarray keyFrames: frames of the keyframes of all curves, one curve after the other
+    :param np.ndarray keyValues: values of the keyframes of all curves
+    :param np.ndarray counts: number of keyframes of each curve
+    :return Tuple[np.ndarray, np.ndarray]: the frames (sorted, unique) and values of the summed curve
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    counts = counts[counts != 0]
+    if len(counts) == 0:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+
+    keyCurve = np.repeat(np.arange(len(counts)), counts)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    
+    # sort the keyframes of each curve by frame
+    order = np.lexsort((keyFrames, keyCurve))
+    keyFrames = np.asarray(keyFrames, dtype=np.float64)[order]
+    keyValues = np.asarray(keyValues, dtype=np.float64)[order]
+
+    grid = np.unique(keyFrames)
+
+    # every (curve, grid frame) pair where the curve covers the frame
+    lo = np.searchsorted(grid, keyFrames[starts], side="left")
+    sizes = np.searchsorted(grid, keyFrames[ends - 1], side="right") - lo
+    pairCurve = np.repeat(np.arange(len(counts)), sizes)
+    pairGrid = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes - lo, sizes)
+    frames = grid[pairGrid]
+
+    # find the keyframe before each frame in its own curve with one search, the curves are made disjoint by their index
+    width = grid[-1] - grid[0] + 1
+    j = np.searchsorted(keyCurve * width + (keyFrames - grid[0]), pairCurve * width + (frames - grid[0]), side="right") - 1
+    j = np.clip(j, starts[pairCurve], np.maximum(ends[pairCurve] - 2, starts[pairCurve]))
+    j2 = np.minimum(j + 1, ends[pairCurve] - 1)
+
+    x1, y1, x2, y2 = keyFrames[j], keyValues[j], keyFrames[j2], keyValues[j2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(x2 > x1, y1 + (y2 - y1) * (frames - x1) / (x2 - x1), y1)
+    
+    # on the last keyframe of a curve
+    values = np.where(frames == x2, y2, values)
 
-    for key, interp in zip(nextKeys, nextKeysInterValues):
-        key.value = max(key.value, interp.value)
+    return grid, np.bincount(pairGrid, weights=values, minlength=len(grid))
 
-    # extend the lists (insert nextKeys only if they don't already exist in insertedKeys)
-    non_overlapping_keys = [key for key in nextKeys if key.frame not in [k.frame for k in keysOverlapping]]
-    insertedKeys.extend(non_overlapping_keys)
-    insertedKeys.sort(key=lambda keyframe: keyframe.frame)
+def _restsAtEnds(keys: List[Keyframe]) -> bool:
+    """checks if the keyframes of a note start and end at rest (0) and have no two keyframes on the same frame (a jump).
+    only then does the note add 0 outside of its keyframes when it is merged note by note, and does `sumCurveArrays()` give the same curve
 
-def prevKeyframes(insertedKeys: List[Keyframe], nextKeys: List[Keyframe]) -> None:
-    keysOverlapping = findOverlap(insertedKeys, nextKeys)
+    :param List[Keyframe] keys: the keyframes of the note
+    :return bool: True if the note can be summed with `sumCurveArrays()`
+    """
+    if len(keys) == 0:
+        return True
+
+    keys = sorted(keys, key=lambda keyframe: keyframe.frame)
+    return keys[0].value == 0 and keys[-1].value == 0 and all(key1.frame != key2.frame for key1, key2 in zip(keys, keys[1:]))
+
+def resolveOverlapBatch(instances: List[List[Keyframe]], mode: str) -> List[Keyframe]:
+    """resolves the keyframes of all notes on one F-Curve at once, instead of merging them note by note.
+    `next` and `prev` give the same keyframes as `nextKeyframes()` and `prevKeyframes()`.
+    `add` gives the same curve as merging the notes one by one with `combineKeyframes()`: when every note starts and ends at rest (0) without jumps,
+    the curves are summed with `sumCurveArrays()` (one keyframe per frame), otherwise the notes are merged one by one.
+    `min` and `max` are not supported, their result depends on the order the notes are merged in
+
+    :param List[List[Keyframe]] instances: the keyframes of each note
+    :param str mode: `add`, `next` or `prev`
+    :raises ValueError: if the mode is unknown
+    :return List[Keyframe]: the keyframes, sorted by frame
+    """
+    if mode not in BATCH_OVERLAP_MODES:
+        raise ValueError(f"Unknown overlap mode '{mode}'! Use one of {', '.join(BATCH_OVERLAP_MODES)}.")
+
+    if mode == "add" and not all(_restsAtEnds(keys) for keys in instances):
+        # a note that does not rest at its ends changes the keyframes around it when it is merged, which depends on the order of the notes
+        keyframes = KeyframeAccumulator()
+        for keys in sorted((keys for keys in instances if keys), key=lambda keys: min(key.frame for key in keys)):
+            combineKeyframes(keyframes, keys, "add")
+
+        return keyframes.materialize()
+
+    if mode == "add":
+        frames, values = sumCurveArrays(
+            np.array([key.frame for keys in instances for key in keys], dtype=np.float64),
+            np.array([key.value for keys in instances for key in keys], dtype=np.float64),
+            np.array([len(keys) for keys in instances], dtype=np.int64))
+
+        return [Keyframe(frame, value) for frame, value in zip(frames.tolist(), values.tolist())]
+
+    instances = [sorted(keys, key=lambda keyframe: keyframe.frame) for keys in instances if keys]
+    instances.sort(key=lambda keys: keys[0].frame)
+    out = []
+
+    if mode == "prev":
+        # a note is left out if it starts before the notes that are kept have ended
+        lastFrame = float("-inf")
+        for keys in instances:
+            if keys[0].frame >= lastFrame:
+                out.extend(keys)
+                lastFrame = max(lastFrame, keys[-1].frame)
+    else:
+        # every note cuts off the notes before it when it starts
+        for keys, nextInstance in zip(instances, instances[1:] + [None]):
+            if nextInstance is None:
+                out.extend(keys)
+            else:
+                out.extend(key for key in keys if key.frame <= nextInstance[0].frame)
+        
+    return out
 
+def prevKeyframes(insertedKeys: KeyframeAccumulator, nextKeys: List[Keyframe]) -> None:
     # if there are ANY overlapping keyframes, ignore the nextKeys
-    if not keysOverlapping:
+    if not findOverlap(insertedKeys, nextKeys):
         insertedKeys.extend(nextKeys)
 
-    # sort keys
-    insertedKeys.sort(key=lambda keyframe: keyframe.frame)
-
 
-def nextKeyframes(insertedKeys: List[Keyframe], nextKeys: List[Keyframe]) -> None:
+def nextKeyframes(insertedKeys: KeyframeAccumulator, nextKeys: List[Keyframe]) -> None:
     # Find overlapping keyframes between insertedKeys and nextKeys
     keysOverlapping = findOverlap(insertedKeys, nextKeys)
 
     # if there are overlapping keyframes, we need to start from the first overlapping keyframe, and remove all keyframes after it in the insertedKeys
     if keysOverlapping:
-        firstOverlapFrame = keysOverlapping[0].frame
-        # go backward and pop each element until we reach the last overlapping keyframe
-        for key in reversed(insertedKeys):
-            if key.frame > firstOverlapFrame:
-                insertedKeys.pop()
-            else:
-                break
+        insertedKeys.replaceTail(insertedKeys.indexAfter(insertedKeys[keysOverlapping.start].frame))
 
     # extend the next keys regardless if its overlapping or not
     insertedKeys.extend(nextKeys)
-    insertedKeys.sort(key=lambda keyframe: keyframe.frame)
 
 
-def restValueCrossingKeyframes(insertedKeys: List[Keyframe], nextKeys: List[Keyframe]) -> None:
+def restValueCrossingKeyframes(insertedKeys: KeyframeAccumulator, nextKeys: List[Keyframe]) -> None:
     restValue = 0
-    keysOverlapping = findOverlap(insertedKeys, nextKeys)
+    keysOverlapping = insertedKeys.tail(findOverlap(insertedKeys, nextKeys).start)
 
-    for key in keysOverlapping:
-        for nextKey in nextKeys:
-            if key.frame == nextKey.frame:
-                # Interpolate the values to cross the rest value (0) smoothly
-                insertedValueToRest = (key.value + restValue) / 2
-                nextValueFromRest = (nextKey.value + restValue) / 2
-                
-                # Adjust the current keyframe value to fade out to rest value
-                key.value = insertedValueToRest
-
-                # Adjust the next keyframe value to fade in from rest value
-                nextKey.value = nextValueFromRest
-
-    # Identify non-overlapping keyframes in nextKeys
-    nonOverlappingNextKeys = [key for key in nextKeys if key.frame not in [k.frame for k in keysOverlapping]]
-
-    # Combine non-overlapping nextKeys with insertedKeys
-    finalKeyframes = []
-    i, j = 0, 0
-    while i < len(insertedKeys) and j < len(nonOverlappingNextKeys):
-        if insertedKeys[i].frame < nonOverlappingNextKeys[j].frame:
-            finalKeyframes.append(insertedKeys[i])
-            i += 1
-        else:
-            finalKeyframes.append(nonOverlappingNextKeys[j])
-            j += 1
+    nextKeysByFrame = {}
+    for nextKey in nextKeys:
+        nextKeysByFrame.setdefault(nextKey.frame, []).append(nextKey)
 
-    # Add any remaining keyframes
-    finalKeyframes.extend(insertedKeys[i:])
-    finalKeyframes.extend(nonOverlappingNextKeys[j:])
+    for key in keysOverlapping:
+        for nextKey in nextKeysByFrame.get(key.frame, ()):
+            # Interpolate the values to cross the rest value (0) smoothly
+            insertedValueToRest = (key.value + restValue) / 2
+            nextValueFromRest = (nextKey.value + restValue) / 2
+            
+            # Adjust the current keyframe value to fade out to rest value
+            key.value = insertedValueToRest
 
-    # Update insertedKeys with final combined keyframes
-    insertedKeys.clear()
-    insertedKeys.extend(finalKeyframes)
+            # Adjust the next keyframe value to fade in from rest value
+            nextKey.value = nextValueFromRest
 
+    # Identify non-overlapping keyframes in nextKeys, and combine them with insertedKeys
+    overlappingFrames = {key.frame for key in keysOverlapping}
+    insertedKeys.extend(key for key in nextKeys if key.frame not in overlappingFrames)
 
-def pruneKeyframes(insertedKeys: List[Keyframe], nextKeys: List[Keyframe]) -> None:
-    keysOverlapping = findOverlap(insertedKeys, nextKeys)
 
+def pruneKeyframes(insertedKeys: KeyframeAccumulator, nextKeys: List[Keyframe]) -> None:
     # Prune strategy: remove the last couple of keyframes from insertedKeys
-    if keysOverlapping:
-        last_overlap_frame = max(key.frame for key in keysOverlapping)
-        
-        # Identify keyframes in insertedKeys that overlap and are near the end
-        prunedInsertedKeys = [key for key in insertedKeys if key.frame <= last_overlap_frame]
-        
-        # If there's overlap, we'll remove the last keyframe or two
-        if len(prunedInsertedKeys) > 1:
-            prunedInsertedKeys.pop()  # Remove the last overlapping keyframe
-            if len(prunedInsertedKeys) > 1:
-                prunedInsertedKeys.pop()  # Optionally remove one more for smoother transition
-
-        # Remaining keyframes
-        remainingInsertedKeys = [key for key in insertedKeys if key.frame > last_overlap_frame]
-        
-        # Final keyframes after pruning
-        finalKeyframes = prunedInsertedKeys + remainingInsertedKeys + nextKeys
+    if findOverlap(insertedKeys, nextKeys):
+        # the overlapping keyframes are the last ones, so remove the last keyframe or two for a smoother transition
+        # (always keeping the first keyframe)
+        insertedKeys.replaceTail(max(len(insertedKeys) - 2, 1), nextKeys)
     else:
         # If no overlap, just concatenate the keys
-        finalKeyframes = insertedKeys + nextKeys
-
-    # Sort and update the insertedKeys with pruned results
-    finalKeyframes.sort(key=lambda keyframe: keyframe.frame)
-    insertedKeys.clear()
-    insertedKeys.extend(finalKeyframes)
-
-
+        insertedKeys.extend(nextKeys)
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from typing import Dict, List, Union, Type
+from typing import Dict, List, Tuple, Union, Type
 from itertools import zip_longest
 from dataclasses import dataclass
 from math import radians, degrees
 from enum import Enum
+import numpy as np
 import bpy
 
-from .. data_structures.midi import MIDITrack
-from .. utils import convertNoteNumbers
+from .. data_structures.midi import MIDITrack, MIDIEvent, MIDIEventArray
+from .. libs.mido import MIN_PITCHWHEEL, MAX_PITCHWHEEL
+from .. utils import convertNoteNumbers, decimateCurve
 from .. utils import animateAlongTwoPoints
 from .. utils import mapRangeLinear as mLin, mapRangeLog as mLog, mapRangeExp as mExp, mapRangeArcSin as mASin, mapRangePara as mPara, mapRangeRoot as mRoot, mapRangeSin as mSin
 from .. utils.logger import logger
@@ -275,8 +277,6 @@ class ProjectileInstrument(Instrument):
 
         :raises ValueError: if there is no note number on the object
         """
-        allUsedNotes = self.midiTrack.allUsedNotes()
-
         for obj in self.collection.all_objects:
             wpr = ObjectWrapper(
                 obj=obj, 
@@ -286,7 +286,7 @@ class ProjectileInstrument(Instrument):
             )
             
             for noteNumber in wpr.noteNumbers:
-                if noteNumber not in allUsedNotes:
+                if not self.midiTrack.profile.hasNote(noteNumber):
                     logger.warning(f"Object `{wpr.obj.name}` with MIDI note `{noteNumber}` does have a coresponding MIDI note in the MIDI track provided (MIDI track `{self.midiTrack.name}`)!")
 
                 if noteNumber in self.noteToWpr:
@@ -581,8 +581,6 @@ class EvaluateInstrument(Instrument):
 
         :raises ValueError: if there is no note number on the object
         """
-        allUsedNotes = self.midiTrack.allUsedNotes()
-
         for obj in self.collection.all_objects:
             wpr = ObjectWrapper(
                 obj=obj, 
@@ -592,7 +590,7 @@ class EvaluateInstrument(Instrument):
             )
             
             for noteNumber in wpr.noteNumbers:
-                if noteNumber not in allUsedNotes:
+                if not self.midiTrack.profile.hasNote(noteNumber):
                     logger.warning(f"Object '{wpr.obj.name}' with MIDI note '{noteNumber}' does not exist in the MIDI track provided (MIDI track '{self.midiTrack.name}')!")
 
                 if noteNumber in self.noteToWpr:
@@ -699,6 +697,8 @@ class EvaluateInstrument(Instrument):
             for wpr in wprs:
                 wprToKeyframe[wpr] = {}
         
+        # (wpr, FCurve key) -> keyframes of each note, for the overlap modes that are resolved after all notes are read
+        batchKeys = {}
 
         for note in self.midiTrack.notes:
             # lookup blender object
@@ -728,7 +728,7 @@ class EvaluateInstrument(Instrument):
                             key = (noteOffCurve.data_path, noteOffCurve.array_index)
 
                         if key not in wprToKeyframe[wpr]:
-                            wprToKeyframe[wpr][key] = []
+                            wprToKeyframe[wpr][key] = KeyframeAccumulator()
                         
                         keyframes = wprToKeyframe[wpr][key]
 
@@ -740,16 +740,12 @@ class EvaluateInstrument(Instrument):
                             processNextKeys(noteOffCurve, note, wpr, nextKeys)
 
                         # take keyframes that are next and "add" them to the already insrted keyframes
-                        if obj.midi.anim_overlap == "add":
-                            addKeyframes(insertedKeys=keyframes, nextKeys=nextKeys)
-                        elif obj.midi.anim_overlap == "min":
-                            minKeyframes(insertedKeys=keyframes, nextKeys=nextKeys)
-                        elif obj.midi.anim_overlap == "max":
-                            maxKeyframes(insertedKeys=keyframes, nextKeys=nextKeys)
-                        elif obj.midi.anim_overlap == "prev":
-                            prevKeyframes(insertedKeys=keyframes, nextKeys=nextKeys)
-                        elif obj.midi.anim_overlap == "next":
-                            nextKeyframes(insertedKeys=keyframes, nextKeys=nextKeys)
+                        if obj.midi.anim_overlap in BATCH_OVERLAP_MODES:
+                            # add, next & prev are resolved for all notes at once
+                            batchKeys.setdefault((wpr, key), []).append(nextKeys)
+                        elif obj.midi.anim_overlap in OVERLAP_KERNELS:
+                            # min & max are vectorized, but depend on the order of the notes
+                            combineKeyframes(insertedKeys=keyframes, nextKeys=nextKeys, mode=obj.midi.anim_overlap)
                         elif obj.midi.anim_overlap == "rvc":
                             restValueCrossingKeyframes(insertedKeys=keyframes, nextKeys=nextKeys)
                         elif obj.midi.anim_overlap == "prune":
@@ -770,6 +766,9 @@ class EvaluateInstrument(Instrument):
                     pass
 
         
+        for (wpr, key), instances in batchKeys.items():
+            wprToKeyframe[wpr][key] = KeyframeAccumulator(resolveOverlapBatch(instances, wpr.obj.midi.anim_overlap))
+
         # write keyframes after iterating over all notes
         for noteNumber in self.noteToWpr:
             for wpr in self.noteToWpr[noteNumber]:
@@ -786,7 +785,7 @@ class EvaluateInstrument(Instrument):
                         # keyframes = wpr.keyframes.listOfKeys[(fCrv.data_path, fCrv.array_index)]
                         
                         if isinstance(fCrv, bpy.types.FCurve):
-                            for keyframe in sorted(keyframes, key=lambda x: x.frame):
+                            for keyframe in keyframes.materialize():
                                 # set value
                                 if fCrv.data_path[:2] == '["' and fCrv.data_path[-2:] == '"]':
                                     # custom prop
@@ -808,7 +807,7 @@ class EvaluateInstrument(Instrument):
                                     obj.keyframe_insert(data_path=fCrv.data_path, index=fCrv.array_index, frame=keyframe.frame)
                         
                         elif isinstance(fCrv, ObjectShapeKey):
-                            for keyframe in sorted(keyframes, key=lambda x: x.frame):
+                            for keyframe in keyframes.materialize():
                                 fCrv.targetKey.value = keyframe.value
                                 fCrv.targetKey.keyframe_insert(data_path="value", frame=keyframe.frame)
                 else:
@@ -1201,16 +1200,31 @@ class LaserInstrument(Instrument):
         if not self.baseObj or not self.emitterObj:
             raise ValueError("LaserInstrument: No base or emitter object specified, or more than one specified.")
         
-        allNotes = self.midiTrack.allUsedNotes()
-        if self.collection.midi.laser_note_low == "lowest":
-            self.noteLow = min(allNotes)
+        self.noteLow, self.noteHigh = self.noteRange()
+
+    def noteRange(self) -> Tuple[int, int]:
+        """gets the lowest and highest note of the laser, set on the collection or taken from the notes of the MIDI track ("lowest" & "highest")
+
+        :raises ValueError: if the range is taken from the notes, but the MIDI track has no notes
+        :return Tuple[int, int]: the lowest and highest note number
+        """
+        profile = self.midiTrack.profile
+        noteLow, noteHigh = self.collection.midi.laser_note_low, self.collection.midi.laser_note_high
+
+        if profile.noteCount == 0 and (noteLow == "lowest" or noteHigh == "highest"):
+            raise ValueError(f"LaserInstrument: MIDI track '{self.midiTrack.name}' has no notes, so it has no lowest or highest note! Choose a MIDI track with notes, or set the note range.")
+
+        if noteLow == "lowest":
+            noteLow = profile.minNote
         else:
-            self.noteLow = convertNoteNumbers(self.collection.midi.laser_note_low)[0]
+            noteLow = convertNoteNumbers(noteLow)[0]
 
-        if self.collection.midi.laser_note_high == "highest":
-            self.noteHigh = max(allNotes)
+        if noteHigh == "highest":
+            noteHigh = profile.maxNote
         else:
-            self.noteHigh = convertNoteNumbers(self.collection.midi.laser_note_high)[0]
+            noteHigh = convertNoteNumbers(noteHigh)[0]
+
+        return noteLow, noteHigh
 
 
     def animate(self):
@@ -1277,6 +1291,195 @@ class LaserInstrument(Instrument):
             showHideObj(self.emitterObj, hide=True, frame=secToFrames(curNoteTimeOff))
 
 
+class ControllerInstrument(Instrument):
+    EXCLUDE_NOTE_NUMBER = True
+
+    # identifier -> mapRange function, see `ctrl_mapping`
+    MAPPINGS = {
+        "linear": mLin,
+        "sin": mSin,
+        "arcsin": mASin,
+        "exp": mExp,
+        "log": mLog,
+        "para": mPara,
+        "root": mRoot,
+    }
+
+    def __init__(self, midiTrack: MIDITrack, collection: bpy.types.Collection):
+        """Animates a property of each object from a controller stream (a control change number, the pitchwheel or aftertouch) of the MIDI track.
+
+        :param MIDITrack midiTrack: the MIDITrack object to animate from
+        :param bpy.types.Collection collection: the `bpy.types.Collection` of Blender objects to apply keyframes to
+        """
+        super().__init__(midiTrack=midiTrack, collection=collection)
+
+        self.preAnimate()
+
+    @staticmethod
+    def drawObject(context: bpy.types.Context, col: bpy.types.UILayout, blObj: bpy.types.Object):
+        """draws the UI for the object view"""
+        objMidi = blObj.midi
+
+        col.separator()
+
+        col.prop(objMidi, "ctrl_source")
+        if objMidi.ctrl_source == "cc":
+            col.prop(objMidi, "ctrl_number")
+        col.prop(objMidi, "ctrl_channel")
+
+        col.separator()
+
+        row = col.row()
+        row.prop(objMidi, "ctrl_data_path")
+        row.prop(objMidi, "ctrl_array_index", text="")
+        
+        col.prop(objMidi, "ctrl_mapping")
+        col.prop(objMidi, "ctrl_out_min")
+        col.prop(objMidi, "ctrl_out_max")
+        col.prop(objMidi, "ctrl_tolerance")
+
+    @staticmethod
+    def properties():
+        MIDIAnimatorObjectProperties.ctrl_source = bpy.props.EnumProperty(
+            items=[
+                ("cc", "Control Change", "A control change (CC) number, like the mod wheel (1) or an expression pedal (11)"),
+                ("pitchwheel", "Pitchwheel", "The pitchwheel"),
+                ("aftertouch", "Aftertouch", "Channel aftertouch (pressure)"),
+            ],
+            name="Source",
+            description="The MIDI controller that drives the property",
+            default="cc",
+            options=set()
+        )
+        MIDIAnimatorObjectProperties.ctrl_number = bpy.props.IntProperty(
+            name="CC Number",
+            description="The control change number",
+            default=1,
+            min=0,
+            max=127,
+            options=set()
+        )
+        MIDIAnimatorObjectProperties.ctrl_channel = bpy.props.IntProperty(
+            name="Channel",
+            description="Only use events on this MIDI channel (0-15). -1 uses all channels",
+            default=-1,
+            min=-1,
+            max=15,
+            options=set()
+        )
+        MIDIAnimatorObjectProperties.ctrl_data_path = bpy.props.StringProperty(
+            name="Data Path",
+            description="Data path of the property to animate, e.g. 'location', 'scale' or '[\"prop\"]' for a custom property",
+            default="location",
+            options=set()
+        )
+        MIDIAnimatorObjectProperties.ctrl_array_index = bpy.props.IntProperty(
+            name="Array Index",
+            description="Array index of the property to animate (e.g. 2 for Z location). Ignored if the property is not an array",
+            default=0,
+            min=0,
+            options=set()
+        )
+        MIDIAnimatorObjectProperties.ctrl_mapping = bpy.props.EnumProperty(
+            items=[
+                ("linear", "Linear", ""),
+                ("sin", "Sine", ""),
+                ("arcsin", "Arc Sine", ""),
+                ("exp", "Exponential", ""),
+                ("log", "Logarithmic", ""),
+                ("para", "Parabolic", ""),
+                ("root", "Square Root", ""),
+            ],
+            name="Mapping",
+            description="How the controller range is mapped to the output range",
+            default="linear",
+            options=set()
+        )
+        MIDIAnimatorObjectProperties.ctrl_out_min = bpy.props.FloatProperty(
+            name="Out Min",
+            description="Value of the property when the controller is at its lowest",
+            default=0,
+            options=set()
+        )
+        MIDIAnimatorObjectProperties.ctrl_out_max = bpy.props.FloatProperty(
+            name="Out Max",
+            description="Value of the property when the controller is at its highest",
+            default=1,
+            options=set()
+        )
+        MIDIAnimatorObjectProperties.ctrl_tolerance = bpy.props.FloatProperty(
+            name="Tolerance",
+            description="Keyframes that change the curve by less than this (in the units of the property) are left out. 0 keeps a keyframe for every frame with an event",
+            default=0.001,
+            min=0,
+            options=set()
+        )
+
+    def preAnimate(self):
+        """cleans all keyframes before the animation"""
+        old_frame = bpy.context.scene.frame_current
+        bpy.context.scene.frame_set(-10000)
+        
+        # remove all old keyframes
+        for obj in self.collection.all_objects:
+            cleanKeyframes(obj)
+        
+        bpy.context.scene.frame_set(old_frame)
+
+        # prechecks
+        for obj in self.collection.all_objects:
+            try:
+                obj.path_resolve(obj.midi.ctrl_data_path)
+            except ValueError:
+                raise ValueError(f"Object '{obj.name}' has no property with the data path '{obj.midi.ctrl_data_path}'!")
+
+    def controllerEvents(self, obj: bpy.types.Object) -> Tuple[Union[List[MIDIEvent], MIDIEventArray], float, float]:
+        """gets the controller events that drive an object
+
+        :param bpy.types.Object obj: the Blender object
+        :return Tuple[Union[List[MIDIEvent], MIDIEventArray], float, float]: the events (sorted by time), and the lowest & highest value of the controller
+        """
+        objMidi = obj.midi
+
+        if objMidi.ctrl_source == "cc":
+            events, inMin, inMax = self.midiTrack.controlChange.get(objMidi.ctrl_number, []), 0, 127
+        elif objMidi.ctrl_source == "pitchwheel":
+            events, inMin, inMax = self.midiTrack.pitchwheel, MIN_PITCHWHEEL, MAX_PITCHWHEEL
+        else:
+            events, inMin, inMax = self.midiTrack.aftertouch, 0, 127
+
+        if objMidi.ctrl_channel != -1 and isinstance(events, MIDIEventArray):
+            events = events[events.channel == objMidi.ctrl_channel]
+        elif objMidi.ctrl_channel != -1:
+            events = [event for event in events if event.channel == objMidi.ctrl_channel]
+
+        return events, inMin, inMax
+
+    def animate(self):
+        """writes the controller curve of each object to its FCurve"""
+        fps = getExactFps()
+
+        for obj in self.collection.all_objects:
+            objMidi = obj.midi
+            events, inMin, inMax = self.controllerEvents(obj)
+
+            if not events:
+                logger.warning(f"Object '{obj.name}' has no {objMidi.ctrl_source} events in the MIDI track provided (MIDI track '{self.midiTrack.name}')!")
+                continue
+            
+            # one value per frame, the last event on a frame wins
+            frames, values = MIDITrack.resampleEvents(events, fps, "last")
+
+            mapRange = ControllerInstrument.MAPPINGS[objMidi.ctrl_mapping]
+            values = np.array([mapRange(value, inMin, inMax, objMidi.ctrl_out_min, objMidi.ctrl_out_max) for value in values.tolist()], dtype=np.float64)
+
+            if objMidi.ctrl_tolerance > 0:
+                keep = decimateCurve(frames, values, objMidi.ctrl_tolerance)
+                frames, values = frames[keep], values[keep]
+
+            writeFCurveKeyframes(obj, objMidi.ctrl_data_path, objMidi.ctrl_array_index, frames, values)
+
+
 # ------------------------------------------------------------------
 
 @dataclass
@@ -1292,6 +1495,7 @@ class Instruments(Enum):
     evaluate = InstrumentItem(identifier="evaluate", name="Evaluate", description="Evaluate thing", cls=EvaluateInstrument)
     projectile = InstrumentItem(identifier="projectile", name="Projectile", description="A projectile that is fired from the instrument", cls=ProjectileInstrument)
     laser = InstrumentItem(identifier="laser", name="Laser", description="Laser", cls=LaserInstrument)
+    controller = InstrumentItem(identifier="controller", name="Controller", description="Animates a property from a MIDI CC, the pitchwheel or aftertouch", cls=ControllerInstrument)
     # Hi-Hats posponed until a future release
     # hiHat = InstrumentItem(identifier="hi-hat", name="Hi Hat", description="Hi Hat", cls=HiHatInstrument)
     custom = InstrumentItem(identifier="custom", name="Custom", description="Custom Instrument. Must pass the class via `MIDIAnimatorNode.addInstrument()`. See the docs for help.", cls=Instrument)
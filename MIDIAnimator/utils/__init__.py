@@ -3,6 +3,7 @@ from math import sin, cos, pi, e, sqrt, asin, atan, log
 from typing import Tuple, List
 from re import search as reSearch
 from mathutils import Vector
+import numpy as np
 
 
 def noteToName(nVal: int) -> str:
@@ -105,7 +106,46 @@ def removeDuplicates(vals: list) -> list:
     :param list vals: input list
     :return list: duplicates removed
     """
-    return sorted([n for i, n in enumerate(vals) if n not in vals[:i]])
+    return sorted(set(vals))
+
+def decimateCurve(times: np.ndarray, values: np.ndarray, tolerance: float) -> np.ndarray:
+    """Ramer-Douglas-Peucker decimation of a curve, returns which points to keep. The first and last points are always kept.
+    the error of a point is its vertical distance to the line between the kept points around it (in the units of `values`),
+    as time and value have different units
+
+    :param np.ndarray times: times of the points, sorted
+    :param np.ndarray values: values of the points
+    :param float tolerance: the largest error allowed for a removed point
+    :return np.ndarray: boolean mask of the points to keep
+    """
+    keep = np.zeros(len(times), dtype=bool)
+    if len(times) == 0:
+        return keep
+    
+    keep[[0, -1]] = True
+    segments = [(0, len(times) - 1)]
+
+    while segments:
+        start, end = segments.pop()
+        if end - start < 2: continue
+
+        span = times[end] - times[start]
+        between = slice(start + 1, end)
+        if span > 0:
+            line = values[start] + (values[end] - values[start]) * (times[between] - times[start]) / span
+        else:
+            line = values[start]
+
+        error = np.abs(values[between] - line)
+        i = int(np.argmax(error))
+
+        if error[i] > tolerance:
+            i += start + 1
+            keep[i] = True
+            segments.append((start, i))
+            segments.append((i, end))
+
+    return keep
 
 def rotateAroundCircle(radius, angle) -> Tuple[int]:
     """Takes a radius (x) and an angle (y) and will return its X and Y.
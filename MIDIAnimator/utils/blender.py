@@ -2,8 +2,9 @@ import bpy
 from contextlib import suppress
 from mathutils import Vector
 from mathutils.bvhtree import BVHTree
-from typing import Any, Tuple, List, Union, Set, TYPE_CHECKING
+from typing import Any, Tuple, List, Union, Set, Iterable, TYPE_CHECKING
 from bpy_extras import anim_utils
+import numpy as np
 
 if TYPE_CHECKING:
     from ..data_structures import ObjectShapeKey
@@ -179,6 +180,46 @@ def setKeyframeInterpolation(obj: bpy.types.Object, interpolation: str, data_pat
                 if (data_path is None or fCrv.data_path == data_path) and (array_index is None or fCrv.array_index == array_index):
                     fCrv.keyframe_points[-1].interpolation = interpolation
 
+def writeFCurveKeyframes(obj: bpy.types.Object, data_path: str, array_index: int, frames: Iterable[float], values: Iterable[float], interpolation: str="LINEAR") -> bpy.types.FCurve:
+    """replaces the keyframes of an object's FCurve in one bulk write (`keyframe_points.add()` + `foreach_set()`), instead of one `keyframe_insert()` per keyframe.
+    the FCurve is created if it does not exist
+
+    :param bpy.types.Object obj: the Blender object
+    :param str data_path: the data path of the property (e.g. `"location"` or `'["prop"]'`)
+    :param int array_index: the array index of the property, ignored for properties that are not arrays
+    :param Iterable[float] frames: the frames of the keyframes, sorted
+    :param Iterable[float] values: the values of the keyframes
+    :param str interpolation: the interpolation of the keyframes, see `setKeyframeInterpolation()`, defaults to "LINEAR"
+    :return bpy.types.FCurve: the FCurve
+    """
+    frames = np.asarray(frames, dtype=np.float32)
+    values = np.asarray(values, dtype=np.float32)
+
+    # properties that are not arrays only have an FCurve with index 0
+    value = obj.path_resolve(data_path)
+    isArray = hasattr(value, "__len__") and not isinstance(value, str)
+    if not isArray: array_index = 0
+    
+    # keyframe_insert() takes care of creating the action (and slot) and the FCurve
+    obj.keyframe_insert(data_path=data_path, index=array_index if isArray else -1, frame=float(frames[0]) if len(frames) else 0.0)
+    fCrv = next(fCrv for fCrv in FCurvesFromObject(obj) if fCrv.data_path == data_path and fCrv.array_index == array_index)
+
+    keyframePoints = fCrv.keyframe_points
+    keyframePoints.clear()
+    keyframePoints.add(len(frames))
+
+    co = np.empty(len(frames) * 2, dtype=np.float32)
+    co[0::2] = frames
+    co[1::2] = values
+    keyframePoints.foreach_set("co", co)
+
+    # foreach_set() takes the integer value of the enum item
+    interpolationValue = bpy.types.Keyframe.bl_rna.properties["interpolation"].enum_items[interpolation].value
+    keyframePoints.foreach_set("interpolation", np.full(len(frames), interpolationValue, dtype=np.int32))
+    
+    fCrv.update()
+    return fCrv
+
 def setKeyframeHandleType(obj: bpy.types.Object, handleType: str, data_path=None, array_index=None):
     """sets the last keyframe's on the object handle typw
 
@@ -0,0 +1,52 @@
+"""shared fixtures for the MIDIAnimator tests.
+MIDIAnimator is a Blender add-on, so the tests need `bpy` and `mathutils`: run them with Blender's Python, or install the `bpy` module from PyPI.
+test modules are skipped if they are not available
+"""
+from __future__ import annotations
+from typing import List, Tuple, Union, TYPE_CHECKING
+import pytest
+
+if TYPE_CHECKING:
+    from MIDIAnimator.libs import mido
+
+
+@pytest.fixture
+def writeMIDI(tmp_path):
+    """writes a MIDI file from absolute-tick events and returns its path
+
+    each track is a list of `(absoluteTick, message)` tuples, in any order
+    """
+    from MIDIAnimator.libs import mido
+
+    def write(tracks: List[List[Tuple[int, Union[mido.Message, mido.MetaMessage]]]], midiType: int=1, ticksPerBeat: int=480, name: str="test.mid") -> str:
+        midiFile = mido.MidiFile(type=midiType, ticks_per_beat=ticksPerBeat)
+        
+        for events in tracks:
+            track = mido.MidiTrack()
+            now = 0
+            for tick, message in sorted(events, key=lambda event: event[0]):
+                track.append(message.copy(time=tick - now))
+                now = tick
+            midiFile.tracks.append(track)
+
+        path = tmp_path / name
+        midiFile.save(str(path))
+        return str(path)
+    
+    return write
+
+
+def note(tickOn: int, tickOff: int, noteNumber: int=60, velocity: int=100, channel: int=0) -> List[Tuple[int, mido.Message]]:
+    """a note on and its note off, as `(absoluteTick, message)` tuples"""
+    from MIDIAnimator.libs import mido
+
+    return [(tickOn, mido.Message("note_on", note=noteNumber, velocity=velocity, channel=channel)),
+            (tickOff, mido.Message("note_off", note=noteNumber, velocity=0, channel=channel))]
+
+
+def trackContents(track) -> Tuple[list, dict, list, list]:
+    """the notes and events of a track as plain tuples, for comparing tracks"""
+    return ([(note.channel, note.noteNumber, note.velocity, note.timeOn, note.timeOff) for note in track.notes],
+            {number: [(event.value, event.time) for event in events] for number, events in track.controlChange.items()},
+            [(event.value, event.time) for event in track.pitchwheel],
+            [(event.value, event.time) for event in track.aftertouch])
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note, trackContents
+from MIDIAnimator.libs import mido
+from MIDIAnimator.data_structures.midi import MIDIFile, TempoMap
+
+
+@pytest.fixture
+def path(writeMIDI):
+    conductor = [(0, mido.MetaMessage("set_tempo", tempo=600000)), (700, mido.MetaMessage("set_tempo", tempo=300000))]
+    events = note(0, 500, 60) + note(650, 1200, 62) + note(1500, 1600, 64)
+    events += [(100, mido.Message("control_change", control=1, value=3)), (800, mido.Message("pitchwheel", pitch=100))]
+    return writeMIDI([conductor, events])
+
+
+def testAbsoluteTicksGivesTheSameTimes(path):
+    regular = MIDIFile(path).getMIDITracks()
+    absolute = MIDIFile(path, absoluteTicks=True).getMIDITracks()
+
+    assert [trackContents(track) for track in absolute] == [trackContents(track) for track in regular]
+    assert [(note.tickOn, note.tickOff) for note in absolute[0].notes] == [(0, 500), (650, 1200), (1500, 1600)]
+
+
+def testRetimeWithAConstantTempo(path):
+    midiFile = MIDIFile(path, absoluteTicks=True)
+
+    midiFile.retime(TempoMap.constant(480, 500000))
+
+    track = midiFile.getMIDITracks()[0]
+    assert [(note.timeOn, note.timeOff) for note in track.notes] == pytest.approx([(tickOn / 960, tickOff / 960) for tickOn, tickOff in [(0, 500), (650, 1200), (1500, 1600)]])
+    assert track.pitchwheel[0].time == pytest.approx(800 / 960)
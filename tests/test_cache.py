@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note, trackContents
+from MIDIAnimator.libs import mido
+from MIDIAnimator.data_structures import midi
+from MIDIAnimator.data_structures.cache import MIDICache
+from MIDIAnimator.data_structures.midi import MIDIFile
+
+
+@pytest.fixture
+def path(writeMIDI):
+    return writeMIDI([[(0, mido.MetaMessage("set_tempo", tempo=400000))],
+                      note(0, 480, 60) + note(240, 960, 64) + [(100, mido.Message("control_change", control=1, value=3))]])
+
+
+def testSecondOpenIsReadFromTheCache(path, tmp_path, monkeypatch):
+    cache = MIDICache(str(tmp_path / "cache"))
+    first = MIDIFile(path, cache=cache)
+    assert len(cache._entries()) == 1
+
+    def decodeTrack(*args, **kwargs):
+        raise AssertionError("the file should not be decoded again")
+    monkeypatch.setattr(midi, "_decodeTrack", decodeTrack)
+
+    second = MIDIFile(path, cache=cache)
+    assert second.tempoMap.tempoChanges == first.tempoMap.tempoChanges
+    assert [trackContents(track) for track in second.getMIDITracks()] == [trackContents(track) for track in first.getMIDITracks()]
+
+
+def testEditedFileGetsItsOwnEntry(writeMIDI, path, tmp_path):
+    cache = MIDICache(str(tmp_path / "cache"))
+
+    MIDIFile(path, cache=cache)
+    MIDIFile(path, cache=cache)
+    edited = MIDIFile(writeMIDI([note(0, 480, 61)], name="edited.mid"), cache=cache)
+
+    assert len(cache._entries()) == 2
+    assert [note.noteNumber for note in edited.getMIDITracks()[0].notes] == [61]
+
+
+def testOptionsThatChangeTheOutputGetTheirOwnEntry(path, tmp_path):
+    cache = MIDICache(str(tmp_path / "cache"))
+
+    MIDIFile(path, cache=cache)
+    sliced = MIDIFile(path, cache=cache, start=0.2)
+
+    assert len(cache._entries()) == 2
+    assert sliced.getMIDITracks()[0].notes[0].timeOn == pytest.approx(0.2)
+
+
+def testLeastRecentlyUsedEntriesAreEvicted(tmp_path):
+    cache = MIDICache(str(tmp_path / "cache"))
+    arrays = {"values": np.zeros(200)}
+    cache.store("a", arrays)
+    # room for 3 entries
+    cache.maxSize = 3 * os.path.getsize(cache._path("a"))
+
+    for i, key in enumerate(("a", "b", "c")):
+        cache.store(key, arrays)
+        os.utime(cache._path(key), (i, i))
+    cache.load("a")
+    cache.store("d", arrays)
+
+    assert cache.load("b") is None
+    assert cache.load("a") is not None and cache.load("d") is not None
+
+
+def testUnreadableEntryIsRemoved(tmp_path):
+    cache = MIDICache(str(tmp_path / "cache"))
+    cache.store("broken", {"values": np.zeros(3)})
+    with open(cache._path("broken"), "wb") as file:
+        file.write(b"not an npz file")
+
+    assert cache.load("broken") is None
+    assert not os.path.exists(cache._path("broken"))
@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note
+from MIDIAnimator.libs import mido
+from MIDIAnimator.data_structures.midi import MIDIFile
+
+SECOND = 960
+
+
+@pytest.fixture
+def midiFile(writeMIDI):
+    conductor = [(0, mido.MetaMessage("set_tempo", tempo=500001)), (SECOND, mido.MetaMessage("set_tempo", tempo=250000))]
+    events = note(0, SECOND, 60) + note(SECOND, 3 * SECOND, 62, velocity=90) + [(SECOND, mido.Message("control_change", control=7, value=20))]
+    return MIDIFile(writeMIDI([conductor, events]))
+
+
+def trackContents(track):
+    return ([(note.noteNumber, note.velocity, note.timeOn, note.timeOff) for note in track.notes],
+            {number: [(event.value, event.time) for event in events] for number, events in track.controlChange.items()})
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def testColumnarRoundTrip(midiFile, tmp_path, columnar):
+    path = str(tmp_path / "test.midc")
+    midiFile.saveColumnar(path)
+
+    loaded = MIDIFile.loadColumnar(path, columnar=columnar)
+
+    assert [track.name for track in loaded.getMIDITracks()] == [track.name for track in midiFile.getMIDITracks()]
+    assert [trackContents(track) for track in loaded.getMIDITracks()] == [trackContents(track) for track in midiFile.getMIDITracks()]
+    assert loaded.tempoMap.tempoChanges == midiFile.tempoMap.tempoChanges
+
+
+def testColumnarKeepsStretchedTempos(midiFile):
+    midiFile.retime(stretch=1.5)
+
+    loaded = MIDIFile.loadColumnar(midiFile.toColumnarBytes())
+
+    assert loaded.tempoMap.tempoChanges == [(0, 750001.5), (SECOND, 375000.0)]
+    assert loaded.tempoMap.tickToSecond(3 * SECOND) == midiFile.tempoMap.tickToSecond(3 * SECOND)
@@ -0,0 +1,67 @@
+import gc
+import pickle
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note
+from MIDIAnimator.libs import mido
+from MIDIAnimator.data_structures.midi import MIDIFile, MIDIEventArray, CompactMIDINote, CompactMIDIEvent
+
+
+def testCompactNoteHasNoDict():
+    compactNote = CompactMIDINote(0, 60, 100, 0.5, 1.0)
+
+    assert not hasattr(compactNote, "__dict__")
+    assert pickle.loads(pickle.dumps(compactNote)) == compactNote
+    assert CompactMIDINote(0, 60, 100, 0.25, 1.0) < compactNote
+
+
+def testCompactFileMatchesRegularFile(writeMIDI):
+    path = writeMIDI([note(0, 480, 60) + note(240, 960, 64, velocity=80) + [(120, mido.Message("control_change", control=1, value=5))]])
+
+    regular, compact = MIDIFile(path).getMIDITracks()[0], MIDIFile(path, compact=True).getMIDITracks()[0]
+
+    assert all(type(note) is CompactMIDINote for note in compact.notes)
+    assert all(type(event) is CompactMIDIEvent for event in compact.controlChange[1])
+    assert [(note.noteNumber, note.velocity, note.timeOn, note.timeOff) for note in compact.notes] == \
+           [(note.noteNumber, note.velocity, note.timeOn, note.timeOff) for note in regular.notes]
+    assert [(event.value, event.time) for event in compact.controlChange[1]] == [(event.value, event.time) for event in regular.controlChange[1]]
+
+
+def testCompactTrackUsesWellUnderHalfTheMemory(writeMIDI):
+    events = []
+    for i in range(1000):
+        events += note(i * 60, i * 60 + 240, 40 + i % 40)
+        events.append((i * 60 + 30, mido.Message("control_change", control=1, value=i % 128)))
+        events.append((i * 60 + 31, mido.Message("pitchwheel", pitch=i % 8000)))
+    path = writeMIDI([events])
+
+    def retained(compact):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            tracks = MIDIFile(path, compact=compact).getMIDITracks()
+            gc.collect()
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    assert retained(True) < 0.5 * retained(False)
+
+
+def testCompactTrackRetimesAndDecimatesLikeRegularTrack(writeMIDI):
+    events = note(0, 480, 60) + [(i * 10, mido.Message("control_change", control=7, value=i)) for i in range(50)]
+    path = writeMIDI([events])
+
+    regular, compact = MIDIFile(path, decimate=2.0), MIDIFile(path, compact=True, decimate=2.0)
+    regular.retime(stretch=2.0)
+    compact.retime(stretch=2.0)
+    regularTrack, compactTrack = regular.getMIDITracks()[0], compact.getMIDITracks()[0]
+
+    assert isinstance(compactTrack.controlChange[7], MIDIEventArray)
+    assert [(note.timeOn, note.timeOff) for note in compactTrack.notes] == [(note.timeOn, note.timeOff) for note in regularTrack.notes]
+    assert [(event.value, event.time) for event in compactTrack.controlChange[7]] == [(event.value, event.time) for event in regularTrack.controlChange[7]]
+    assert compactTrack.profile.channels == regularTrack.profile.channels and compactTrack.profile.endTime == regularTrack.profile.endTime
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("bpy")
+
+from MIDIAnimator.libs.mido import MIN_PITCHWHEEL, MAX_PITCHWHEEL
+from MIDIAnimator.data_structures.midi import MIDITrack
+from MIDIAnimator.src.instruments import ControllerInstrument
+
+
+@pytest.fixture
+def instrument():
+    track = MIDITrack("test")
+    track.addControlChange(1, 0, 10, 0.0)
+    track.addControlChange(1, 3, 20, 0.5)
+    track.addControlChange(7, 0, 30, 0.5)
+    track.addPitchwheel(2, -100, 1.0)
+    track.addAftertouch(0, 64, 1.5)
+
+    # the events are read without a collection to animate
+    instrument = ControllerInstrument.__new__(ControllerInstrument)
+    instrument.midiTrack = track
+    return instrument
+
+
+def controller(source, number=1, channel=-1):
+    return SimpleNamespace(midi=SimpleNamespace(ctrl_source=source, ctrl_number=number, ctrl_channel=channel))
+
+
+def testControllerEvents(instrument):
+    events, inMin, inMax = instrument.controllerEvents(controller("cc"))
+    assert [event.value for event in events] == [10, 20] and (inMin, inMax) == (0, 127)
+
+    events, _, _ = instrument.controllerEvents(controller("cc", channel=3))
+    assert [event.value for event in events] == [20]
+
+    events, inMin, inMax = instrument.controllerEvents(controller("pitchwheel"))
+    assert [event.value for event in events] == [-100] and (inMin, inMax) == (MIN_PITCHWHEEL, MAX_PITCHWHEEL)
+
+    assert [event.value for event in instrument.controllerEvents(controller("aftertouch"))[0]] == [64]
+    assert instrument.controllerEvents(controller("cc", number=11))[0] == []
+
+
+def testMappingsMapTheInputRange():
+    for name, mapRange in ControllerInstrument.MAPPINGS.items():
+        assert mapRange(0, 0, 127, 1, 3) == pytest.approx(1), name
+        assert mapRange(127, 0, 127, 1, 3) == pytest.approx(3), name
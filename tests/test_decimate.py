@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("bpy")
+
+from MIDIAnimator.utils import decimateCurve
+from MIDIAnimator.data_structures.midi import MIDITrack
+
+
+def testStraightLineKeepsItsEnds():
+    times = np.linspace(0, 1, 50)
+
+    np.testing.assert_array_equal(np.flatnonzero(decimateCurve(times, 3 * times + 2, 0.01)), [0, 49])
+    assert decimateCurve(np.zeros(0), np.zeros(0), 1.0).tolist() == []
+
+
+@pytest.mark.parametrize("tolerance", [0.5, 2.0, 8.0])
+def testErrorStaysWithinTheTolerance(tolerance):
+    rng = np.random.default_rng(1)
+    times = np.cumsum(rng.uniform(0.01, 0.1, 400))
+    values = np.round(64 + 40 * np.sin(times * 3) + rng.normal(0, 2, 400))
+
+    keep = decimateCurve(times, values, tolerance)
+
+    assert keep[0] and keep[-1] and keep.sum() < len(times)
+    assert np.abs(np.interp(times, times[keep], values[keep]) - values).max() <= tolerance + 1e-9
+
+
+def testDecimateEventsPerChannel():
+    track = MIDITrack("test")
+    for i in range(20):
+        # a ramp on channel 0 and a step on channel 1, interleaved
+        track.addControlChange(1, 0, i * 5, i / 10)
+        track.addControlChange(1, 1, 0 if i < 10 else 127, i / 10 + 0.05)
+    for i in range(10):
+        track.addPitchwheel(0, i * 100, i / 10)
+
+    track.decimateEvents(1.0)
+
+    assert [(event.channel, event.value) for event in track.controlChange[1]] == [(0, 0), (1, 0), (1, 0), (1, 127), (0, 95), (1, 127)]
+    assert [event.value for event in track.pitchwheel] == [0, 900]
@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("bpy")
+
+from MIDIAnimator.data_structures import Keyframe, KeyframeAccumulator
+from MIDIAnimator.src.algorithms import findOverlap
+
+
+def keys(*frames):
+    return [Keyframe(frame, 0) for frame in frames]
+
+
+@pytest.mark.parametrize("accumulator", [False, True])
+@pytest.mark.parametrize("start, expected", [(7, range(1, 4)), (10, range(2, 4)), (0, range(0, 4)), (15, range(4, 4)), (20, range(4, 4))])
+def testFindOverlap(accumulator, start, expected):
+    keyList1 = keys(0, 5, 10, 15)
+    if accumulator:
+        keyList1 = KeyframeAccumulator(keyList1)
+
+    assert findOverlap(keyList1, keys(start, start + 10)) == expected
+
+
+def testFindOverlapErrors():
+    assert findOverlap([], keys(1)) == range(0, 0)
+    assert findOverlap(keys(0, 5), []) == range(2, 2)
+
+    with pytest.raises(ValueError):
+        findOverlap(keys(5, 10), keys(0, 10))
+    with pytest.raises(ValueError):
+        findOverlap(keys(0, 20, 10), keys(15, 25))
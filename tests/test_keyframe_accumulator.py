@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+pytest.importorskip("bpy")
+
+from MIDIAnimator.data_structures import Keyframe, KeyframeAccumulator
+
+
+def testStaysSortedAndStable():
+    rng = random.Random(6)
+    keys = [Keyframe(rng.randint(0, 20), value) for value in range(100)]
+
+    accumulator = KeyframeAccumulator(keys)
+
+    # keyframes on the same frame keep the order they were added in
+    assert accumulator.materialize() == sorted(keys, key=lambda key: key.frame)
+    assert [key.frame for key in accumulator] == sorted(key.frame for key in keys)
+    assert len(accumulator) == 100 and accumulator[0].frame == 0
+
+
+def testOverlapAndTail():
+    accumulator = KeyframeAccumulator(Keyframe(frame, 0) for frame in (0, 5, 10, 15))
+
+    # the keyframe before the note and everything after its start
+    assert accumulator.overlapStart(7) == 1
+    assert accumulator.overlapStart(10) == 2
+    assert accumulator.overlapStart(-3) == 0
+    assert accumulator.overlapStart(15) == 4
+    assert accumulator.indexAfter(10) == 3
+    assert [key.frame for key in accumulator.tail(2)] == [10, 15]
+
+    accumulator.replaceTail(2, [Keyframe(12, 1), Keyframe(11, 1)])
+    assert [key.frame for key in accumulator] == [0, 5, 11, 12]
+    assert accumulator.overlapStart(11.5) == 2
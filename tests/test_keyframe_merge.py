@@ -0,0 +1,85 @@
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip("bpy")
+
+from MIDIAnimator.data_structures import Keyframe, KeyframeAccumulator
+from MIDIAnimator.src.algorithms import (interpolateKeyframes, interval, getValue, findOverlap, addKeyframes, minKeyframes, maxKeyframes,
+                                         combineKeyframeArrays)
+
+
+def randomKeys(rng, count):
+    # duplicate frames are allowed
+    frames = sorted(rng.randint(0, 30) / 2 for _ in range(count))
+    return [Keyframe(frame, rng.uniform(-5, 5)) for frame in frames]
+
+
+def testInterpolateKeyframesMatchesInterval():
+    rng = random.Random(2)
+    for _ in range(200):
+        # interval() fails on the frame of a single key
+        keyList = randomKeys(rng, rng.randint(2, 8))
+        frames = sorted(rng.randint(-4, 34) / 2 for _ in range(rng.randint(0, 10)))
+
+        assert interpolateKeyframes(keyList, frames) == [getValue(*interval(keyList, frame), frame) for frame in frames]
+
+    assert interpolateKeyframes([Keyframe(2, 3)], [0, 2, 4]) == [3, 3, 3]
+    assert interpolateKeyframes([], [1.0]) == []
+
+
+def testAddKeyframes():
+    inserted = KeyframeAccumulator([Keyframe(0, 0), Keyframe(10, 1), Keyframe(20, 0)])
+
+    addKeyframes(inserted, [Keyframe(15, 2), Keyframe(5, 0), Keyframe(25, 0)])
+
+    assert [key.co for key in inserted] == [(0, 0), (5, 0.5), (10, 2.0), (15, 2.5), (20, 1.0), (25, 0)]
+
+
+def referenceMerge(insertedKeys, nextKeys, mode):
+    # the overlap modes, written out key by key
+    nextKeys = sorted(nextKeys, key=lambda key: key.frame)
+    start = findOverlap(insertedKeys, nextKeys).start
+    overlapping = insertedKeys[start:]
+    if not overlapping:
+        return [key.co for key in insertedKeys + nextKeys]
+
+    nextAtInserted = interpolateKeyframes(nextKeys, [key.frame for key in overlapping])
+    insertedAtNext = interpolateKeyframes(overlapping, [key.frame for key in nextKeys])
+
+    def combine(value, other):
+        if mode == "add":
+            return value + other
+        if mode == "max":
+            return max(value, other)
+        # values at rest are ignored
+        return min(value, other) if value != 0 and other != 0 else value
+
+    merged = [(key.frame, combine(key.value, other)) for key, other in zip(overlapping, nextAtInserted)]
+    overlappingFrames = {key.frame for key in overlapping}
+    merged += [(key.frame, combine(key.value, other)) for key, other in zip(nextKeys, insertedAtNext)
+               if mode == "add" or key.frame not in overlappingFrames]
+
+    # stable, the inserted key comes first on the same frame
+    return [key.co for key in insertedKeys[:start]] + sorted(merged, key=lambda co: co[0])
+
+
+@pytest.mark.parametrize("mode, mergeFunction", [("add", addKeyframes), ("min", minKeyframes), ("max", maxKeyframes)])
+def testMergeFunctionsMatchTheReference(mode, mergeFunction):
+    rng = random.Random(4)
+    for _ in range(200):
+        insertedKeys = randomKeys(rng, rng.randint(2, 8))
+        nextKeys = [Keyframe(key.frame + insertedKeys[0].frame, key.value) for key in randomKeys(rng, rng.randint(2, 8))]
+        expected = referenceMerge(insertedKeys, nextKeys, mode)
+
+        combined = KeyframeAccumulator([Keyframe(*key.co) for key in insertedKeys])
+        mergeFunction(combined, nextKeys)
+
+        assert [key.frame for key in combined] == [frame for frame, _ in expected]
+        assert [key.value for key in combined] == pytest.approx([value for _, value in expected])
+
+
+def testCombineKeyframeArraysUnknownMode():
+    with pytest.raises(ValueError):
+        combineKeyframeArrays(np.zeros(1), np.zeros(1), np.zeros(1), np.zeros(1), "prev")
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note, trackContents
+from MIDIAnimator.libs import mido
+from MIDIAnimator.data_structures.midi import MIDIFile, MIDITrack
+
+
+@pytest.fixture
+def path(writeMIDI):
+    return writeMIDI([[(0, mido.MetaMessage("set_tempo", tempo=400000)), (0, mido.MetaMessage("track_name", name="conductor"))],
+                      [(0, mido.MetaMessage("track_name", name="bass"))] + note(0, 480, 36) + note(960, 1200, 38),
+                      [(0, mido.MetaMessage("track_name", name="lead")), (10, mido.Message("control_change", control=1, value=9))] + note(240, 720, 72)])
+
+
+def testLazyFileDecodesTracksWhenTheyAreUsed(path):
+    midiFile = MIDIFile(path, lazy=True)
+
+    # the conductor track has no notes or events
+    assert midiFile.listTrackNames() == ["bass", "lead"]
+    assert not any(isinstance(track, MIDITrack) for track in midiFile._tracks)
+
+    lead = midiFile.findTrack("lead")
+    assert [isinstance(track, MIDITrack) for track in midiFile._tracks] == [False, True]
+    assert [(note.noteNumber, note.timeOn) for note in lead.notes] == [(72, 0.2)]
+
+
+def testLazyFileMatchesEagerFile(path):
+    lazy, eager = MIDIFile(path, lazy=True), MIDIFile(path)
+
+    assert lazy.tempoMap.tickToSecond(2000) == eager.tempoMap.tickToSecond(2000)
+    assert [trackContents(track) for track in lazy.getMIDITracks()] == [trackContents(track) for track in eager.getMIDITracks()]
@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note
+from MIDIAnimator.libs import mido
+from MIDIAnimator.data_structures.midi import MIDIFile
+
+SECOND = 960
+
+
+@pytest.fixture
+def midiFile(writeMIDI):
+    return MIDIFile(writeMIDI([note(0, SECOND, 60) + note(2 * SECOND, 3 * SECOND, 61),
+                               note(SECOND, 2 * SECOND, 62),
+                               note(int(0.5 * SECOND), SECOND, 63)]))
+
+
+def testMergeTracksKeepsTimeOrder(midiFile):
+    merged = midiFile.mergeTracks(*midiFile.getMIDITracks())
+
+    assert [note.noteNumber for note in merged.notes] == [60, 63, 62, 61]
+    assert [note.timeOn for note in merged.notes] == sorted(note.timeOn for note in merged.notes)
+
+
+def testMergeTracksPositionalName(midiFile):
+    track1, track2, _ = midiFile.getMIDITracks()
+
+    merged = midiFile.mergeTracks(track1, track2, "both")
+
+    assert merged.name == "both"
+    assert [note.noteNumber for note in merged.notes] == [60, 62, 61]
+    assert midiFile.mergeTracks(track1, track2, name="both").name == "both"
+
+
+def testMergeTracksRejectsOtherArguments(midiFile):
+    track1, track2, _ = midiFile.getMIDITracks()
+
+    with pytest.raises(TypeError):
+        midiFile.mergeTracks(track1, 2)
+    with pytest.raises(TypeError):
+        midiFile.mergeTracks(track1, track2, "both", name="both")
+
+
+def testMergeKeepsControlChangesOfEveryTrack(writeMIDI):
+    path = writeMIDI([[(0, mido.Message("control_change", control=1, value=1)), (960, mido.Message("control_change", control=1, value=3)),
+                       (0, mido.Message("control_change", control=7, value=100))] + note(0, 10, 60),
+                      [(480, mido.Message("control_change", control=1, value=2)), (480, mido.Message("pitchwheel", pitch=5))],
+                      [(100, mido.Message("control_change", control=11, value=50)), (0, mido.Message("pitchwheel", pitch=1))]])
+    track1, track2, track3 = MIDIFile(path).getMIDITracks()
+
+    merged = track1 + track2 + track3
+
+    assert {number: [event.value for event in events] for number, events in merged.controlChange.items()} == {1: [1, 2, 3], 7: [100], 11: [50]}
+    assert [event.value for event in merged.pitchwheel] == [1, 5]
+    assert merged.name == f"{track1.name} & {track2.name} & {track3.name}"
@@ -0,0 +1,40 @@
+import io
+
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note
+from MIDIAnimator.libs import mido
+
+
+@pytest.fixture
+def path(writeMIDI):
+    events = note(0, 480, 60) + note(240, 960, 64, channel=3)
+    events += [(0, mido.MetaMessage("track_name", name="piano")), (100, mido.Message("control_change", control=7, value=90)),
+               (300, mido.Message("pitchwheel", pitch=-200)), (400, mido.Message("sysex", data=[1, 2, 3]))]
+    return writeMIDI([[(0, mido.MetaMessage("set_tempo", tempo=400000))], events])
+
+
+def messages(midiFile):
+    return [[msg for msg in track] for track in midiFile.tracks]
+
+
+def testBufferReaderMatchesStreamReader(path):
+    with open(path, "rb") as file:
+        data = file.read()
+
+    fromFile = mido.MidiFile(path)
+    fromStream = mido.MidiFile(file=io.BytesIO(data))
+
+    assert messages(fromFile) == messages(fromStream)
+    assert messages(mido.MidiFile(data=data)) == messages(fromStream)
+    assert messages(mido.MidiFile(data=memoryview(data))) == messages(fromStream)
+
+
+def testTruncatedChunkRaises(path):
+    with open(path, "rb") as file:
+        data = file.read()
+
+    with pytest.raises(EOFError):
+        mido.MidiFile(data=data[:-5])
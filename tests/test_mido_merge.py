@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+pytest.importorskip("bpy")
+
+from MIDIAnimator.libs import mido
+from MIDIAnimator.libs.mido.midifiles.tracks import _to_abstime, _to_reltime, fix_end_of_track
+
+
+def sortedMerge(tracks):
+    """the sort-based merge that `merge_tracks()` used before"""
+    messages = []
+    for track in tracks:
+        messages.extend(_to_abstime(track))
+    messages.sort(key=lambda msg: msg.time)
+    return mido.MidiTrack(fix_end_of_track(_to_reltime(messages)))
+
+
+def randomTrack(rng, channel):
+    track = mido.MidiTrack()
+    for _ in range(rng.randint(0, 30)):
+        track.append(mido.Message("note_on", note=rng.randint(0, 127), channel=channel, time=rng.choice([0, 0, 1, 10, 120])))
+    track.append(mido.MetaMessage("end_of_track", time=rng.randint(0, 50)))
+    return track
+
+
+def testMergeTracksMatchesTheSortedMerge():
+    rng = random.Random(3)
+    for _ in range(50):
+        tracks = [randomTrack(rng, channel) for channel in range(rng.randint(1, 5))]
+        copies = [track.copy() for track in tracks]
+
+        assert list(mido.merge_tracks(tracks)) == list(sortedMerge(tracks))
+        # the messages of the tracks are not changed
+        assert tracks == copies
+
+
+def testIterMergedAbstime():
+    tracks = [mido.MidiTrack([mido.Message("note_on", note=1, time=5), mido.Message("note_on", note=2, time=5)]),
+              mido.MidiTrack([mido.Message("note_on", note=3, time=10), mido.MetaMessage("end_of_track", time=3)])]
+
+    pairs = list(mido.iter_merged_abstime(tracks))
+
+    assert [(now, msg.type, getattr(msg, "note", None)) for now, msg in pairs] == [(5, "note_on", 1), (10, "note_on", 2), (10, "note_on", 3), (13, "end_of_track", None)]
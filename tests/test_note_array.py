@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note, trackContents
+from MIDIAnimator.data_structures.midi import MIDIFile, MIDINote, MIDINoteArray
+
+NOTES = [MIDINote(0, 64, 90, 1.0, 2.0), MIDINote(0, 60, 100, 0.0, 1.5), MIDINote(1, 62, 80, 1.0, -1.0), MIDINote(0, 60, 70, 3.0, 4.0)]
+
+
+def testRoundTripAndSortLikeAList():
+    notes = MIDINoteArray.fromNotes(NOTES)
+
+    assert notes.toNotes() == NOTES
+    assert list(notes) == NOTES
+    assert notes[2] == NOTES[2]
+
+    notes.sort()
+    assert list(notes) == sorted(NOTES)
+
+
+def testQueries():
+    notes = MIDINoteArray.fromNotes(NOTES)
+
+    assert [note.noteNumber for note in notes.withNoteNumbers([60])] == [60, 60]
+    assert [note.noteNumber for note in notes.inTimeRange(1.0, 3.0)] == [64, 62]
+    # the note held from 0 to 1.5 and the hanging note overlap the window
+    assert sorted(note.noteNumber for note in notes.inTimeRange(1.2, 3.0, overlapping=True)) == [60, 62, 64]
+    np.testing.assert_array_equal(notes.uniqueNoteNumbers(), [60, 62, 64])
+    assert len(notes + NOTES[:1]) == 5
+
+
+def testColumnarFileMatchesRegularFile(writeMIDI):
+    path = writeMIDI([note(0, 480, 60) + note(240, 960, 64) + note(240, 300, 67)])
+
+    regular, columnar = MIDIFile(path).getMIDITracks()[0], MIDIFile(path, columnar=True).getMIDITracks()[0]
+
+    assert isinstance(columnar.notes, MIDINoteArray)
+    assert trackContents(columnar) == trackContents(regular)
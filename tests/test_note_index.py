@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+pytest.importorskip("bpy")
+
+from MIDIAnimator.data_structures.midi import MIDINote, MIDINoteArray, MIDINoteIndex, MIDITrack
+
+
+def randomNotes(count, seed=5):
+    rng = random.Random(seed)
+    notes = []
+    for _ in range(count):
+        timeOn = rng.randint(0, 400) / 4
+        timeOff = -1.0 if rng.random() < 0.05 else timeOn + rng.randint(0, 40) / 4
+        notes.append(MIDINote(0, rng.randint(40, 50), 100, timeOn, timeOff))
+    return sorted(notes)
+
+
+def sounding(note, time):
+    return note.timeOn <= time and (note.timeOff > time or note.timeOff < 0)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def testQueriesMatchAScan(columnar):
+    notes = randomNotes(500)
+    index = MIDINoteIndex(MIDINoteArray.fromNotes(notes) if columnar else notes)
+    times = [value / 8 for value in range(-8, 900)]
+
+    for time in times:
+        assert list(index.activeNotesAt(time)) == [note for note in notes if sounding(note, time)]
+        assert index.nextNoteAfter(time) == next((note for note in notes if note.timeOn > time), None)
+        assert index.nextNoteAfter(time, 45) == next((note for note in notes if note.timeOn > time and note.noteNumber == 45), None)
+
+    for start, end in [(0, 10), (12.5, 13), (50, 20), (99, 200), (30.25, 60.75)]:
+        assert list(index.notesInRange(start, end)) == [note for note in notes if start <= note.timeOn < end]
+        assert sorted(index.notesInRange(start, end, overlapping=True)) == \
+               [note for note in notes if note.timeOn < end and (note.timeOff > start or note.timeOff < 0)]
+
+
+def testTrackIndexIsRebuiltWhenNotesAreAdded():
+    track = MIDITrack("test")
+    track.addNoteOn(0, 60, 100, 0.0)
+    track.addNoteOff(0, 60, 0, 1.0)
+    assert track.noteIndex.activeNotesAt(0.5)[0].noteNumber == 60
+
+    track.addNoteOn(0, 62, 100, 2.0)
+    track.addNoteOff(0, 62, 0, 3.0)
+    assert [note.noteNumber for note in track.noteIndex.activeNotesAt(2.5)] == [62]
@@ -0,0 +1,53 @@
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note
+from MIDIAnimator.libs import mido
+from MIDIAnimator.data_structures.midi import MIDIFile, MIDINote, MIDINotePairer
+
+
+@pytest.mark.parametrize("policy, ended", [("fifo", 0.0), ("lifo", 1.0)])
+def testStackedNotesArePairedByPolicy(policy, ended):
+    pairer = MIDINotePairer(policy)
+    pairer.noteOn(MIDINote(0, 60, 100, 0.0, -1.0))
+    pairer.noteOn(MIDINote(0, 60, 100, 1.0, -1.0))
+
+    assert pairer.noteOff(0, 60, 2.0).timeOn == ended
+    # different channel, no open note
+    assert pairer.noteOff(1, 60, 2.0) is None
+    assert [note.timeOn for note in pairer.popOpenNotes()] == [1.0 - ended]
+    assert pairer.popOpenNotes() == []
+
+
+def testUnknownPolicy():
+    with pytest.raises(ValueError):
+        MIDINotePairer("random")
+
+
+@pytest.fixture
+def path(writeMIDI):
+    # 120 BPM, 960 ticks per second. two stacked notes, an orphan note off, and a note that never ends
+    events = [(0, mido.Message("note_on", note=60, velocity=100)), (480, mido.Message("note_on", note=60, velocity=90)),
+              (960, mido.Message("note_off", note=60)), (1440, mido.Message("note_off", note=60)),
+              (1500, mido.Message("note_off", note=62)), (1920, mido.Message("note_on", note=64, velocity=80))]
+    return writeMIDI([events + note(2880, 3840, 40)])
+
+
+def testPairingPoliciesOfAFile(path):
+    fifo = MIDIFile(path).getMIDITracks()[0]
+    lifo = MIDIFile(path, notePairing="lifo").getMIDITracks()[0]
+
+    assert [(note.velocity, note.timeOn, note.timeOff) for note in fifo.notes if note.noteNumber == 60] == [(100, 0.0, 1.0), (90, 0.5, 1.5)]
+    assert [(note.velocity, note.timeOn, note.timeOff) for note in lifo.notes if note.noteNumber == 60] == [(100, 0.0, 1.5), (90, 0.5, 1.0)]
+    assert [(event.value, event.time) for event in fifo.orphanNoteOffs] == [(62, 1500 / 960)]
+
+
+def testHangingNotes(path):
+    def hanging(midiFile):
+        return [note.timeOff for note in midiFile.getMIDITracks()[0].notes if note.noteNumber == 64]
+
+    assert hanging(MIDIFile(path)) == [-1.0]
+    # the track ends with the last note off
+    assert hanging(MIDIFile(path, closeHangingNotes=True)) == [4.0]
+    assert hanging(MIDIFile(path, maxNoteLength=0.5)) == [2.5]
@@ -0,0 +1,114 @@
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip("bpy")
+
+from MIDIAnimator.data_structures import Keyframe, KeyframeAccumulator
+from MIDIAnimator.src.algorithms import (addKeyframes, minKeyframes, maxKeyframes, nextKeyframes, prevKeyframes, interpolateKeyframes,
+                                         combineKeyframes, resolveOverlapBatch, BATCH_OVERLAP_MODES)
+
+MERGE_FUNCTIONS = {"add": addKeyframes, "min": minKeyframes, "max": maxKeyframes, "next": nextKeyframes, "prev": prevKeyframes}
+
+
+def keys(points):
+    return [Keyframe(frame, value) for frame, value in points]
+
+
+def noteByNote(instances, mergeFunction):
+    # the merge functions change the values of the keyframes
+    instances = [[Keyframe(key.frame, key.value) for key in keyframes] for keyframes in instances]
+    instances.sort(key=lambda keyframes: keyframes[0].frame)
+    accumulator = KeyframeAccumulator(instances[0])
+    for nextKeys in instances[1:]:
+        mergeFunction(accumulator, nextKeys)
+    return accumulator.materialize()
+
+
+def sample(keyframes, frames):
+    return np.interp(frames, [key.frame for key in keyframes], [key.value for key in keyframes])
+
+
+def randomNotes(rng, count):
+    instances = []
+    for _ in range(count):
+        start = rng.randint(0, 60)
+        attack, release = rng.randint(1, 6), rng.randint(1, 6)
+        instances.append(keys([(start, 0), (start + attack, rng.randint(1, 10)), (start + attack + release, 0)]))
+    return instances
+
+
+def testMinAndMaxAreNotBatched():
+    assert "min" not in BATCH_OVERLAP_MODES and "max" not in BATCH_OVERLAP_MODES
+    with pytest.raises(ValueError):
+        resolveOverlapBatch([keys([(0, 0), (1, 1), (2, 0)])], "min")
+
+
+@pytest.mark.parametrize("mode, points, frame, expected", [
+    ("min", [[(1, 0), (2, 2), (5, 0)], [(2, 0), (3, 3), (10, 0)]], 5, 0),
+    ("max", [[(20, 0), (22, 5), (27, 0)], [(25, 0), (30, 5), (34, 0)], [(26, 0), (28, 1), (32, 0)]], 26, 2.0),
+])
+def testMinAndMaxMatchNoteByNote(mode, points, frame, expected):
+    instances = [keys(note) for note in points]
+    reference = noteByNote(instances, MERGE_FUNCTIONS[mode])
+    combined = noteByNote(instances, lambda inserted, nextKeys: combineKeyframes(inserted, nextKeys, mode))
+
+    assert sample(reference, [frame])[0] == pytest.approx(expected)
+    frames = np.arange(0, 40, 0.25)
+    np.testing.assert_allclose(sample(combined, frames), sample(reference, frames), atol=1e-9)
+
+
+def testBatchAddMatchesNoteByNoteForCurvesAtRest():
+    rng = random.Random(7)
+    frames = np.arange(0, 80, 0.25)
+    for _ in range(50):
+        instances = randomNotes(rng, rng.randint(1, 12))
+        batched = resolveOverlapBatch(instances, "add")
+        reference = noteByNote(instances, addKeyframes)
+
+        assert [key.frame for key in batched] == sorted({key.frame for key in batched})
+        np.testing.assert_allclose(sample(batched, frames), sample(reference, frames), atol=1e-9)
+
+
+@pytest.mark.parametrize("points", [
+    # touching notes at rest
+    [[(0, 0), (5, 2), (10, 0)], [(10, 0), (15, 2), (20, 0)]],
+    # touching notes that don't rest at 0
+    [[(0, 1), (5, 2), (10, 1)], [(10, 1), (15, 2), (20, 1)]],
+    # notes that rest at other values, overlapping
+    [[(0, 3), (4, 5), (8, 3)], [(2, 3), (6, 1), (9, 3)], [(7, -1), (12, 2)]],
+    # a jump (two keyframes on one frame)
+    [[(0, 0), (5, 0), (5, 4), (10, 0)], [(3, 0), (6, 2), (9, 0)]],
+])
+def testBatchAddMatchesNoteByNote(points):
+    instances = [keys(note) for note in points]
+    batched = resolveOverlapBatch(instances, "add")
+    reference = noteByNote(instances, addKeyframes)
+
+    # sampled like Blender (and `interval()`), the first keyframe on a frame wins
+    frames = np.arange(-2, 24, 0.5).tolist()
+    assert interpolateKeyframes(batched, frames) == pytest.approx(interpolateKeyframes(reference, frames))
+
+
+def testBatchAddMatchesNoteByNoteForCurvesNotAtRest():
+    rng = random.Random(13)
+    frames = np.arange(-4, 84, 0.5).tolist()
+    for _ in range(50):
+        instances = [[Keyframe(key.frame, key.value + rest) for key in note] for note, rest in
+                     zip(randomNotes(rng, rng.randint(1, 12)), [rng.choice([0, 0, 1, -2]) for _ in range(12)])]
+        batched = resolveOverlapBatch(instances, "add")
+        reference = noteByNote(instances, addKeyframes)
+
+        assert interpolateKeyframes(batched, frames) == pytest.approx(interpolateKeyframes(reference, frames))
+
+
+@pytest.mark.parametrize("mode", ["next", "prev"])
+def testBatchNextAndPrevAreExact(mode):
+    rng = random.Random(11)
+    for _ in range(50):
+        instances = randomNotes(rng, rng.randint(1, 12))
+        batched = resolveOverlapBatch(instances, mode)
+        reference = noteByNote(instances, MERGE_FUNCTIONS[mode])
+
+        assert [key.co for key in batched] == [key.co for key in reference]
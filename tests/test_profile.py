@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note
+from MIDIAnimator.libs import mido
+from MIDIAnimator.data_structures.midi import MIDIFile, MIDITrack
+from MIDIAnimator.src.instruments import LaserInstrument
+
+
+def testProfileOfAParsedTrack(writeMIDI):
+    # 120 BPM, 960 ticks per second
+    events = note(0, 960, 60, velocity=80) + note(480, 1440, 64, velocity=110) + note(960, 1920, 67, velocity=90, channel=2)
+    events += [(2400, mido.Message("control_change", control=1, value=10, channel=5))]
+    track = MIDIFile(writeMIDI([events])).getMIDITracks()[0]
+
+    profile = track.profile
+
+    assert profile.noteCount == 3
+    assert profile.usedNotes == [60, 64, 67]
+    assert (profile.minNote, profile.maxNote, profile.minVelocity, profile.maxVelocity) == (60, 67, 80, 110)
+    assert profile.channels == [0, 2, 5]
+    assert (profile.startTime, profile.endTime, profile.duration) == (0.0, 2.5, 2.5)
+    assert profile.hasNote(64) and not profile.hasNote(61) and not profile.hasNote(200)
+    # the first note ends when the third one starts
+    assert profile.maxPolyphony == 2
+    assert [profile.polyphonyAt(time) for time in (0.0, 0.5, 1.0, 1.5, 2.0)] == [1, 2, 2, 1, 0]
+
+
+def testProfileIsRecomputedWhenNotesAreAdded():
+    track = MIDITrack("test")
+    assert track.profile.noteCount == 0 and track.profile.minNote == -1
+
+    track.addNoteOn(0, 60, 100, 0.0)
+    track.addNoteOff(0, 60, 0, 1.0)
+
+    assert track.profile.noteCount == 1
+
+
+def laser(track, noteLow="lowest", noteHigh="highest"):
+    # the note range is read without a collection to animate
+    instrument = LaserInstrument.__new__(LaserInstrument)
+    instrument.midiTrack = track
+    instrument.collection = SimpleNamespace(midi=SimpleNamespace(laser_note_low=noteLow, laser_note_high=noteHigh))
+    return instrument
+
+
+def testLaserNoteRangeComesFromTheProfile():
+    track = MIDITrack("test")
+    for noteNumber in (64, 60, 67):
+        track.addNoteOn(0, noteNumber, 100, 0.0)
+
+    assert laser(track).noteRange() == (60, 67)
+    assert laser(track, noteHigh="72").noteRange() == (60, 72)
+
+
+def testLaserNoteRangeOfTrackWithoutNotes():
+    track = MIDITrack("test")
+    track.addControlChange(1, 0, 10, 0.0)
+
+    with pytest.raises(ValueError, match="no notes"):
+        laser(track).noteRange()
+    with pytest.raises(ValueError, match="no notes"):
+        laser(track, noteLow="48").noteRange()
+
+    assert laser(track, "48", "72").noteRange() == (48, 72)
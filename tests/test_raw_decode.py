@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note
+from MIDIAnimator.libs import mido
+from MIDIAnimator.data_structures.midi import MIDIFile
+
+
+def testRawEventsOfABuffer(writeMIDI):
+    events = note(0, 480, 60) + note(240, 960, 64, channel=3)
+    events += [(0, mido.MetaMessage("track_name", name="piano")), (100, mido.Message("control_change", control=7, value=90))]
+    path = writeMIDI([[(0, mido.MetaMessage("set_tempo", tempo=400000))], events])
+
+    with mido.open_buffer(path) as data:
+        midiType, numTracks, ticksPerBeat, pos = mido.read_buffer_header(data)
+        chunks = list(mido.iter_buffer_tracks(data, pos, numTracks))
+        events = list(mido.iter_raw_events(data, *chunks[1]))
+
+    assert (midiType, numTracks, ticksPerBeat) == (1, 2, 480)
+    assert (0, 0xff, 0x03, b"piano") in events
+    assert (0, 0x90, 60, 100) in events
+    assert (240, 0x93, 64, 100) in events
+    assert (100, 0xb0, 7, 90) in events
+    assert [tick for tick, *_ in events] == sorted(tick for tick, *_ in events)
+
+
+def testType0FileIsSplitByChannel(writeMIDI):
+    path = writeMIDI([[(0, mido.Message("program_change", program=0, channel=0)), (0, mido.Message("note_on", note=60, velocity=100, channel=0)),
+                       (240, mido.Message("note_on", note=62, velocity=90, channel=2)), (480, mido.Message("note_on", note=60, velocity=0, channel=0)),
+                       (480, mido.Message("pitchwheel", pitch=-8192, channel=2)), (480, mido.Message("aftertouch", value=5, channel=2)),
+                       (960, mido.Message("note_off", note=62, channel=2))]], midiType=0)
+
+    piano, track3 = MIDIFile(path).getMIDITracks()
+
+    assert piano.name == "Acoustic Grand Piano"
+    assert [(note.noteNumber, note.velocity, note.timeOn, note.timeOff) for note in piano.notes] == [(60, 100, 0.0, 0.5)]
+    assert track3.name == "Track 3"
+    assert [(note.noteNumber, note.timeOn, note.timeOff) for note in track3.notes] == [(62, 0.25, 1.0)]
+    assert [(event.value, event.time) for event in track3.pitchwheel] == [(-8192, 0.5)]
+    assert [(event.value, event.time) for event in track3.aftertouch] == [(5, 0.5)]
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("bpy")
+
+from MIDIAnimator.data_structures.midi import MIDITrack
+
+# at 10 FPS, 0.0 & 0.04 go to frame 0, 0.06 & 0.12 to frame 1, 0.5 to frame 5
+TIMES = [0.0, 0.04, 0.06, 0.12, 0.5]
+VALUES = [10, 20, 40, 30, 5]
+
+
+@pytest.mark.parametrize("policy, expected", [
+    ("first", [10, 40, 5]),
+    ("last", [20, 30, 5]),
+    ("max", [20, 40, 5]),
+    ("min", [10, 30, 5]),
+    ("mean", [15, 35, 5]),
+])
+def testResampleEvents(policy, expected):
+    track = MIDITrack("test")
+    for time, value in zip(TIMES, VALUES):
+        track.addControlChange(1, 0, value, time)
+
+    frames, values = MIDITrack.resampleEvents(track.controlChange[1], 10, policy)
+
+    np.testing.assert_array_equal(frames, [0, 1, 5])
+    np.testing.assert_allclose(values, expected)
+
+
+def testResampleNotes():
+    track = MIDITrack("test")
+    for time, velocity in zip(TIMES, VALUES):
+        track.addNoteOn(0, 60 + velocity // 10, velocity, time)
+        track.addNoteOff(0, 60 + velocity // 10, 0, time + 0.01)
+
+    frames, velocities = track.resampleNotes(10)
+    np.testing.assert_array_equal(frames, [0, 1, 5])
+    np.testing.assert_array_equal(velocities, [10, 40, 5])
+
+    _, noteNumbers = track.resampleNotes(10, "max", "noteNumber")
+    np.testing.assert_array_equal(noteNumbers, [62, 64, 60])
+
+
+def testUnknownPolicy():
+    with pytest.raises(ValueError):
+        MIDITrack.resampleEvents([], 24, "median")
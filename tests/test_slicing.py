@@ -0,0 +1,64 @@
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note
+from MIDIAnimator.libs import mido
+from MIDIAnimator.data_structures.midi import MIDIFile
+
+# 120 BPM at 480 ticks per beat
+SECOND = 960
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def testNoteHeldOverTheWholeSlice(writeMIDI, lazy):
+    pad = note(0, 10 * SECOND, 48) + [(0, mido.Message("control_change", control=1, value=64))]
+    path = writeMIDI([[(0, mido.MetaMessage("set_tempo", tempo=500000))], pad])
+
+    tracks = MIDIFile(path, start=2, end=4, lazy=lazy).getMIDITracks()
+
+    assert len(tracks) == 1
+    track = tracks[0]
+    assert [(note.noteNumber, note.timeOn, note.timeOff) for note in track.notes] == [(48, 2.0, 4.0)]
+    assert [(event.value, event.time) for event in track.controlChange[1]] == [(64, 2.0)]
+    assert track.orphanNoteOffs == []
+
+
+def testSliceClipsNotesAndKeepsState(writeMIDI):
+    events = note(0, 3 * SECOND, 60) + note(int(2.5 * SECOND), int(3.5 * SECOND), 62) + note(5 * SECOND, 6 * SECOND, 64)
+    events += [(0, mido.Message("control_change", control=7, value=10)), (SECOND, mido.Message("control_change", control=7, value=20)),
+               (int(2.5 * SECOND), mido.Message("control_change", control=7, value=30)), (5 * SECOND, mido.Message("control_change", control=7, value=40))]
+    path = writeMIDI([events])
+
+    track = MIDIFile(path, start=2, end=4).getMIDITracks()[0]
+
+    # the note started before the slice starts at its start, the one after the slice is left out
+    assert [(note.noteNumber, note.timeOn, note.timeOff) for note in track.notes] == [(60, 2.0, 3.0), (62, 2.5, 3.5)]
+    # the last value before the slice, then the values in it
+    assert [(event.value, event.time) for event in track.controlChange[7]] == [(20, 2.0), (30, 2.5)]
+
+
+def testSliceEndsHeldNotesAtTheEnd(writeMIDI):
+    path = writeMIDI([note(SECOND, 5 * SECOND)])
+
+    track = MIDIFile(path, end=2).getMIDITracks()[0]
+
+    assert [(note.timeOn, note.timeOff) for note in track.notes] == [(1.0, 2.0)]
+
+
+def testSliceEndMustBeAfterStart(writeMIDI):
+    path = writeMIDI([note(0, SECOND)])
+
+    with pytest.raises(ValueError):
+        MIDIFile(path, start=2, end=1)
+
+
+def testLazySliceSkipsTracksWithoutContentInTheSlice(writeMIDI):
+    path = writeMIDI([[(0, mido.MetaMessage("track_name", name="early"))] + note(0, SECOND, 60),
+                      [(0, mido.MetaMessage("track_name", name="inside"))] + note(2 * SECOND, 3 * SECOND, 62),
+                      [(0, mido.MetaMessage("track_name", name="late"))] + note(6 * SECOND, 7 * SECOND, 64)])
+
+    lazy = MIDIFile(path, start=2, end=4, lazy=True)
+
+    assert lazy.listTrackNames() == ["inside"]
+    assert [track.name for track in lazy.getMIDITracks()] == [track.name for track in MIDIFile(path, start=2, end=4).getMIDITracks()]
@@ -0,0 +1,34 @@
+from collections import Counter
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note
+from MIDIAnimator.libs import mido
+from MIDIAnimator.data_structures.midi import MIDIFile
+
+
+def testStreamTagsEventsWithTheirTrack(writeMIDI):
+    conductor = [(0, mido.MetaMessage("set_tempo", tempo=500000))]
+    track1 = [event for i in range(9) for event in note(i * 480, i * 480 + 240, 60)]
+    track2 = [event for i in range(9) for event in note(i * 480 + 120, i * 480 + 360, 64)]
+    path = writeMIDI([conductor, track1, track2])
+
+    events = list(MIDIFile.stream(path))
+    counts = Counter(event.track for event in events if event.type in ("note_on", "note_off"))
+
+    assert counts == {1: 18, 2: 18}
+    assert {event.number for event in events if event.track == 1} == {60}
+    assert {event.number for event in events if event.track == 2} == {64}
+
+
+def testStreamIsInTimeOrderWithTempoChanges(writeMIDI):
+    conductor = [(0, mido.MetaMessage("set_tempo", tempo=500000)), (960, mido.MetaMessage("set_tempo", tempo=250000))]
+    path = writeMIDI([conductor, note(0, 480) + note(1440, 1920, 62)])
+
+    events = list(MIDIFile.stream(path))
+
+    assert [event.tick for event in events] == [0, 480, 1440, 1920]
+    # 2 beats at 120 BPM, then 1 beat at 240 BPM
+    assert events[2].time == 1.25
+    assert [event.time for event in events] == sorted(event.time for event in events)
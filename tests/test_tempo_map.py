@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note
+from MIDIAnimator.libs import mido
+from MIDIAnimator.data_structures.midi import MIDIFile, TempoMap
+
+CHANGES = [(0, 500000), (960, 250000), (1920, 1000000)]
+
+
+def walk(tick, ticksPerBeat=480):
+    """the seconds of a tick, walking over every tempo change"""
+    seconds, lastTick, tempo = 0.0, 0, 500000
+    for changeTick, changeTempo in CHANGES:
+        if changeTick > tick: break
+        seconds += mido.tick2second(changeTick - lastTick, ticksPerBeat, tempo)
+        lastTick, tempo = changeTick, changeTempo
+    return seconds + mido.tick2second(tick - lastTick, ticksPerBeat, tempo)
+
+
+def testTickToSecondMatchesWalkingTheTempoChanges():
+    tempoMap = TempoMap(480, CHANGES)
+    ticks = [0, 1, 480, 959, 960, 961, 1500, 1920, 5000]
+
+    assert [tempoMap.tickToSecond(tick) for tick in ticks] == pytest.approx([walk(tick) for tick in ticks])
+    np.testing.assert_allclose(tempoMap.ticksToSeconds(ticks), [walk(tick) for tick in ticks])
+    assert [tempoMap.secondToTick(tempoMap.tickToSecond(tick)) for tick in ticks] == ticks
+    assert tempoMap.tempoAt(1919) == 250000
+
+
+def testTempoChangeOnTheSameTickReplacesThePreviousOne():
+    tempoMap = TempoMap(480, [(0, 600000), (480, 400000), (480, 300000)])
+
+    assert tempoMap.tempoChanges == [(0, 600000), (480, 300000)]
+    assert tempoMap.tickToSecond(960) == pytest.approx(0.6 + 0.3)
+
+
+def testParsedNotesUseTheTempoMap(writeMIDI):
+    conductor = [(0, mido.MetaMessage("set_tempo", tempo=500000)), (960, mido.MetaMessage("set_tempo", tempo=250000))]
+    path = writeMIDI([conductor, note(480, 1440, 60)])
+
+    track = MIDIFile(path).getMIDITracks()[0]
+
+    assert [(note.timeOn, note.timeOff) for note in track.notes] == [(0.5, 1.25)]
+
+
+def testStretchedAndConstant():
+    tempoMap = TempoMap(480, CHANGES)
+
+    assert tempoMap.stretched(2).tickToSecond(3000) == pytest.approx(2 * tempoMap.tickToSecond(3000))
+    assert TempoMap.constant(480, 250000).tickToSecond(960) == pytest.approx(0.5)
+    with pytest.raises(ValueError):
+        tempoMap.stretched(0)
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("bpy")
+
+from conftest import note, trackContents
+from MIDIAnimator.libs import mido
+from MIDIAnimator.data_structures import midi
+from MIDIAnimator.data_structures.midi import MIDIFile
+
+
+@pytest.fixture
+def path(writeMIDI):
+    return writeMIDI([[(0, mido.MetaMessage("set_tempo", tempo=400000))],
+                      note(0, 480, 60) + note(240, 960, 64) + [(100, mido.Message("control_change", control=1, value=3))],
+                      note(120, 200, 36) + [(50, mido.Message("pitchwheel", pitch=300))],
+                      note(0, 2000, 72, channel=5)])
+
+
+def testWorkersGiveTheSameTracks(path):
+    serial = MIDIFile(path)
+    parallel = MIDIFile(path, workers=2)
+
+    assert [track.name for track in parallel.getMIDITracks()] == [track.name for track in serial.getMIDITracks()]
+    assert [trackContents(track) for track in parallel.getMIDITracks()] == [trackContents(track) for track in serial.getMIDITracks()]
+
+
+def testFallsBackToSerialDecoding(path, monkeypatch):
+    class BrokenPool:
+        def __init__(self, *args, **kwargs):
+            raise OSError("no worker processes")
+    monkeypatch.setattr(midi, "ProcessPoolExecutor", BrokenPool)
+
+    assert [trackContents(track) for track in MIDIFile(path, workers=2).getMIDITracks()] == [trackContents(track) for track in MIDIFile(path).getMIDITracks()]